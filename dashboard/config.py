@@ -56,6 +56,29 @@ class Config:
     RETENTION_TELEMETRY_DAYS = get_env_value('RETENTION_TELEMETRY_DAYS', 30, int)
     RETENTION_QUARANTINE_DAYS = get_env_value('RETENTION_QUARANTINE_DAYS', 7, int)
     
+    # JSONL group-commit writer (batch window)
+    JSONL_WRITER_MAX_BATCH = get_env_value('JSONL_WRITER_MAX_BATCH', 500, int)
+    JSONL_WRITER_MAX_DELAY_MS = get_env_value('JSONL_WRITER_MAX_DELAY_MS', 20, int)
+    
+    # Duplicate guard Bloom filter (sized from expected distinct keys)
+    DUPLICATE_BLOOM_CAPACITY = get_env_value('DUPLICATE_BLOOM_CAPACITY', 100000, int)
+    DUPLICATE_BLOOM_ERROR_RATE = get_env_value('DUPLICATE_BLOOM_ERROR_RATE', 0.01, float)
+    
+    # InfluxDB ingestion spool (write-ahead while InfluxDB is down)
+    INGEST_SPOOL_DIR = get_env_value('INGEST_SPOOL_DIR', '')  # empty: spool only with --spool
+    INGEST_SPOOL_MAX_MB = get_env_value('INGEST_SPOOL_MAX_MB', 256, int)
+    INGEST_SPOOL_DRAIN_POINTS_PER_SEC = get_env_value('INGEST_SPOOL_DRAIN_POINTS_PER_SEC', 5000, int)
+    
+    # Garmin fetch (concurrent per-day calls under a shared rate limit)
+    GARMIN_FETCH_CONCURRENCY = get_env_value('GARMIN_FETCH_CONCURRENCY', 1, int)
+    GARMIN_REQUESTS_PER_SEC = get_env_value('GARMIN_REQUESTS_PER_SEC', 4.0, float)
+    GARMIN_CACHE_DIR = get_env_value('GARMIN_CACHE_DIR', 'private/garmin_cache')  # empty: no cache
+    GARMIN_CACHE_MAX_MB = get_env_value('GARMIN_CACHE_MAX_MB', 64, int)
+    GARMIN_REFETCH_DAYS = get_env_value('GARMIN_REFETCH_DAYS', 2, int)  # --incremental: today + yesterday
+    GARMIN_SESSION_DIR = get_env_value('GARMIN_SESSION_DIR', 'private')  # empty: log in every run
+    GARMIN_FLEET_WORKERS = get_env_value('GARMIN_FLEET_WORKERS', 4, int)  # accounts fetched at a time
+    GARMIN_FLEET_REQUESTS_PER_SEC = get_env_value('GARMIN_FLEET_REQUESTS_PER_SEC', 10.0, float)
+    
     # Phase 5 - Plan Engine thresholds
     ENABLE_PLAN_ENGINE = get_env_value('ENABLE_PLAN_ENGINE', 'true').lower() in ('true', '1', 'yes')
     ANOMALY_RHR_THRESHOLD = get_env_value('ANOMALY_RHR_THRESHOLD', 7, int)
@@ -82,6 +105,15 @@ class Config:
         print(f"    Auto-run analysis window: {cls.AUTO_RUN_ANALYSIS_DAYS} days")
         print(f"    Quarantine enabled: {cls.QUARANTINE_ENABLED}")
         print(f"    Retention days: {cls.RETENTION_DAYS} (telemetry: {cls.RETENTION_TELEMETRY_DAYS}, quarantine: {cls.RETENTION_QUARANTINE_DAYS})")
+        print("\n  Storage:")
+        print(f"    JSONL writer batch: {cls.JSONL_WRITER_MAX_BATCH} records / {cls.JSONL_WRITER_MAX_DELAY_MS} ms")
+        print(f"    Duplicate Bloom filter: {cls.DUPLICATE_BLOOM_CAPACITY} keys @ {cls.DUPLICATE_BLOOM_ERROR_RATE:.2%} FP")
+        print(f"    Ingest spool: {cls.INGEST_SPOOL_DIR or 'off'}, {cls.INGEST_SPOOL_MAX_MB} MB cap, drain {cls.INGEST_SPOOL_DRAIN_POINTS_PER_SEC} points/s")
+        print(f"    Garmin fetch: {cls.GARMIN_FETCH_CONCURRENCY} workers, {cls.GARMIN_REQUESTS_PER_SEC} requests/s")
+        print(f"    Garmin response cache: {cls.GARMIN_CACHE_DIR or 'off'}, {cls.GARMIN_CACHE_MAX_MB} MB cap")
+        print(f"    Garmin incremental re-fetch: last {cls.GARMIN_REFETCH_DAYS} days")
+        print(f"    Garmin session store: {cls.GARMIN_SESSION_DIR or 'off'}")
+        print(f"    Garmin fleet: {cls.GARMIN_FLEET_WORKERS} accounts at a time, {cls.GARMIN_FLEET_REQUESTS_PER_SEC} requests/s overall")
         print("\n  Phase 5 Plan Engine:")
         print(f"    Plan Engine enabled: {cls.ENABLE_PLAN_ENGINE}")
         print(f"    Anomaly RHR threshold: +{cls.ANOMALY_RHR_THRESHOLD} bpm")
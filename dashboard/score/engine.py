@@ -4,15 +4,26 @@ Parity-focused implementation mirroring wearable Monkey C logic.
 Phases / Features:
 - Supports steps & resting HR baseline.
 - Optional flags: sleep, stress, hrv (future expansion; wired but default False).
-- Weight redistribution when metrics absent.
+- Weight redistribution when metrics absent (precomputed per presence mask).
 - Rounding: floor(x + 0.5)
+- Vectorized batch scoring (compute_scores_batch) for backfills / re-scoring.
+- Compact slotted results (CompactScoreResult) for large in-memory histories.
+- Streaming re-scoring of wellness JSONL records (score_stream).
 
 Author: (auto-generated scaffold)
 """
 from __future__ import annotations
+from array import array
 from dataclasses import dataclass
+from itertools import islice
 from math import floor
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, Iterator, Sequence, Tuple, Union
+import json
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only required for batch scoring
+    np = None
 
 # Base weights when all (no HRV) present (sleep, stress optional flags)
 BASE_WEIGHTS = {
@@ -23,6 +34,13 @@ BASE_WEIGHTS = {
     # HRV weight TBD (feature flagged, not active yet)
 }
 
+# Fixed metric order for column/array representations.
+# Bit i of a presence mask refers to METRIC_ORDER[i]; this matches
+# garmin_integrity.DataIntegrity.calculate_metrics_mask (steps, rhr, sleep, stress).
+METRIC_ORDER = ("steps", "rhr", "sleep", "stress")
+# Keys used in ScoreResult.normalized, aligned with METRIC_ORDER
+NORMALIZED_KEYS = ("steps", "rhr_inv", "sleep", "stress_inv")
+
 @dataclass
 class ScoreFlags:
     enable_sleep: bool = False
@@ -46,6 +64,23 @@ class ScoreResult:
     normalized: Dict[str, float]
     missing: list[str]
 
+
+@dataclass
+class BatchScoreResult:
+    """Column-oriented scores for N records (row i matches input row i).
+
+    contributions/weights are (N, 4) arrays in METRIC_ORDER; inactive
+    metrics hold 0.0. missing_mask uses the same bit layout as METRIC_ORDER.
+    """
+    score: Any           # np.ndarray[int64], shape (N,)
+    band: Any            # np.ndarray[object], shape (N,)
+    contributions: Any   # np.ndarray[float64], shape (N, 4)
+    weights: Any         # np.ndarray[float64], shape (N, 4)
+    missing_mask: Any    # np.ndarray[int64], shape (N,)
+
+    def __len__(self) -> int:
+        return len(self.score)
+
 BAND_MAP = [
     (0, 39, "Take it easy"),
     (40, 69, "Maintain"),
@@ -115,27 +150,74 @@ def normalize_stress_inverse(stress: Optional[int]) -> Optional[float]:
     return (100 - _clamp(stress, 0, 100)) / 100.0
 
 
-def redistribute_weights(flags: ScoreFlags, inputs: MetricInputs) -> Dict[str, float]:
-    active = {}
+def _build_weight_table() -> Tuple[Tuple[float, ...], ...]:
+    """Normalized weights (METRIC_ORDER) for every 4-bit presence mask."""
+    table = []
+    for mask in range(1 << len(METRIC_ORDER)):
+        active = [BASE_WEIGHTS[k] if mask & (1 << i) else 0.0 for i, k in enumerate(METRIC_ORDER)]
+        # Summed in METRIC_ORDER so results match the original per-call normalization
+        total = sum(w for i, w in enumerate(active) if mask & (1 << i))
+        if total == 0:
+            table.append((0.0,) * len(METRIC_ORDER))
+        else:
+            table.append(tuple(w / total if mask & (1 << i) else 0.0 for i, w in enumerate(active)))
+    return tuple(table)
+
+
+# Immutable lookup: WEIGHT_TABLE[mask][i] is the normalized weight of METRIC_ORDER[i]
+WEIGHT_TABLE = _build_weight_table()
+WEIGHT_TABLE_ARRAY = None
+if np is not None:
+    WEIGHT_TABLE_ARRAY = np.array(WEIGHT_TABLE, dtype=np.float64)
+    WEIGHT_TABLE_ARRAY.setflags(write=False)
+
+
+def active_metrics_mask(flags: ScoreFlags, inputs: MetricInputs) -> int:
+    """
+    Presence mask of metrics that take part in scoring.
+
+    Same bit layout as DataIntegrity.calculate_metrics_mask; sleep/stress
+    bits are only set when their feature flag is enabled.
+    """
+    mask = 0
     if inputs.steps is not None:
-        active["steps"] = BASE_WEIGHTS["steps"]
+        mask |= 1 << 0
     if inputs.rhr is not None:
-        active["rhr"] = BASE_WEIGHTS["rhr"]
+        mask |= 1 << 1
     if flags.enable_sleep and inputs.sleep_hours is not None:
-        active["sleep"] = BASE_WEIGHTS["sleep"]
+        mask |= 1 << 2
     if flags.enable_stress and inputs.stress is not None:
-        active["stress"] = BASE_WEIGHTS["stress"]
+        mask |= 1 << 3
     # HRV omitted for now
-    total = sum(active.values())
-    if total == 0:
-        return {}
-    return {k: v / total for k, v in active.items()}
+    return mask
+
+
+def weights_for_mask(mask: int) -> Tuple[float, ...]:
+    """
+    Look up normalized weights for a presence mask.
+
+    Args:
+        mask: 4-bit presence mask (bit i -> METRIC_ORDER[i])
+
+    Returns:
+        Tuple of weights in METRIC_ORDER (0.0 for absent metrics)
+    """
+    if not 0 <= mask < len(WEIGHT_TABLE):
+        raise ValueError(f"Invalid metrics mask {mask}; expected 0-{len(WEIGHT_TABLE) - 1}")
+    return WEIGHT_TABLE[mask]
+
+
+def redistribute_weights(flags: ScoreFlags, inputs: MetricInputs) -> Dict[str, float]:
+    mask = active_metrics_mask(flags, inputs)
+    row = WEIGHT_TABLE[mask]
+    return {k: row[i] for i, k in enumerate(METRIC_ORDER) if mask & (1 << i)}
 
 
 def compute_score(inputs: MetricInputs, flags: ScoreFlags | None = None) -> ScoreResult:
     flags = flags or ScoreFlags()
 
-    weights = redistribute_weights(flags, inputs)
+    mask = active_metrics_mask(flags, inputs)
+    row = WEIGHT_TABLE[mask]
 
     norm: Dict[str, Optional[float]] = {
         "steps": normalize_steps(inputs.steps),
@@ -144,22 +226,16 @@ def compute_score(inputs: MetricInputs, flags: ScoreFlags | None = None) -> Scor
         "stress_inv": normalize_stress_inverse(inputs.stress) if flags.enable_stress else None,
     }
 
+    values = (norm["steps"], norm["rhr_inv"], norm["sleep"], norm["stress_inv"])
+
     score_acc = 0.0
     contributions: Dict[str, float] = {}
-    for key, w in weights.items():
-        if key == "steps":
-            val = norm["steps"]
-        elif key == "rhr":
-            val = norm["rhr_inv"]
-        elif key == "sleep":
-            val = norm["sleep"]
-        elif key == "stress":
-            val = norm["stress_inv"]
-        else:
-            val = None
-        if val is None:
+    weights: Dict[str, float] = {}
+    for i, key in enumerate(METRIC_ORDER):
+        if not mask & (1 << i):
             continue
-        contributions[key] = w * val
+        weights[key] = row[i]
+        contributions[key] = row[i] * values[i]
         score_acc += contributions[key]
 
     score_raw = score_acc * 100.0
@@ -183,6 +259,268 @@ def compute_score(inputs: MetricInputs, flags: ScoreFlags | None = None) -> Scor
     )
 
 
+class CompactScoreResult:
+    """
+    Fixed-layout score result for holding many days in memory.
+
+    Stores the score, band index, presence/missing bitmasks (METRIC_ORDER
+    bit layout) and one float array: contributions[0:4] then normalized[4:8].
+    Exposes the same attributes as ScoreResult, built lazily on access.
+    """
+    __slots__ = ("score", "band_index", "active_mask", "missing_mask", "values")
+
+    def __init__(self, score: int, band_index: int, active_mask: int,
+                 missing_mask: int, values: array):
+        self.score = score
+        self.band_index = band_index
+        self.active_mask = active_mask
+        self.missing_mask = missing_mask
+        self.values = values
+
+    @classmethod
+    def from_result(cls, result: ScoreResult) -> "CompactScoreResult":
+        active_mask = 0
+        missing_mask = 0
+        values = array("d", [0.0]) * (2 * len(METRIC_ORDER))
+        for i, key in enumerate(METRIC_ORDER):
+            if key in result.weights:
+                active_mask |= 1 << i
+                values[i] = result.contributions[key]
+                values[4 + i] = result.normalized[NORMALIZED_KEYS[i]]
+            if key in result.missing:
+                missing_mask |= 1 << i
+        band_index = next(i for i, (_, _, name) in enumerate(BAND_MAP) if name == result.band)
+        return cls(result.score, band_index, active_mask, missing_mask, values)
+
+    @property
+    def band(self) -> str:
+        return BAND_MAP[self.band_index][2]
+
+    @property
+    def contributions(self) -> Dict[str, float]:
+        return {k: self.values[i] for i, k in enumerate(METRIC_ORDER) if self.active_mask & (1 << i)}
+
+    @property
+    def weights(self) -> Dict[str, float]:
+        row = WEIGHT_TABLE[self.active_mask]
+        return {k: row[i] for i, k in enumerate(METRIC_ORDER) if self.active_mask & (1 << i)}
+
+    @property
+    def normalized(self) -> Dict[str, float]:
+        return {k: self.values[4 + i] for i, k in enumerate(NORMALIZED_KEYS) if self.active_mask & (1 << i)}
+
+    @property
+    def missing(self) -> list[str]:
+        return [k for i, k in enumerate(METRIC_ORDER) if self.missing_mask & (1 << i)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Expand to the ScoreResult field layout (dataclasses.asdict equivalent)."""
+        return {
+            "score": self.score,
+            "band": self.band,
+            "contributions": self.contributions,
+            "weights": self.weights,
+            "normalized": self.normalized,
+            "missing": self.missing,
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompactScoreResult):
+            return NotImplemented
+        return (self.score == other.score and self.band_index == other.band_index
+                and self.active_mask == other.active_mask
+                and self.missing_mask == other.missing_mask and self.values == other.values)
+
+    def __repr__(self) -> str:
+        return (f"CompactScoreResult(score={self.score}, band={self.band!r}, "
+                f"active_mask={self.active_mask:04b}, missing_mask={self.missing_mask:04b})")
+
+
+def compute_score_compact(inputs: MetricInputs, flags: ScoreFlags | None = None) -> CompactScoreResult:
+    """compute_score returning a CompactScoreResult."""
+    return CompactScoreResult.from_result(compute_score(inputs, flags))
+
+
+def _as_column(values: Optional[Sequence], n: int):
+    """Convert a column (None entries allowed) to float64; absent column -> all NaN."""
+    if values is None:
+        return np.full(n, np.nan)
+    return np.asarray(values, dtype=np.float64)
+
+
+def _presence(col, present: Optional[Sequence]):
+    if present is None:
+        return ~np.isnan(col)
+    return np.asarray(present, dtype=bool) & ~np.isnan(col)
+
+
+def compute_scores_batch(
+    steps: Sequence,
+    rhr: Sequence,
+    sleep_hours: Optional[Sequence] = None,
+    stress: Optional[Sequence] = None,
+    flags: ScoreFlags | None = None,
+    present: Optional[Dict[str, Sequence]] = None,
+) -> BatchScoreResult:
+    """
+    Vectorized equivalent of compute_score over column arrays.
+
+    Produces results identical to calling compute_score row by row
+    (same float operation order, floor(x + 0.5) rounding and weight
+    redistribution for missing metrics).
+
+    Args:
+        steps, rhr, sleep_hours, stress: Equal-length columns. Missing values
+            may be given as None or NaN.
+        flags: ScoreFlags applied to every row (sleep/stress gating).
+        present: Optional explicit presence flags per metric name
+            (METRIC_ORDER keys); a value is only used if present and not NaN.
+
+    Returns:
+        BatchScoreResult with score, band, contributions, weights, missing_mask
+    """
+    if np is None:
+        raise ImportError("numpy is required for compute_scores_batch (pip install numpy)")
+
+    flags = flags or ScoreFlags()
+    present = present or {}
+
+    steps_col = np.asarray(steps, dtype=np.float64)
+    n = steps_col.shape[0]
+    cols = (
+        steps_col,
+        _as_column(rhr, n),
+        _as_column(sleep_hours, n),
+        _as_column(stress, n),
+    )
+    for name, col in zip(METRIC_ORDER, cols):
+        if col.shape != (n,):
+            raise ValueError(f"Column '{name}' has shape {col.shape}, expected ({n},)")
+
+    avail = [_presence(col, present.get(name)) for name, col in zip(METRIC_ORDER, cols)]
+    enabled = (True, True, flags.enable_sleep, flags.enable_stress)
+    active = np.stack([a & en for a, en in zip(avail, enabled)], axis=1)
+
+    with np.errstate(invalid="ignore"):
+        norm = np.stack([
+            np.minimum(cols[0], 12000) / 12000.0,
+            (80 - np.clip(cols[1], 40, 80)) / 40.0,
+            np.minimum(cols[2], 8.0) / 8.0,
+            (100 - np.clip(cols[3], 0, 100)) / 100.0,
+        ], axis=1)
+    norm = np.where(active, norm, 0.0)
+
+    active_mask = np.zeros(n, dtype=np.int64)
+    for i in range(len(METRIC_ORDER)):
+        active_mask |= np.where(active[:, i], 1 << i, 0)
+    weights = WEIGHT_TABLE_ARRAY[active_mask]
+
+    contributions = weights * norm
+    score_acc = np.zeros(n)
+    for i in range(len(METRIC_ORDER)):
+        score_acc = score_acc + contributions[:, i]
+    scores = np.floor(score_acc * 100.0 + 0.5).astype(np.int64)
+
+    band_names = np.array([band for _, _, band in BAND_MAP], dtype=object)
+    band_upper = np.array([hi for _, hi, _ in BAND_MAP])
+    band_idx = np.minimum(np.searchsorted(band_upper, scores, side="left"), len(BAND_MAP) - 1)
+
+    missing_mask = np.zeros(n, dtype=np.int64)
+    for i, en in enumerate(enabled):
+        if en:
+            missing_mask |= np.where(avail[i], 0, 1 << i)
+
+    return BatchScoreResult(
+        score=scores,
+        band=band_names[band_idx],
+        contributions=contributions,
+        weights=weights,
+        missing_mask=missing_mask,
+    )
+
+
+def inputs_from_wellness_metrics(metrics: Dict[str, Any]) -> Tuple[MetricInputs, ScoreFlags]:
+    """
+    Map a wellness record's "metrics" block to engine inputs.
+
+    Flags follow metric availability (Phase 3 approach), matching
+    fetch_garmin_data, fix_integrity and integrity_auto_remediate.
+    """
+    inputs = MetricInputs(
+        steps=metrics.get('steps'),
+        rhr=metrics.get('restingHeartRate'),
+        sleep_hours=metrics.get('sleepHours'),
+        stress=metrics.get('stress')
+    )
+    flags = ScoreFlags(
+        enable_sleep=metrics.get('sleepHours') is not None,
+        enable_stress=metrics.get('stress') is not None
+    )
+    return inputs, flags
+
+
+def _parse_records(records: Iterable[Union[str, bytes, Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+    for item in records:
+        if isinstance(item, dict):
+            yield item
+        elif item.strip():
+            yield json.loads(item)
+
+
+def _score_chunk(chunk: list) -> Iterator[Dict[str, Any]]:
+    for record in chunk:
+        # Re-scoring a record without raw metrics would silently zero its score
+        if not isinstance(record.get('metrics'), dict):
+            raise ValueError(f"Record {record.get('date', '<no date>')} has no 'metrics' block "
+                             "(expected wellness schema)")
+
+    if np is None or len(chunk) == 1:
+        for record in chunk:
+            result = compute_score(*inputs_from_wellness_metrics(record['metrics']))
+            yield dict(record, score=result.score, band=result.band)
+        return
+
+    metrics = [record['metrics'] for record in chunk]
+    # Availability-based flags only gate absent values, so enabling both
+    # flags for the whole chunk scores each row exactly like compute_score.
+    batch = compute_scores_batch(
+        [m.get('steps') for m in metrics],
+        [m.get('restingHeartRate') for m in metrics],
+        [m.get('sleepHours') for m in metrics],
+        [m.get('stress') for m in metrics],
+        flags=ScoreFlags(enable_sleep=True, enable_stress=True),
+    )
+    for record, score, band in zip(chunk, batch.score.tolist(), batch.band):
+        yield dict(record, score=score, band=band)
+
+
+def score_stream(records: Iterable[Union[str, bytes, Dict[str, Any]]],
+                 chunk_size: int = 1024) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily parse, re-score and yield wellness records.
+
+    Accepts JSONL lines (str/bytes, e.g. an open file) or already-parsed
+    dicts. At most chunk_size records are held at once; each chunk is scored
+    with compute_scores_batch when numpy is available. Yielded records are
+    copies with "score" and "band" recomputed; blank lines are skipped,
+    malformed JSON raises json.JSONDecodeError and records without a
+    "metrics" block raise ValueError.
+
+    Example:
+        with open(src) as f:
+            atomic_write_jsonl(score_stream(f), dst)
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+
+    parsed = _parse_records(records)
+    while True:
+        chunk = list(islice(parsed, chunk_size))
+        if not chunk:
+            return
+        yield from _score_chunk(chunk)
+
+
 def compute_examples() -> Dict[str, Any]:
     """Utility: returns computed scores for documented examples A, B, C.
     Example definitions (from PRD test vectors):
@@ -152,18 +152,13 @@ class AdherenceTracker:
                 'tier1_completion_pct': 0
             }
         
-        # Load recent records
-        cutoff_date = (date.today() - timedelta(days=days)).isoformat()
-        records = []
+        import sys
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        from dashboard.utils.jsonl_index import read_range
         
-        with open(self.adherence_file, 'r') as f:
-            for line in f:
-                try:
-                    record = json.loads(line)
-                    if record.get('date', '') >= cutoff_date:
-                        records.append(record)
-                except json.JSONDecodeError:
-                    continue
+        # Load recent records (date index seeks straight to the window)
+        cutoff_date = (date.today() - timedelta(days=days)).isoformat()
+        records = read_range(self.adherence_file, start_date=cutoff_date)
         
         if not records:
             return {
@@ -209,21 +204,19 @@ class AdherenceTracker:
         if not os.path.exists(self.adherence_file):
             return []
         
+        import sys
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        from dashboard.utils.jsonl_index import iter_range
+        
         cutoff_date = (date.today() - timedelta(days=days)).isoformat()
         energy_trend = []
         
-        with open(self.adherence_file, 'r') as f:
-            for line in f:
-                try:
-                    record = json.loads(line)
-                    if record.get('date', '') >= cutoff_date:
-                        if record.get('energy_rating'):
-                            energy_trend.append((
-                                record['date'],
-                                record['energy_rating']
-                            ))
-                except json.JSONDecodeError:
-                    continue
+        for record in iter_range(self.adherence_file, start_date=cutoff_date):
+            if record.get('energy_rating'):
+                energy_trend.append((
+                    record['date'],
+                    record['energy_rating']
+                ))
         
         return sorted(energy_trend)
 
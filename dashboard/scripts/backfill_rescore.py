@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Parallel backfill re-scoring for wellness JSONL history.
+
+Used when the scoring formula changes and every historical record must be
+re-scored. Files (or byte ranges of one large file) are split into shards
+and scored on a process pool with the batch engine. Each completed shard
+is written as a partial output; partials are merged into the target with
+atomic write semantics (temp file + fsync + rename).
+
+Resume: shard partials live in a work directory next to the target
+(<target>.backfill/). Re-running the same command skips completed shards,
+as long as the source file is unchanged.
+
+Usage:
+  python3 dashboard/scripts/backfill_rescore.py data/garmin_wellness.jsonl
+  python3 dashboard/scripts/backfill_rescore.py data/*.jsonl --output-dir data/rescored --workers 8
+  python3 dashboard/scripts/backfill_rescore.py big.jsonl --shard-mb 64
+"""
+
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+# Add dashboard to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from score.engine import score_stream
+from utils.file_utils import atomic_write_jsonl
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def plan_shards(source: str, shard_bytes: Optional[int]) -> List[Dict]:
+    """
+    Split a file into byte-range shards.
+
+    A shard owns every line whose first byte falls in [start, end).
+    shard_bytes of None/0 gives one shard for the whole file.
+    """
+    size = os.path.getsize(source)
+    if not shard_bytes or size == 0:
+        return [{'index': 0, 'start': 0, 'end': size}]
+
+    shards = []
+    for index, start in enumerate(range(0, size, shard_bytes)):
+        shards.append({'index': index, 'start': start, 'end': min(start + shard_bytes, size)})
+    return shards
+
+
+def read_shard_lines(source: str, start: int, end: int) -> Iterator[bytes]:
+    """Yield the raw lines owned by the byte range [start, end)."""
+    with open(source, 'rb') as f:
+        if start > 0:
+            # Skip the tail of a line that began in the previous shard
+            f.seek(start - 1)
+            f.readline()
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            yield line
+
+
+def part_path(work_dir: str, index: int) -> str:
+    return os.path.join(work_dir, f'part_{index:05d}.jsonl')
+
+
+def score_shard(source: str, start: int, end: int, output_path: str) -> int:
+    """
+    Worker: re-score one shard and write it as a partial output.
+
+    Returns the number of records written.
+    """
+    count = 0
+
+    def counted():
+        nonlocal count
+        for record in score_stream(read_shard_lines(source, start, end)):
+            count += 1
+            yield record
+
+    if not atomic_write_jsonl(counted(), output_path):
+        raise IOError(f"Failed to write partial output {output_path}")
+    return count
+
+
+def _source_fingerprint(source: str) -> Dict:
+    stat = os.stat(source)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'inode': stat.st_ino}
+
+
+def prepare_work_dir(source: str, work_dir: str, shard_bytes: Optional[int]) -> Dict:
+    """
+    Load or create the shard manifest for a source file.
+
+    An existing manifest is reused only if the source fingerprint and shard
+    size match; otherwise stale partials are discarded.
+    """
+    manifest_path = os.path.join(work_dir, MANIFEST_NAME)
+    fingerprint = _source_fingerprint(source)
+
+    if os.path.exists(manifest_path):
+        try:
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+            if manifest.get('source') == fingerprint and manifest.get('shard_bytes') == shard_bytes:
+                return manifest
+        except (json.JSONDecodeError, OSError):
+            pass
+        shutil.rmtree(work_dir)
+
+    os.makedirs(work_dir, exist_ok=True)
+    manifest = {
+        'source_path': os.path.abspath(source),
+        'source': fingerprint,
+        'shard_bytes': shard_bytes,
+        'shards': plan_shards(source, shard_bytes),
+        'counts': {},
+    }
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f)
+    return manifest
+
+
+def merge_parts(work_dir: str, shards: List[Dict], target: str) -> bool:
+    """Concatenate partial outputs in shard order into target atomically."""
+    def records():
+        for shard in shards:
+            with open(part_path(work_dir, shard['index']), 'r') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    return atomic_write_jsonl(records(), target)
+
+
+def backfill(sources: List[str], output_dir: Optional[str] = None,
+             workers: Optional[int] = None, shard_bytes: Optional[int] = None,
+             keep_work: bool = False) -> Dict:
+    """
+    Re-score all sources on a process pool.
+
+    Args:
+        sources: JSONL history files
+        output_dir: Directory for re-scored files (default: overwrite sources)
+        workers: Process count (default: os.cpu_count())
+        shard_bytes: Split files into byte ranges of this size (default: one shard per file)
+        keep_work: Keep partial outputs after a successful merge
+
+    Returns:
+        Report with per-file results and records/sec
+    """
+    started = time.monotonic()
+    report = {
+        'files': [],
+        'records': 0,
+        'shards_total': 0,
+        'shards_resumed': 0,
+        'failed': [],
+    }
+
+    jobs = []
+    for source in sources:
+        target = os.path.join(output_dir, Path(source).name) if output_dir else source
+        work_dir = f"{target}.backfill"
+        manifest = prepare_work_dir(source, work_dir, shard_bytes)
+        jobs.append((source, target, work_dir, manifest))
+        report['shards_total'] += len(manifest['shards'])
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for source, target, work_dir, manifest in jobs:
+            for shard in manifest['shards']:
+                key = str(shard['index'])
+                if key in manifest['counts'] and os.path.exists(part_path(work_dir, shard['index'])):
+                    report['shards_resumed'] += 1
+                    continue
+                future = pool.submit(score_shard, source, shard['start'], shard['end'],
+                                     part_path(work_dir, shard['index']))
+                futures[future] = (work_dir, manifest, key)
+
+        for future in as_completed(futures):
+            work_dir, manifest, key = futures[future]
+            try:
+                manifest['counts'][key] = future.result()
+            except Exception as e:
+                report['failed'].append(f"{manifest['source_path']} shard {key}: {e}")
+                continue
+            # Record progress so an interrupted run can resume
+            with open(os.path.join(work_dir, MANIFEST_NAME), 'w') as f:
+                json.dump(manifest, f)
+
+    for source, target, work_dir, manifest in jobs:
+        if len(manifest['counts']) != len(manifest['shards']):
+            continue
+        if not merge_parts(work_dir, manifest['shards'], target):
+            report['failed'].append(f"{source}: merge failed")
+            continue
+        records = sum(manifest['counts'].values())
+        report['records'] += records
+        report['files'].append({'source': source, 'target': target,
+                                'shards': len(manifest['shards']), 'records': records})
+        if not keep_work:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    elapsed = time.monotonic() - started
+    report['elapsed_s'] = round(elapsed, 3)
+    report['records_per_sec'] = round(report['records'] / elapsed, 1) if elapsed > 0 else 0.0
+    return report
+
+
+def main():
+    """CLI interface for backfill re-scoring."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Re-score wellness history in parallel')
+    parser.add_argument('files', nargs='+', help='Wellness JSONL files to re-score')
+    parser.add_argument('--output-dir', help='Write re-scored files here (default: overwrite input)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--shard-mb', type=float,
+                       help='Split files into byte ranges of this many MB (default: one shard per file)')
+    parser.add_argument('--keep-work', action='store_true', help='Keep partial outputs after merge')
+    parser.add_argument('--json', action='store_true', help='Output report as JSON')
+
+    args = parser.parse_args()
+
+    missing = [f for f in args.files if not os.path.exists(f)]
+    if missing:
+        print(f"❌ File not found: {', '.join(missing)}", file=sys.stderr)
+        return 1
+
+    shard_bytes = int(args.shard_mb * 1024 * 1024) if args.shard_mb else None
+    report = backfill(args.files, args.output_dir, args.workers, shard_bytes, args.keep_work)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print("🔁 Backfill Re-score Report")
+        print(f"   Files: {len(report['files'])}/{len(args.files)}")
+        print(f"   Shards: {report['shards_total']} ({report['shards_resumed']} resumed)")
+        print(f"   Records: {report['records']}")
+        print(f"   Throughput: {report['records_per_sec']:.0f} records/sec ({report['elapsed_s']:.1f}s)")
+        for failure in report['failed']:
+            print(f"   ❌ {failure}")
+        if report['failed']:
+            print("   Re-run the same command to resume from completed shards.")
+
+    return 0 if not report['failed'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
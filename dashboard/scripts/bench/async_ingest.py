@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the asyncio ingestion runner.
+
+Writes synthetic daily-record files, ingests them into a local stand-in
+write server with simulated latency at several concurrency levels and
+reports points/sec and request latency percentiles.
+
+Usage:
+  python3 dashboard/scripts/bench/async_ingest.py --files 20 --records 365 \
+      --latency-ms 20 --concurrency 1 4 16
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+from datetime import date, timedelta
+from typing import Dict, List
+
+# Add dashboard to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from utils.influx_async import AsyncIngestRunner, AsyncWritePool
+from utils.influx_standin import StandInWriteServer
+
+
+def write_files(directory: str, files: int, records: int) -> List[str]:
+    paths = []
+    for n in range(files):
+        rng = random.Random(n)
+        path = os.path.join(directory, f'user_{n:03d}.jsonl')
+        with open(path, 'w') as f:
+            for i in range(records):
+                weights = {'steps': 0.4, 'rhr': 0.3, 'sleep': 0.2, 'stress': 0.1}
+                f.write(json.dumps({
+                    'date': (date(2020, 1, 1) + timedelta(days=i)).isoformat(),
+                    'score': rng.randint(0, 100),
+                    'band': rng.choice(['Go for it', 'Maintain', 'Take it easy']),
+                    'metrics_raw': {'steps': rng.randint(0, 20000), 'rhr': rng.randint(40, 80),
+                                    'sleep_h': round(rng.uniform(4, 9), 1), 'stress': rng.randint(0, 100)},
+                    'weights_active': weights,
+                    'contrib': {k: round(w * rng.random(), 4) for k, w in weights.items()},
+                    'missing': [], 'formula_version': '1.0.0', 'run_mode': 'batch', 'error_codes': [],
+                }) + '\n')
+        paths.append(path)
+    return paths
+
+
+def run_level(paths: List[str], concurrency: int, batch_points: int,
+              latency_ms: float, jitter_ms: float, error_rate: float) -> Dict:
+    with StandInWriteServer(latency_ms=latency_ms, jitter_ms=jitter_ms, error_rate=error_rate,
+                            keep_payloads=False, seed=1) as server:
+        pool = AsyncWritePool(server.url, org='bench', bucket='bench', pool_size=concurrency)
+        runner = AsyncIngestRunner(pool, concurrency=concurrency, batch_points=batch_points,
+                                   backoff_base=0.01, backoff_max=0.1)
+        stats = asyncio.run(runner.run(paths))
+        stats['server'] = server.stats()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Asyncio ingestion benchmark (local stand-in server)')
+    parser.add_argument('--files', type=int, default=20, help='Files (users) to ingest (default: 20)')
+    parser.add_argument('--records', type=int, default=365, help='Records per file (default: 365)')
+    parser.add_argument('--batch-points', type=int, default=500, help='Points per request (default: 500)')
+    parser.add_argument('--latency-ms', type=float, default=20.0, help='Server latency (default: 20)')
+    parser.add_argument('--jitter-ms', type=float, default=10.0, help='Extra random latency (default: 10)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Injected 503 rate (default: 0)')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16],
+                        help='Concurrency levels to compare (default: 1 4 16)')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='async_ingest_')
+    try:
+        paths = write_files(directory, args.files, args.records)
+        print(f"📊 Async ingestion: {args.files} files x {args.records} records, "
+              f"{args.batch_points} points/request, {args.latency_ms}±{args.jitter_ms}ms server latency")
+        for concurrency in args.concurrency:
+            stats = run_level(paths, concurrency, args.batch_points,
+                              args.latency_ms, args.jitter_ms, args.error_rate)
+            latency = stats['request_latency']
+            print(f"   concurrency {concurrency:>3}: {stats['points_per_sec']:>10,.0f} points/s  "
+                  f"p50 {latency['p50_ms']}ms  p95 {latency['p95_ms']}ms  p99 {latency['p99_ms']}ms  "
+                  f"connections {stats['pool']['connections_opened']}  "
+                  f"retries {stats['retries']}  failed {stats['failed_batches']}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
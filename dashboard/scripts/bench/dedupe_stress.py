@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Multi-process stress benchmark for duplicate_guard check-and-append.
+
+N writer processes append heavily overlapping batches of daily records to
+one target file at the same time. Reports throughput and verifies the
+target holds every key exactly once.
+
+Usage:
+  python3 dashboard/scripts/bench/dedupe_stress.py --writers 8 --batches 50
+  python3 dashboard/scripts/bench/dedupe_stress.py --no-lock   # show the race
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, List
+
+# Add dashboard to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from scripts.duplicate_guard import append_unique, filter_duplicates
+from utils.file_utils import durable_append_jsonl
+from utils.key_index import record_key
+
+
+def make_batches(writer_id: int, batches: int, batch_size: int, days: int) -> List[List[Dict]]:
+    """Random batches over a shared date range, so writers collide constantly."""
+    rng = random.Random(writer_id)
+    start = date(2020, 1, 1)
+    return [
+        [{'date': (start + timedelta(days=rng.randrange(days))).isoformat(),
+          'schema_version': 'v2.0.0', 'writer': writer_id}
+         for _ in range(batch_size)]
+        for _ in range(batches)
+    ]
+
+
+def writer(target: str, writer_id: int, batches: int, batch_size: int, days: int, locked: bool) -> Dict:
+    added = 0
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for batch in make_batches(writer_id, batches, batch_size, days):
+            if locked:
+                added += max(0, append_unique(batch, target))
+            else:
+                # Pre-lock behaviour: check, then append, with nothing held between
+                unique = filter_duplicates(batch, target)
+                if unique and durable_append_jsonl(unique, target):
+                    added += len(unique)
+    return {'writer': writer_id, 'added': added, 'seconds': time.perf_counter() - started}
+
+
+def run_stress(target: str, writers: int, batches: int, batch_size: int, days: int,
+               locked: bool = True) -> Dict:
+    """Run the writers concurrently and verify the resulting file."""
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=writers) as pool:
+        futures = [pool.submit(writer, target, w, batches, batch_size, days, locked)
+                   for w in range(writers)]
+        results = [f.result() for f in futures]
+    elapsed = time.perf_counter() - started
+
+    lines, keys = 0, set()
+    if os.path.exists(target):
+        with open(target, 'r') as f:
+            for line in f:
+                if line.strip():
+                    lines += 1
+                    keys.add(record_key(json.loads(line)))
+
+    attempted = writers * batches * batch_size
+    return {
+        'writers': writers,
+        'locked': locked,
+        'records_attempted': attempted,
+        'records_added': sum(r['added'] for r in results),
+        'lines_in_target': lines,
+        'distinct_keys': len(keys),
+        'duplicates': lines - len(keys),
+        'elapsed_s': round(elapsed, 3),
+        'attempted_per_sec': round(attempted / elapsed, 1) if elapsed else 0.0,
+        'batches_per_sec': round(writers * batches / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent duplicate-guard append stress test')
+    parser.add_argument('--writers', type=int, default=8, help='Parallel writer processes (default: 8)')
+    parser.add_argument('--batches', type=int, default=50, help='Batches per writer (default: 50)')
+    parser.add_argument('--batch-size', type=int, default=20, help='Records per batch (default: 20)')
+    parser.add_argument('--days', type=int, default=2000, help='Distinct dates to draw from (default: 2000)')
+    parser.add_argument('--no-lock', action='store_true', help='Use unlocked check-then-append')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='dedupe_stress_')
+    try:
+        report = run_stress(os.path.join(work_dir, 'target.jsonl'), args.writers, args.batches,
+                            args.batch_size, args.days, locked=not args.no_lock)
+    finally:
+        shutil.rmtree(work_dir)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"📊 Duplicate-guard stress ({report['writers']} writers, "
+              f"{'locked' if report['locked'] else 'UNLOCKED'})")
+        print(f"   Attempted: {report['records_attempted']} records in {report['elapsed_s']}s "
+              f"({report['attempted_per_sec']} rec/s, {report['batches_per_sec']} batches/s)")
+        print(f"   Added: {report['records_added']}, distinct keys: {report['distinct_keys']}")
+        status = '✅' if report['duplicates'] == 0 else '❌'
+        print(f"   {status} Duplicates in target: {report['duplicates']}")
+    return 0 if report['duplicates'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+CPU benchmark: Point objects vs direct line-protocol encoder.
+
+Encodes N synthetic daily records (6 points each) with both paths and
+reports records/sec and speedup.
+
+Usage:
+  python3 dashboard/scripts/bench/line_protocol_encode.py --records 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, List
+
+# Add dashboard and scripts to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.line_protocol import DailyRecordEncoder
+from ingest_influxdb import record_line_encoder
+
+
+def make_records(count: int, seed: int = 1) -> List[Dict]:
+    rng = random.Random(seed)
+    start = date(2020, 1, 1)
+    records = []
+    for i in range(count):
+        weights = {'steps': 0.4, 'rhr': 0.3, 'sleep': 0.2, 'stress': 0.1}
+        contrib = {k: round(w * rng.random(), 4) for k, w in weights.items()}
+        records.append({
+            'date': (start + timedelta(days=i % 3650)).isoformat(),
+            'score': rng.randint(0, 100),
+            'band': rng.choice(['Go for it', 'Maintain', 'Take it easy']),
+            'metrics_raw': {'steps': rng.randint(0, 20000), 'rhr': rng.randint(40, 80),
+                            'sleep_h': round(rng.uniform(4, 9), 1), 'stress': rng.randint(0, 100)},
+            'weights_active': weights,
+            'contrib': contrib,
+            'missing': [],
+            'formula_version': '1.0.0',
+            'run_mode': 'batch',
+            'error_codes': [],
+        })
+    return records
+
+
+def time_encoder(encode: Callable[[Dict], List[str]], records: List[Dict]) -> float:
+    started = time.perf_counter()
+    for record in records:
+        encode(record)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Line-protocol encoder benchmark')
+    parser.add_argument('--records', type=int, default=20000,
+                        help='Number of daily records to encode (default: 20000)')
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+    point_s = time_encoder(record_line_encoder('point'), records)
+    fast_s = time_encoder(DailyRecordEncoder().encode, records)
+
+    print(f"📊 Line-protocol encoding ({args.records} records, {args.records * 6} points)")
+    print(f"   Point objects:  {args.records / point_s:,.0f} records/s ({point_s:.2f}s)")
+    print(f"   Direct encoder: {args.records / fast_s:,.0f} records/s ({fast_s:.2f}s)")
+    print(f"   Speedup: {point_s / fast_s:.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: ScoreResult dataclass vs CompactScoreResult.
+
+Holds N daily results in memory (e.g. a year for many users) and reports
+traced allocation per record for each representation.
+
+Usage:
+  python3 dashboard/scripts/bench/score_memory.py --records 100000
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import tracemalloc
+from typing import Callable, Dict, List
+
+# Add dashboard to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from score.engine import compute_score, CompactScoreResult, MetricInputs, ScoreFlags
+
+
+def make_inputs(count: int, seed: int = 1) -> List[MetricInputs]:
+    rng = random.Random(seed)
+    return [
+        MetricInputs(
+            steps=rng.randint(0, 20000),
+            rhr=rng.randint(40, 80),
+            sleep_hours=round(rng.uniform(4, 9), 1),
+            stress=rng.randint(0, 100),
+        )
+        for _ in range(count)
+    ]
+
+
+def measure(build: Callable[[], list]) -> int:
+    """Return bytes still allocated by the list returned from build()."""
+    gc.collect()
+    tracemalloc.start()
+    held = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return current
+
+
+def run_benchmark(count: int) -> Dict:
+    inputs = make_inputs(count)
+    flags = ScoreFlags(enable_sleep=True, enable_stress=True)
+    # Score up front so only retained results are traced
+    results = [compute_score(i, flags) for i in inputs]
+
+    def build_dataclass():
+        return [compute_score(i, flags) for i in inputs]
+
+    def build_compact():
+        return [CompactScoreResult.from_result(r) for r in results]
+
+    dataclass_bytes = measure(build_dataclass)
+    compact_bytes = measure(build_compact)
+
+    return {
+        'records': count,
+        'dataclass_bytes': dataclass_bytes,
+        'compact_bytes': compact_bytes,
+        'dataclass_bytes_per_record': dataclass_bytes / count,
+        'compact_bytes_per_record': compact_bytes / count,
+        'reduction_pct': (1 - compact_bytes / dataclass_bytes) * 100 if dataclass_bytes else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Score result memory benchmark')
+    parser.add_argument('--records', type=int, default=100000,
+                       help='Number of results to hold in memory (default: 100000)')
+    args = parser.parse_args()
+
+    report = run_benchmark(args.records)
+
+    print(f"📊 Score result memory ({report['records']} records)")
+    print(f"   ScoreResult dataclass: {report['dataclass_bytes'] / 1e6:.1f} MB "
+          f"({report['dataclass_bytes_per_record']:.0f} B/record)")
+    print(f"   CompactScoreResult:    {report['compact_bytes'] / 1e6:.1f} MB "
+          f"({report['compact_bytes_per_record']:.0f} B/record)")
+    print(f"   Reduction: {report['reduction_pct']:.1f}%")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -14,6 +14,8 @@ from datetime import datetime
 dashboard_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, dashboard_path)
 from utils.schema_utils import normalize_schema_version
+from utils.file_utils import durable_append_jsonl, jsonl_lock
+from utils.key_index import open_key_index, filter_new_keys, record_key
 
 def load_existing_records(filepath: str) -> Set[Tuple[str, str]]:
     """
@@ -56,55 +58,75 @@ def check_duplicate(record: Dict, existing: Set[Tuple[str, str]]) -> bool:
     normalized_version = normalize_schema_version(schema_version)
     return (date, normalized_version) in existing
 
+def build_key_set(records: List[Dict]) -> Set[Tuple[str, str]]:
+    """
+    Normalized (date, schema_version) set for a list of records.
+    Build once and reuse with check_duplicate for bulk checks.
+    """
+    return {key for key in map(record_key, records) if key is not None}
+
 def check_duplicate_in_records(record: Dict, existing_records: List[Dict]) -> bool:
     """
     Convenience function to check duplicates against a list of existing records.
-    Converts records to normalized (date, schema_version) set for comparison.
+    Converts records to normalized (date, schema_version) set for comparison;
+    for many records, use build_key_set once and check_duplicate instead.
     """
-    existing_set = set()
-    for existing_record in existing_records:
-        date = existing_record.get('date', '')
-        schema_version = existing_record.get('schema_version', 'v1.0.0')
-        normalized_version = normalize_schema_version(schema_version)
-        if date:
-            existing_set.add((date, normalized_version))
-    
-    return check_duplicate(record, existing_set)
+    return check_duplicate(record, build_key_set(existing_records))
 
 def filter_duplicates(new_records: List[Dict], target_file: str) -> List[Dict]:
     """
     Filter out duplicate records based on existing data.
     Returns list of non-duplicate records.
-    """
-    existing = load_existing_records(target_file)
-    unique_records = []
-    duplicates_found = []
     
-    for record in new_records:
-        if check_duplicate(record, existing):
-            duplicates_found.append(record.get('date', 'unknown'))
-        else:
-            unique_records.append(record)
-            # Add to existing set to prevent duplicates within batch
-            date = record.get('date', '')
-            schema_version = record.get('schema_version', 'v1.0.0')
-            # Normalize schema version for consistency
-            normalized_version = normalize_schema_version(schema_version)
-            if date:
-                existing.add((date, normalized_version))
+    Existing keys come from the persistent key index (<target>.keys.db),
+    which only scans bytes appended since its last sync.
+    """
+    if os.path.exists(target_file):
+        with open_key_index(target_file) as index:
+            unique_records, duplicates = filter_new_keys(new_records, index)
+    else:
+        unique_records, duplicates = filter_new_keys(new_records, set())
     
-    if duplicates_found:
+    if duplicates:
+        duplicates_found = [record.get('date', 'unknown') for record in duplicates]
         print(f"⚠️  Found {len(duplicates_found)} duplicate records for dates: {', '.join(duplicates_found)}")
         print("   These will be skipped to maintain idempotence.")
     
     return unique_records
 
-def append_unique_records(source_file: str, target_file: str) -> int:
+def append_unique(records: List[Dict], target_file: str, lock_timeout: float = None) -> int:
+    """
+    Check-and-append records to target under an advisory lock.
+    
+    The (date, schema_version) check and the append happen while holding
+    <target>.lock, so concurrent ingest processes cannot both pass the check
+    for the same key. Returns count of records added, or -1 on error.
+    """
+    try:
+        with jsonl_lock(target_file, timeout=lock_timeout):
+            unique_records = filter_duplicates(records, target_file)
+            
+            if not unique_records:
+                print("✅ No new records to add (all would be duplicates)")
+                return 0
+            
+            # Append unique records (durable append also syncs the key index);
+            # the lock is already held
+            if not durable_append_jsonl(unique_records, target_file, lock=False):
+                return -1
+    except TimeoutError as e:
+        print(f"❌ {e}")
+        return -1
+    
+    print(f"✅ Added {len(unique_records)} unique records")
+    return len(unique_records)
+
+def append_unique_records(source_file: str, target_file: str, lock_timeout: float = None) -> int:
     """
     Append only unique records from source to target.
     Returns count of records added.
     """
-    # Load new records
+    # Load new records (outside the lock)
     new_records = []
     with open(source_file, 'r') as f:
         for line in f:
@@ -114,20 +136,7 @@ def append_unique_records(source_file: str, target_file: str) -> int:
                 except json.JSONDecodeError:
                     continue
     
-    # Filter duplicates
-    unique_records = filter_duplicates(new_records, target_file)
-    
-    if not unique_records:
-        print("✅ No new records to add (all would be duplicates)")
-        return 0
-    
-    # Append unique records
-    with open(target_file, 'a') as f:
-        for record in unique_records:
-            f.write(json.dumps(record) + '\n')
-    
-    print(f"✅ Added {len(unique_records)} unique records")
-    return len(unique_records)
+    return append_unique(new_records, target_file, lock_timeout)
 
 def validate_no_duplicates(filepath: str) -> bool:
     """
@@ -167,15 +176,37 @@ def validate_no_duplicates(filepath: str) -> bool:
     print(f"✅ No duplicates found in {len(seen)} records")
     return True
 
+def rebuild_key_index(filepath: str) -> bool:
+    """
+    Rebuild the persistent key index for a file from scratch (recovery).
+    Returns True on success.
+    """
+    if not os.path.exists(filepath):
+        print(f"❌ File not found: {filepath}")
+        return False
+    try:
+        with open_key_index(filepath) as index:
+            count = index.rebuild()
+            bloom = index.stats()['bloom']
+    except Exception as e:
+        print(f"❌ Key index rebuild failed for {filepath}: {e}")
+        return False
+    print(f"✅ Rebuilt key index for {filepath}: {count} keys")
+    print(f"   Bloom filter: {bloom['size_bytes']} bytes, {bloom['num_hashes']} hashes, "
+          f"est. FP rate {bloom['estimated_fp_rate']:.4%}")
+    return True
+
 def main():
     """CLI interface for duplicate guard."""
     import argparse
     
     parser = argparse.ArgumentParser(description='Duplicate guard for wellness data')
-    parser.add_argument('command', choices=['check', 'append', 'validate'],
+    parser.add_argument('command', choices=['check', 'append', 'validate', 'rebuild-index'],
                        help='Command to execute')
     parser.add_argument('file', help='File to check or validate')
     parser.add_argument('--target', help='Target file for append command')
+    parser.add_argument('--lock-timeout', type=float,
+                       help='Seconds to wait for the target lock (default: wait indefinitely)')
     
     args = parser.parse_args()
     
@@ -183,11 +214,15 @@ def main():
         success = validate_no_duplicates(args.file)
         sys.exit(0 if success else 1)
     
+    elif args.command == 'rebuild-index':
+        success = rebuild_key_index(args.file)
+        sys.exit(0 if success else 1)
+    
     elif args.command == 'append':
         if not args.target:
             print("❌ --target required for append command")
             sys.exit(1)
-        count = append_unique_records(args.file, args.target)
+        count = append_unique_records(args.file, args.target, args.lock_timeout)
         sys.exit(0 if count >= 0 else 1)
     
     elif args.command == 'check':
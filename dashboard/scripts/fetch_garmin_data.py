@@ -1,14 +1,37 @@
 #!/usr/bin/env python3
 """
 Fetch wellness data from Garmin Connect and convert to our schema.
+
+Each day needs four Garmin calls (steps, heart rates, sleep, stress).
+With --concurrency N those calls are fanned out over N threads for the
+whole date range, paced by a shared token bucket (--requests-per-sec),
+and records are reassembled in date order. Per-endpoint latency stats
+are logged after the fetch to help tune both settings.
+
+Responses are cached on disk per (endpoint, date, account) under
+--cache-dir (default private/garmin_cache). Today and yesterday expire
+within minutes (CACHE_TTLS); older days are kept until evicted, so
+re-running --days 30 only calls Garmin for the days that can still change.
+
+With --incremental the dates already in --output are read from its date
+index; only the gaps in the --days window plus the last --refetch-days
+days are fetched, and the results are merged into the file (appended when
+they are all newer, otherwise rewritten in date order).
+
+Login tokens are kept in private/ (--session-dir, mode 0600) and reused
+across runs; a full credential login only happens when the saved session
+is missing or rejected. Login/refresh timings are logged on connect.
 """
 
 import os
 import sys
 import json
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date as date_type, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
 from garminconnect import Garmin
 
 # Import Phase 3 modules and score engine
@@ -17,7 +40,15 @@ sys.path.insert(0, dashboard_path)
 from scripts.phase3.auto_run_tracker import add_auto_run_flag
 from scripts.phase3.battery_safeguard import should_skip_battery
 from score.engine import compute_score, MetricInputs, ScoreFlags, map_score_to_band
-from utils.file_utils import atomic_append_jsonl
+from utils.file_utils import (
+    atomic_append_jsonl, atomic_jsonl_update, atomic_write_jsonl, durable_append_jsonl
+)
+from utils.jsonl_index import date_bounds, indexed_dates, iter_range
+from utils.jsonl_writer import LatencyHistogram
+from utils.garmin_session import GarminSessionStore
+from utils.rate_limiter import TokenBucket
+from utils.response_cache import ResponseCache, account_key
+from config import Config
 
 # Set up logging
 logging.basicConfig(
@@ -26,22 +57,74 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Per-day Garmin calls: (endpoint name, Garmin client method)
+ENDPOINTS = (
+    ('steps', 'get_steps_data'),
+    ('heart_rate', 'get_heart_rates'),
+    ('sleep', 'get_sleep_data'),
+    ('stress', 'get_stress_data'),
+)
+
+# Response cache TTLs per endpoint: (recent days, settled days) in seconds.
+# None keeps settled days until evicted. Last night's sleep can sync late
+# in the morning, but it changes less often than intraday steps and stress.
+CACHE_TTLS = {
+    'steps': (15 * 60, None),
+    'heart_rate': (15 * 60, None),
+    'sleep': (60 * 60, None),
+    'stress': (15 * 60, None),
+}
+
 class GarminWellnessFetcher:
     """Fetch and transform Garmin Connect data to our wellness schema."""
     
-    def __init__(self, email: str, password: str):
-        """Initialize Garmin client."""
+    def __init__(self, email: str, password: str,
+                 concurrency: int = None, requests_per_sec: float = None,
+                 cache: Optional[ResponseCache] = None,
+                 session_store: Optional[GarminSessionStore] = None,
+                 shared_limiter: Optional[TokenBucket] = None):
+        """
+        Initialize Garmin client.
+        
+        Args:
+            concurrency: Threads for fetch_date_range (1 = one call at a time)
+            requests_per_sec: Shared Garmin request rate cap (0 = unlimited)
+            cache: Response cache consulted before every Garmin call (None = off)
+            session_store: Saved login session reused by connect() (None = log in every run)
+            shared_limiter: Rate limit shared with other fetchers (e.g. a fleet-wide cap)
+        """
         self.email = email
         self.password = password
         self.client = None
+        self.concurrency = max(1, concurrency if concurrency is not None else Config.GARMIN_FETCH_CONCURRENCY)
+        rate = requests_per_sec if requests_per_sec is not None else Config.GARMIN_REQUESTS_PER_SEC
+        self.limiter = TokenBucket(rate) if rate and rate > 0 else None
+        self.shared_limiter = shared_limiter
+        self._stats_lock = threading.Lock()
+        self.endpoint_latency = {name: LatencyHistogram() for name, _ in ENDPOINTS}
+        self.endpoint_errors = {name: 0 for name, _ in ENDPOINTS}
+        self.cache = cache
+        self.account = account_key(email)
+        self.session_store = session_store
+        self.session_stats: Dict[str, Any] = {}
         
     def connect(self) -> bool:
         """Establish connection to Garmin Connect."""
         try:
             logger.info("Connecting to Garmin Connect...")
-            self.client = Garmin(self.email, self.password)
-            self.client.login()
-            logger.info("Successfully connected to Garmin Connect")
+            if self.session_store is not None:
+                self.client = self.session_store.connect(self.email, self.password, factory=Garmin)
+                self.session_stats = dict(self.session_store.stats)
+            else:
+                started = time.monotonic()
+                self.client = Garmin(self.email, self.password)
+                self.client.login()
+                self.session_stats = {'mode': 'login', 'resume_s': None,
+                                      'login_s': round(time.monotonic() - started, 3)}
+            stats = self.session_stats
+            timings = ', '.join(f"{name} {stats[name]}s" for name in ('resume_s', 'login_s')
+                                if stats.get(name) is not None)
+            logger.info(f"Successfully connected to Garmin Connect ({stats['mode']}: {timings})")
             return True
         except Exception as e:
             logger.error(f"Failed to connect to Garmin Connect: {e}")
@@ -71,64 +154,91 @@ class GarminWellnessFetcher:
         try:
             date_str = date.strftime("%Y-%m-%d")
             logger.info(f"Fetching data for {date_str}")
-            
-            # Fetch various metrics from Garmin
-            # 1. Steps
-            steps_data = self.client.get_steps_data(date_str)
-            steps = steps_data[0]['steps'] if steps_data else 0
-            
-            # 2. Heart Rate (get resting HR from daily stats)
-            hr_data = self.client.get_heart_rates(date_str)
-            resting_hr = 60  # Default
-            if hr_data and 'restingHeartRate' in hr_data:
-                resting_hr = hr_data['restingHeartRate']
-            
-            # 3. Sleep (convert seconds to hours)
-            sleep_data = self.client.get_sleep_data(date_str)
-            sleep_hours = 0.0
-            if sleep_data and 'dailySleepDTO' in sleep_data:
-                sleep_seconds = sleep_data['dailySleepDTO'].get('sleepTimeSeconds', 0)
-                sleep_hours = round(sleep_seconds / 3600, 1)
-            
-            # 4. Stress (average stress level)
-            stress_data = self.client.get_stress_data(date_str)
-            stress_level = 50  # Default medium stress
-            if stress_data and isinstance(stress_data, list) and len(stress_data) > 0:
-                # Calculate average stress from available readings
-                stress_values = [s.get('stressLevel', 0) for s in stress_data 
-                                if s.get('stressLevel') is not None and s.get('stressLevel') > 0]
-                if stress_values:
-                    stress_level = int(sum(stress_values) / len(stress_values))
-            
-            # Build our wellness record
-            record = {
-                "date": date_str,
-                "metrics": {
-                    "steps": steps,
-                    "restingHeartRate": resting_hr,
-                    "sleepHours": sleep_hours,
-                    "stress": stress_level
-                }
-            }
-            
-            # Calculate wellness score using our formula
-            score = self.calculate_wellness_score(record['metrics'])
-            record['score'] = score
-            record['band'] = self.get_band(score)
-            
-            # Phase 3: Add auto-run flag (AC1)
-            record = add_auto_run_flag(record)
-            
-            logger.info(f"Fetched data for {date_str}: Score={score}, Steps={steps}, "
-                       f"RHR={resting_hr}, Sleep={sleep_hours}h, Stress={stress_level}, "
-                       f"AutoRun={record.get('auto_run', 0)}")
-            
-            return record
+            raw = {name: self.fetch_endpoint(name, date_str) for name, _ in ENDPOINTS}
+            return self.build_record(date_str, raw)
             
         except Exception as e:
             logger.error(f"Error fetching data for {date}: {e}")
             return None
     
+    def fetch_endpoint(self, name: str, date_str: str) -> Any:
+        """One Garmin call for a date (or a cache hit), rate limited and timed per endpoint."""
+        if self.cache is not None:
+            hit, response = self.cache.get(name, date_str, self.account)
+            if hit:
+                return response
+        method = dict(ENDPOINTS)[name]
+        if self.limiter is not None:
+            self.limiter.acquire()
+        if self.shared_limiter is not None:
+            self.shared_limiter.acquire()
+        started = time.monotonic()
+        try:
+            response = getattr(self.client, method)(date_str)
+            if self.cache is not None:
+                self.cache.put(name, date_str, self.account, response)
+            return response
+        except Exception:
+            with self._stats_lock:
+                self.endpoint_errors[name] += 1
+            raise
+        finally:
+            self.endpoint_latency[name].observe((time.monotonic() - started) * 1000)
+    
+    def build_record(self, date_str: str, raw: Dict[str, Any]) -> Dict:
+        """Build a wellness record from the four endpoint responses for a date."""
+        # 1. Steps
+        steps_data = raw['steps']
+        steps = steps_data[0]['steps'] if steps_data else 0
+        
+        # 2. Heart Rate (get resting HR from daily stats)
+        hr_data = raw['heart_rate']
+        resting_hr = 60  # Default
+        if hr_data and 'restingHeartRate' in hr_data:
+            resting_hr = hr_data['restingHeartRate']
+        
+        # 3. Sleep (convert seconds to hours)
+        sleep_data = raw['sleep']
+        sleep_hours = 0.0
+        if sleep_data and 'dailySleepDTO' in sleep_data:
+            sleep_seconds = sleep_data['dailySleepDTO'].get('sleepTimeSeconds', 0)
+            sleep_hours = round(sleep_seconds / 3600, 1)
+        
+        # 4. Stress (average stress level)
+        stress_data = raw['stress']
+        stress_level = 50  # Default medium stress
+        if stress_data and isinstance(stress_data, list) and len(stress_data) > 0:
+            # Calculate average stress from available readings
+            stress_values = [s.get('stressLevel', 0) for s in stress_data 
+                            if s.get('stressLevel') is not None and s.get('stressLevel') > 0]
+            if stress_values:
+                stress_level = int(sum(stress_values) / len(stress_values))
+        
+        # Build our wellness record
+        record = {
+            "date": date_str,
+            "metrics": {
+                "steps": steps,
+                "restingHeartRate": resting_hr,
+                "sleepHours": sleep_hours,
+                "stress": stress_level
+            }
+        }
+        
+        # Calculate wellness score using our formula
+        score = self.calculate_wellness_score(record['metrics'])
+        record['score'] = score
+        record['band'] = self.get_band(score)
+        
+        # Phase 3: Add auto-run flag (AC1)
+        record = add_auto_run_flag(record)
+        
+        logger.info(f"Fetched data for {date_str}: Score={score}, Steps={steps}, "
+                   f"RHR={resting_hr}, Sleep={sleep_hours}h, Stress={stress_level}, "
+                   f"AutoRun={record.get('auto_run', 0)}")
+        
+        return record
+    
     def calculate_wellness_score(self, metrics: Dict) -> int:
         """
         Calculate wellness score using the unified score engine.
@@ -157,18 +267,87 @@ class GarminWellnessFetcher:
         return map_score_to_band(score)
     
     def fetch_date_range(self, start_date: datetime, end_date: datetime) -> List[Dict]:
-        """Fetch data for a date range."""
-        records = []
+        """Fetch data for a date range (concurrently if concurrency > 1)."""
+        dates = []
         current_date = start_date
-        
         while current_date <= end_date:
-            record = self.fetch_daily_data(current_date)
+            dates.append(current_date)
+            current_date += timedelta(days=1)
+        return self.fetch_dates(dates)
+    
+    def fetch_dates(self, dates: List[datetime]) -> List[Dict]:
+        """Fetch data for specific dates, in the order given (need not be contiguous)."""
+        if self.concurrency > 1 and len(dates) > 1:
+            return self.fetch_dates_concurrent(dates)
+        
+        records = []
+        for date in dates:
+            record = self.fetch_daily_data(date)
             if record:
                 records.append(record)
-            current_date += timedelta(days=1)
-            
         return records
     
+    def fetch_dates_concurrent(self, dates: List[datetime]) -> List[Dict]:
+        """
+        Fan out every (date, endpoint) call over the thread pool.
+        
+        Calls share the rate limiter; a date with any failed call is skipped
+        (as in fetch_daily_data). Records are returned in date order.
+        """
+        if not self.client:
+            logger.error("Not connected to Garmin")
+            return []
+        
+        date_strs = [date.strftime("%Y-%m-%d") for date in dates]
+        logger.info(f"Fetching {len(date_strs)} days ({len(date_strs) * len(ENDPOINTS)} calls) "
+                    f"with {self.concurrency} workers")
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {
+                (date_str, name): executor.submit(self.fetch_endpoint, name, date_str)
+                for date_str in date_strs for name, _ in ENDPOINTS
+            }
+        
+        records = []
+        for date_str in date_strs:
+            try:
+                raw = {name: futures[(date_str, name)].result() for name, _ in ENDPOINTS}
+                records.append(self.build_record(date_str, raw))
+            except Exception as e:
+                logger.error(f"Error fetching data for {date_str}: {e}")
+        return records
+    
+    def endpoint_stats(self) -> Dict[str, Dict]:
+        """Per-endpoint call latency (ms percentiles) and error counts."""
+        stats = {}
+        for name, _ in ENDPOINTS:
+            latency = self.endpoint_latency[name].to_dict()
+            latency.pop('buckets')
+            latency['errors'] = self.endpoint_errors[name]
+            stats[name] = latency
+        if self.limiter is not None:
+            stats['rate_limiter'] = self.limiter.stats()
+        if self.cache is not None:
+            stats['cache'] = self.cache.stats()
+        if self.session_stats:
+            stats['session'] = dict(self.session_stats)
+        return stats
+    
+    def log_endpoint_stats(self) -> None:
+        for name, _ in ENDPOINTS:
+            latency = self.endpoint_latency[name].to_dict()
+            if latency['count']:
+                logger.info(f"Endpoint {name}: {latency['count']} calls, p50 {latency['p50_ms']}ms, "
+                            f"p95 {latency['p95_ms']}ms, max {latency['max_ms']}ms, "
+                            f"errors {self.endpoint_errors[name]}")
+        if self.limiter is not None:
+            limiter = self.limiter.stats()
+            logger.info(f"Rate limiter: {limiter['rate']}/s, waited {limiter['wait_s']}s")
+        if self.cache is not None:
+            cache = self.cache.stats()
+            logger.info(f"Response cache: {cache['hits']} hits, {cache['misses']} misses "
+                        f"({cache['expired']} expired), {cache['evictions']} evicted, "
+                        f"{cache['entries']} entries / {cache['bytes'] / 1024:.0f} KB")
+    
     def fetch_last_n_days(self, days: int = 30) -> List[Dict]:
         """Fetch data for the last N days."""
         end_date = datetime.now().date()
@@ -179,6 +358,77 @@ class GarminWellnessFetcher:
             datetime.combine(end_date, datetime.min.time())
         )
 
+def plan_incremental_dates(present: Iterable[str], start: date_type, end: date_type,
+                           refetch_days: int) -> List[date_type]:
+    """
+    Dates to fetch for an incremental run, ascending.
+    
+    Every date in [start, end] missing from present, plus the last
+    refetch_days days up to end (still syncing, so fetched even if present).
+    """
+    present = set(present)
+    refetch_from = end - timedelta(days=refetch_days - 1)
+    dates = []
+    day = start
+    while day <= end:
+        if day >= refetch_from or day.isoformat() not in present:
+            dates.append(day)
+        day += timedelta(days=1)
+    return dates
+
+def _without_run_flag(record: Dict) -> Dict:
+    return {k: v for k, v in record.items() if k != 'auto_run'}
+
+def merge_into_history(records: List[Dict], output_path: str) -> Dict[str, Any]:
+    """
+    Merge fetched records into an existing JSONL history, one record per date.
+    
+    Records for new dates are added and changed ones replace the stored
+    record; a record that only differs in its auto_run flag is left as is.
+    Only new dates newer than the file's last date: O(new) durable append.
+    Anything else: one atomic rewrite in date order.
+    
+    Returns:
+        {'added', 'replaced', 'unchanged', 'mode': 'append'|'rewrite'|'none', 'ok'}
+    """
+    by_date = {record['date']: record for record in records}
+    stats = {'added': 0, 'replaced': 0, 'unchanged': 0, 'mode': 'none', 'ok': True}
+    if not by_date:
+        return stats
+    if not os.path.exists(output_path):
+        stats['added'] = len(by_date)
+        stats['mode'] = 'rewrite'
+        stats['ok'] = atomic_write_jsonl([by_date[d] for d in sorted(by_date)], output_path)
+        return stats
+    
+    dates = sorted(by_date)
+    existing = {r.get('date'): r for r in iter_range(output_path, dates[0], dates[-1])}
+    changes = {}
+    for date_str in dates:
+        old = existing.get(date_str)
+        if old is None:
+            stats['added'] += 1
+        elif _without_run_flag(old) == _without_run_flag(by_date[date_str]):
+            stats['unchanged'] += 1
+            continue
+        else:
+            stats['replaced'] += 1
+        changes[date_str] = by_date[date_str]
+    if not changes:
+        return stats
+    
+    newest = date_bounds(output_path)[1]
+    if not stats['replaced'] and (newest is None or min(changes) > newest):
+        stats['mode'] = 'append'
+        stats['ok'] = durable_append_jsonl([changes[d] for d in sorted(changes)], output_path)
+    else:
+        def merge(history: List[Dict]) -> List[Dict]:
+            kept = [r for r in history if r.get('date') not in changes]
+            return sorted(kept + list(changes.values()), key=lambda r: str(r.get('date', '')))
+        stats['mode'] = 'rewrite'
+        stats['ok'] = atomic_jsonl_update(output_path, merge)
+    return stats
+
 def save_telemetry(records: list, output_dir: str = "dashboard/data"):
     """
     Save privacy-preserving telemetry data.
@@ -194,8 +444,8 @@ def save_telemetry(records: list, output_dir: str = "dashboard/data"):
         telemetry = DataIntegrity.create_telemetry_record(record, auto_run=False)
         telemetry_records.append(telemetry)
     
-    # Use atomic write for telemetry
-    if atomic_append_jsonl(telemetry_records, telemetry_file):
+    # O(1) durable append: only the new telemetry lines are written
+    if atomic_append_jsonl(telemetry_records, telemetry_file, mode='append'):
         logger.info(f"Telemetry saved to {telemetry_file}")
     else:
         logger.error(f"Failed to save telemetry to {telemetry_file}")
@@ -222,6 +472,24 @@ def main():
                        help='Output file path (default: dashboard/data/garmin_wellness.jsonl)')
     parser.add_argument('--date', type=str, 
                        help='Fetch specific date (YYYY-MM-DD)')
+    parser.add_argument('--concurrency', type=int, default=Config.GARMIN_FETCH_CONCURRENCY,
+                       help=f'Concurrent Garmin calls (default: {Config.GARMIN_FETCH_CONCURRENCY})')
+    parser.add_argument('--requests-per-sec', type=float, default=Config.GARMIN_REQUESTS_PER_SEC,
+                       help=f'Garmin request rate cap, 0 for none (default: {Config.GARMIN_REQUESTS_PER_SEC})')
+    parser.add_argument('--cache-dir', type=str, default=Config.GARMIN_CACHE_DIR,
+                       help=f'Response cache directory (default: {Config.GARMIN_CACHE_DIR})')
+    parser.add_argument('--cache-max-mb', type=int, default=Config.GARMIN_CACHE_MAX_MB,
+                       help=f'Response cache size cap in MB (default: {Config.GARMIN_CACHE_MAX_MB})')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Always call Garmin; neither read nor update the response cache')
+    parser.add_argument('--session-dir', type=str, default=Config.GARMIN_SESSION_DIR,
+                       help=f'Directory for the saved login session (default: {Config.GARMIN_SESSION_DIR})')
+    parser.add_argument('--no-session', action='store_true',
+                       help='Log in with credentials and do not save the session')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Fetch only dates missing from --output within --days, plus recent days, and merge')
+    parser.add_argument('--refetch-days', type=int, default=Config.GARMIN_REFETCH_DAYS,
+                       help=f'Recent days re-fetched in --incremental mode (default: {Config.GARMIN_REFETCH_DAYS})')
     args = parser.parse_args()
     
     # Phase 3: Battery safeguard check (AC4)
@@ -230,7 +498,15 @@ def main():
         sys.exit(0)
     
     # Create fetcher and connect
-    fetcher = GarminWellnessFetcher(email, password)
+    cache = None
+    if not args.no_cache and args.cache_dir:
+        cache = ResponseCache(args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024, ttls=CACHE_TTLS)
+    session_store = None
+    if not args.no_session and args.session_dir:
+        session_store = GarminSessionStore(args.session_dir, email)
+    fetcher = GarminWellnessFetcher(email, password, concurrency=args.concurrency,
+                                    requests_per_sec=args.requests_per_sec, cache=cache,
+                                    session_store=session_store)
     if not fetcher.connect():
         sys.exit(1)
     
@@ -240,21 +516,44 @@ def main():
         date = datetime.strptime(args.date, "%Y-%m-%d")
         records = [fetcher.fetch_daily_data(date)]
         records = [r for r in records if r]  # Filter None values
+    elif args.incremental:
+        end_date = datetime.now().date()
+        start_date = end_date - timedelta(days=args.days - 1)
+        present = indexed_dates(args.output, start_date.isoformat(), end_date.isoformat())
+        dates = plan_incremental_dates(present, start_date, end_date, max(args.refetch_days, 0))
+        logger.info(f"Incremental fetch: {len(present)} of {args.days} days present, "
+                    f"fetching {len(dates)} ({max(args.refetch_days, 0)} recent re-fetched)")
+        if not dates:
+            # History already complete and no recent days to refresh
+            logger.info(f"Nothing to fetch; {args.output} is up to date")
+            if cache is not None:
+                cache.close()
+            sys.exit(0)
+        records = fetcher.fetch_dates([datetime.combine(d, datetime.min.time()) for d in dates])
     else:
         # Fetch last N days
         logger.info(f"Fetching last {args.days} days of data...")
         records = fetcher.fetch_last_n_days(args.days)
+    fetcher.log_endpoint_stats()
+    if cache is not None:
+        cache.close()
     
     if not records:
         logger.error("No data fetched")
         sys.exit(1)
     
-    # Save to file atomically
+    # Save to file atomically (atomic write prevents corruption)
     os.makedirs(os.path.dirname(args.output), exist_ok=True)
     
-    # Use atomic write to prevent corruption
-    from utils.file_utils import atomic_write_jsonl
-    if atomic_write_jsonl(records, args.output):
+    if args.incremental and not args.date:
+        # Merge into the existing history (O(new) append when possible)
+        merge = merge_into_history(records, args.output)
+        if not merge['ok']:
+            logger.error(f"Failed to merge records into {args.output}")
+            sys.exit(1)
+        logger.info(f"Merged into {args.output} ({merge['mode']}): {merge['added']} added, "
+                    f"{merge['replaced']} replaced, {merge['unchanged']} unchanged")
+    elif atomic_write_jsonl(records, args.output):
         logger.info(f"Successfully saved {len(records)} records to {args.output}")
     else:
         logger.error(f"Failed to save records to {args.output}")
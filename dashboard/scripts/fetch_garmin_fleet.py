@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Fetch wellness data for many Garmin accounts in one process.
+
+Accounts come from a JSON manifest (keep it in private/); passwords are
+read from the environment variable each account names, never from the
+manifest itself:
+
+    {"accounts": [
+        {"id": "alice", "email": "alice@example.com", "password_env": "GARMIN_PASSWORD_ALICE"},
+        {"id": "bob", "email": "bob@example.com", "password_env": "GARMIN_PASSWORD_BOB",
+         "days": 7, "requests_per_sec": 2}
+    ]}
+
+--workers accounts are fetched at a time. Every Garmin call (and login)
+is paced by the account's own token bucket (--requests-per-sec) and by a
+fleet-wide one (--global-requests-per-sec). Sessions, the response cache
+and incremental merging work as in fetch_garmin_data.py; each account
+writes its own partition, <output-dir>/<id>/garmin_wellness.jsonl.
+
+One summary covers the fleet: records fetched, failed accounts and the
+p50/p95 of per-account fetch time.
+
+Usage:
+  python3 dashboard/scripts/fetch_garmin_fleet.py private/accounts.json --workers 4 --incremental
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+# Add dashboard path for imports
+dashboard_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, dashboard_path)
+from fetch_garmin_data import (
+    CACHE_TTLS, ENDPOINTS, GarminWellnessFetcher, merge_into_history, plan_incremental_dates
+)
+from scripts.phase3.battery_safeguard import should_skip_battery
+from utils.file_utils import atomic_write_jsonl
+from utils.garmin_session import GarminSessionStore
+from utils.jsonl_index import indexed_dates
+from utils.rate_limiter import TokenBucket
+from utils.response_cache import ResponseCache
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+ACCOUNT_ID_RE = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_.-]*$')
+PARTITION_FILE = 'garmin_wellness.jsonl'
+
+
+def load_manifest(path: str) -> List[Dict[str, Any]]:
+    """
+    Read and validate an accounts manifest ({"accounts": [...]} or a bare list).
+
+    Raises:
+        ValueError: Missing fields, unsafe or duplicate ids, or inline passwords
+    """
+    with open(path, 'r') as f:
+        data = json.load(f)
+    accounts = data.get('accounts') if isinstance(data, dict) else data
+    if not isinstance(accounts, list) or not accounts:
+        raise ValueError("Manifest must contain a non-empty 'accounts' list")
+    seen = set()
+    for n, account in enumerate(accounts):
+        if not isinstance(account, dict):
+            raise ValueError(f"Account #{n} is not an object")
+        if 'password' in account:
+            raise ValueError(f"Account #{n}: inline passwords are not allowed, use password_env")
+        for field in ('id', 'email', 'password_env'):
+            if not account.get(field):
+                raise ValueError(f"Account #{n}: missing '{field}'")
+        if not ACCOUNT_ID_RE.match(str(account['id'])):
+            raise ValueError(f"Account #{n}: id '{account['id']}' is not a safe directory name")
+        if account['id'] in seen:
+            raise ValueError(f"Duplicate account id '{account['id']}'")
+        seen.add(account['id'])
+    return accounts
+
+
+def partition_path(output_dir: str, account_id: str) -> str:
+    return os.path.join(output_dir, account_id, PARTITION_FILE)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of values (0 if empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceil
+    return ordered[int(rank) - 1]
+
+
+class FleetFetcher:
+    """Fetch a manifest of accounts over a worker pool under shared rate limits."""
+
+    def __init__(self, accounts: List[Dict[str, Any]], output_dir: str, days: int = 30,
+                 workers: int = None, concurrency: int = 1,
+                 requests_per_sec: float = None, global_requests_per_sec: float = None,
+                 incremental: bool = False, refetch_days: int = None,
+                 cache: Optional[ResponseCache] = None, session_dir: Optional[str] = None,
+                 fetcher_factory: Callable[..., GarminWellnessFetcher] = GarminWellnessFetcher):
+        """
+        Args:
+            accounts: Validated manifest entries (load_manifest)
+            output_dir: Root of the per-account partitions
+            days: Default window per account (manifest 'days' overrides)
+            workers: Accounts fetched at a time
+            concurrency: Concurrent Garmin calls within one account
+            requests_per_sec: Default per-account rate cap (manifest 'requests_per_sec' overrides; 0 = none)
+            global_requests_per_sec: Fleet-wide rate cap across all accounts (0 = none)
+            incremental: Fetch only missing + recent dates and merge into each partition
+            refetch_days: Recent days re-fetched in incremental mode
+            cache: Response cache shared by all accounts (entries are keyed per account)
+            session_dir: Directory for saved login sessions (None = log in every run)
+            fetcher_factory: GarminWellnessFetcher or a compatible class (tests)
+        """
+        self.accounts = accounts
+        self.output_dir = output_dir
+        self.days = days
+        self.workers = max(1, workers if workers is not None else Config.GARMIN_FLEET_WORKERS)
+        self.concurrency = concurrency
+        self.requests_per_sec = (requests_per_sec if requests_per_sec is not None
+                                 else Config.GARMIN_REQUESTS_PER_SEC)
+        rate = (global_requests_per_sec if global_requests_per_sec is not None
+                else Config.GARMIN_FLEET_REQUESTS_PER_SEC)
+        self.global_limiter = TokenBucket(rate) if rate and rate > 0 else None
+        self.incremental = incremental
+        self.refetch_days = refetch_days if refetch_days is not None else Config.GARMIN_REFETCH_DAYS
+        self.cache = cache
+        self.session_dir = session_dir
+        self.fetcher_factory = fetcher_factory
+
+    def _dates(self, output_path: str, days: int) -> List[datetime]:
+        end_date = datetime.now().date()
+        start_date = end_date - timedelta(days=days - 1)
+        if self.incremental:
+            present = indexed_dates(output_path, start_date.isoformat(), end_date.isoformat())
+            dates = plan_incremental_dates(present, start_date, end_date, max(self.refetch_days, 0))
+        else:
+            dates = [start_date + timedelta(days=n) for n in range(days)]
+        return [datetime.combine(d, datetime.min.time()) for d in dates]
+
+    def fetch_account(self, account: Dict[str, Any]) -> Dict[str, Any]:
+        """Login, fetch and write one account's partition; never raises."""
+        started = time.monotonic()
+        output_path = partition_path(self.output_dir, account['id'])
+        result = {'account': account['id'], 'status': 'failed', 'records': 0, 'dates': 0,
+                  'output': output_path, 'error': None}
+        try:
+            password = os.getenv(account['password_env'])
+            if not password:
+                raise RuntimeError(f"{account['password_env']} is not set")
+            rate = account.get('requests_per_sec', self.requests_per_sec)
+            session_store = (GarminSessionStore(self.session_dir, account['email'])
+                             if self.session_dir else None)
+            fetcher = self.fetcher_factory(account['email'], password, concurrency=self.concurrency,
+                                           requests_per_sec=rate, cache=self.cache,
+                                           session_store=session_store,
+                                           shared_limiter=self.global_limiter)
+            if self.global_limiter is not None:
+                self.global_limiter.acquire()  # the login counts against the fleet budget
+            if not fetcher.connect():
+                raise RuntimeError("login failed")
+            result['session'] = fetcher.session_stats.get('mode')
+
+            dates = self._dates(output_path, int(account.get('days', self.days)))
+            result['dates'] = len(dates)
+            records = fetcher.fetch_dates(dates) if dates else []
+            result['records'] = len(records)
+            result['failed_dates'] = len(dates) - len(records)
+
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            if self.incremental:
+                merge = merge_into_history(records, output_path)
+                if not merge['ok']:
+                    raise RuntimeError(f"failed to merge into {output_path}")
+                result['merge'] = {k: merge[k] for k in ('added', 'replaced', 'unchanged', 'mode')}
+            elif records and not atomic_write_jsonl(records, output_path):
+                raise RuntimeError(f"failed to write {output_path}")
+
+            stats = fetcher.endpoint_stats()
+            result['calls'] = sum(stats[name]['count'] for name, _ in ENDPOINTS)
+            result['call_p95_ms'] = max(stats[name]['p95_ms'] for name, _ in ENDPOINTS)
+            if dates and not records:
+                raise RuntimeError("no data fetched")
+            result['status'] = 'ok'
+        except Exception as e:
+            result['error'] = str(e)
+            logger.error(f"Account {account['id']} failed: {e}")
+        result['elapsed_s'] = round(time.monotonic() - started, 3)
+        return result
+
+    def run(self) -> Dict[str, Any]:
+        """Fetch every account; results are in manifest order."""
+        started = time.monotonic()
+        logger.info(f"Fetching {len(self.accounts)} accounts with {self.workers} workers")
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(self.fetch_account, self.accounts))
+        return self.summarize(results, time.monotonic() - started)
+
+    def summarize(self, results: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+        latencies = [r['elapsed_s'] for r in results]
+        summary = {
+            'accounts': len(results),
+            'succeeded': sum(1 for r in results if r['status'] == 'ok'),
+            'failed': sum(1 for r in results if r['status'] != 'ok'),
+            'records': sum(r['records'] for r in results),
+            'elapsed_s': round(elapsed, 3),
+            'account_latency_s': {
+                'p50': percentile(latencies, 50),
+                'p95': percentile(latencies, 95),
+                'max': max(latencies) if latencies else 0.0,
+            },
+            'results': results,
+        }
+        if self.global_limiter is not None:
+            summary['global_rate_limiter'] = self.global_limiter.stats()
+        if self.cache is not None:
+            summary['cache'] = self.cache.stats()
+        return summary
+
+
+def print_fleet_summary(summary: Dict[str, Any]) -> None:
+    latency = summary['account_latency_s']
+    print("\n📊 Fleet Fetch Summary:")
+    print(f"   Accounts: {summary['succeeded']}/{summary['accounts']} succeeded in {summary['elapsed_s']}s")
+    print(f"   Records fetched: {summary['records']}")
+    print(f"   Per-account latency: p50 {latency['p50']}s, p95 {latency['p95']}s, max {latency['max']}s")
+    if 'cache' in summary:
+        print(f"   Response cache: {summary['cache']['hits']} hits, {summary['cache']['misses']} misses")
+    for result in summary['results']:
+        if result['status'] == 'ok':
+            print(f"   ✅ {result['account']}: {result['records']} records, {result['elapsed_s']}s "
+                  f"({result.get('session') or 'login'})")
+        else:
+            print(f"   ❌ {result['account']}: {result['error']} ({result['elapsed_s']}s)")
+
+
+def main():
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Fetch Garmin wellness data for a fleet of accounts')
+    parser.add_argument('manifest', help='Accounts manifest (JSON)')
+    parser.add_argument('--output-dir', type=str, default='dashboard/data/accounts',
+                        help='Root of per-account partitions (default: dashboard/data/accounts)')
+    parser.add_argument('--days', type=int, default=30, help='Days per account (default: 30)')
+    parser.add_argument('--workers', type=int, default=Config.GARMIN_FLEET_WORKERS,
+                        help=f'Accounts fetched at a time (default: {Config.GARMIN_FLEET_WORKERS})')
+    parser.add_argument('--concurrency', type=int, default=Config.GARMIN_FETCH_CONCURRENCY,
+                        help=f'Concurrent Garmin calls per account (default: {Config.GARMIN_FETCH_CONCURRENCY})')
+    parser.add_argument('--requests-per-sec', type=float, default=Config.GARMIN_REQUESTS_PER_SEC,
+                        help=f'Per-account rate cap, 0 for none (default: {Config.GARMIN_REQUESTS_PER_SEC})')
+    parser.add_argument('--global-requests-per-sec', type=float, default=Config.GARMIN_FLEET_REQUESTS_PER_SEC,
+                        help=f'Fleet-wide rate cap, 0 for none (default: {Config.GARMIN_FLEET_REQUESTS_PER_SEC})')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Fetch only missing and recent dates and merge into each partition')
+    parser.add_argument('--refetch-days', type=int, default=Config.GARMIN_REFETCH_DAYS,
+                        help=f'Recent days re-fetched in --incremental mode (default: {Config.GARMIN_REFETCH_DAYS})')
+    parser.add_argument('--cache-dir', type=str, default=Config.GARMIN_CACHE_DIR,
+                        help=f'Response cache directory (default: {Config.GARMIN_CACHE_DIR})')
+    parser.add_argument('--cache-max-mb', type=int, default=Config.GARMIN_CACHE_MAX_MB,
+                        help=f'Response cache size cap in MB (default: {Config.GARMIN_CACHE_MAX_MB})')
+    parser.add_argument('--no-cache', action='store_true', help='Do not use the response cache')
+    parser.add_argument('--session-dir', type=str, default=Config.GARMIN_SESSION_DIR,
+                        help=f'Directory for saved login sessions (default: {Config.GARMIN_SESSION_DIR})')
+    parser.add_argument('--no-session', action='store_true', help='Log in every account with credentials')
+    parser.add_argument('--summary-json', type=str, help='Also write the summary to this JSON file')
+    args = parser.parse_args()
+
+    if should_skip_battery():
+        logger.info("Skipping fleet fetch due to low battery")
+        sys.exit(0)
+
+    try:
+        accounts = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"❌ Invalid accounts manifest {args.manifest}: {e}")
+        sys.exit(1)
+
+    cache = None
+    if not args.no_cache and args.cache_dir:
+        cache = ResponseCache(args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024, ttls=CACHE_TTLS)
+    fleet = FleetFetcher(accounts, args.output_dir, days=args.days, workers=args.workers,
+                         concurrency=args.concurrency, requests_per_sec=args.requests_per_sec,
+                         global_requests_per_sec=args.global_requests_per_sec,
+                         incremental=args.incremental, refetch_days=args.refetch_days, cache=cache,
+                         session_dir=None if args.no_session else (args.session_dir or None))
+    summary = fleet.run()
+    if cache is not None:
+        cache.close()
+
+    print_fleet_summary(summary)
+    if args.summary_json:
+        with open(args.summary_json, 'w') as f:
+            json.dump(summary, f, indent=2)
+    sys.exit(0 if summary['failed'] == 0 else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Asyncio InfluxDB ingestion for many daily-record files at once.
+
+Posts gzip-compressed line protocol to /api/v2/write over a pool of
+keep-alive connections (utils.influx_async), with up to --concurrency
+write requests in flight across all files. No InfluxDBClient is needed.
+
+Usage:
+  PYTHONPATH=. python3 dashboard/scripts/ingest_async.py a.jsonl b.jsonl --concurrency 8
+  # Offline: write to a local stand-in server and report throughput/latency
+  PYTHONPATH=. python3 dashboard/scripts/ingest_async.py a.jsonl --standin --standin-latency-ms 20
+
+Environment (.env): INFLUXDB_URL, INFLUXDB_ORG, INFLUXDB_BUCKET, INFLUXDB_TOKEN
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+# Add dashboard path for utils import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.batch_pipeline import DEFAULT_MAX_ITEMS, DEFAULT_MAX_RETRIES
+from utils.influx_async import AsyncIngestRunner, AsyncWritePool, DEFAULT_CONCURRENCY
+from utils.influx_standin import StandInWriteServer
+
+try:
+    from dotenv import load_dotenv
+except ImportError:
+    load_dotenv = None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest daily records into InfluxDB with asyncio")
+    parser.add_argument("records", nargs="+", help="JSON Lines daily records files")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Write requests in flight across all files (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--batch-points", type=int, default=DEFAULT_MAX_ITEMS,
+                        help=f"Points per write request (default: {DEFAULT_MAX_ITEMS})")
+    parser.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES,
+                        help=f"Retries per batch on 429/5xx/connection errors (default: {DEFAULT_MAX_RETRIES})")
+    parser.add_argument("--gzip-level", type=int, default=6, help="Body gzip level, 0 to disable (default: 6)")
+    parser.add_argument("--url", help="InfluxDB URL (default: $INFLUXDB_URL or http://localhost:8086)")
+    parser.add_argument("--org", help="Organization (default: $INFLUXDB_ORG or local)")
+    parser.add_argument("--bucket", help="Bucket (default: $INFLUXDB_BUCKET or garmin)")
+    parser.add_argument("--token", help="API token (default: $INFLUXDB_TOKEN)")
+    parser.add_argument("--standin", action="store_true",
+                        help="Write to a local stand-in server instead of InfluxDB (offline benchmark)")
+    parser.add_argument("--standin-latency-ms", type=float, default=0.0, help="Stand-in response latency")
+    parser.add_argument("--standin-error-rate", type=float, default=0.0, help="Stand-in injected 503 rate")
+    parser.add_argument("--json", action="store_true", help="Print the full stats as JSON")
+    return parser.parse_args(argv)
+
+
+def print_summary(stats):
+    latency = stats['request_latency']
+    pool = stats['pool']
+    print(f"Wrote {stats['points_written']} points from {len(stats['files'])} files in "
+          f"{stats['batches_written']} batches ({stats['elapsed_s']}s, {stats['points_per_sec']} points/sec)")
+    print(f"   Request latency: p50 {latency['p50_ms']}ms, p95 {latency['p95_ms']}ms, "
+          f"p99 {latency['p99_ms']}ms, max {latency['max_ms']}ms")
+    print(f"   Connections: {pool['connections_opened']} opened for {pool['requests']} requests; "
+          f"gzip {pool['compression_ratio']}x; retries: {stats['retries']}")
+    for file_stats in stats['files']:
+        if file_stats['failed_batches']:
+            print(f"❌ {file_stats['file']}: {file_stats['failed_batches']} batches failed: "
+                  f"{file_stats['last_error']}", file=sys.stderr)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    missing = [path for path in args.records if not os.path.exists(path)]
+    if missing:
+        print(f"File not found: {', '.join(missing)}", file=sys.stderr)
+        return 1
+
+    if load_dotenv is not None:
+        load_dotenv()
+    server = None
+    if args.standin:
+        server = StandInWriteServer(latency_ms=args.standin_latency_ms, error_rate=args.standin_error_rate,
+                                    keep_payloads=False).start()
+        url, token = server.url, ''
+    else:
+        url = args.url or os.getenv("INFLUXDB_URL", "http://localhost:8086")
+        token = args.token or os.getenv("INFLUXDB_TOKEN", "")
+        if not token:
+            print("Error: INFLUXDB_TOKEN not found in .env or environment", file=sys.stderr)
+            return 1
+
+    try:
+        pool = AsyncWritePool(url, org=args.org or os.getenv("INFLUXDB_ORG", "local"),
+                              bucket=args.bucket or os.getenv("INFLUXDB_BUCKET", "garmin"),
+                              token=token, pool_size=args.concurrency, gzip_level=args.gzip_level)
+        runner = AsyncIngestRunner(pool, concurrency=args.concurrency, batch_points=args.batch_points,
+                                   max_retries=args.max_retries)
+        print(f"Ingesting {len(args.records)} files into {url} (concurrency {args.concurrency})")
+        stats = asyncio.run(runner.run(args.records))
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if server is not None:
+            server.stop()
+
+    if args.json:
+        print(json.dumps(stats, indent=2))
+    else:
+        print_summary(stats)
+    if stats['failed_batches']:
+        return 1
+    print(f"✅ Successfully ingested {sum(f['records'] for f in stats['files'])} daily records")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
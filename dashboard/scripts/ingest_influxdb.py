@@ -9,6 +9,49 @@ Measurements created:
 
 Usage:
   PYTHONPATH=. python3 dashboard/scripts/ingest_influxdb.py input.jsonl
+  PYTHONPATH=. python3 dashboard/scripts/ingest_influxdb.py input.jsonl --stream \
+      --batch-points 5000 --max-in-flight 2
+
+--stream reads the file incrementally and writes fixed-size batches on a
+background writer (bounded in-flight batches, jittered retry per batch),
+then reports per-batch latency and points/sec.
+
+--encoder fast encodes records straight to line protocol
+(utils.line_protocol) instead of building Point objects; output is
+byte-identical.
+
+--resume keeps a byte-offset checkpoint next to the input
+(<input>.ingest-checkpoint.json, see utils.ingest_checkpoint) and only
+streams lines appended since the last successful run. If the file was
+truncated or rewritten it re-ingests everything, or with --rewind-days N
+only records from N days before the last checkpointed date.
+
+Passing a directory or a glob instead of a file ingests every matching
+file (--pattern, default *.jsonl) on a pool of --workers threads, always
+with per-file checkpoints: files with nothing new since their checkpoint
+are skipped, and so are files whose first record is not a daily score
+record (telemetry, plans, adherence logs). --points-per-sec caps the
+combined write rate. The exit status is non-zero if any file failed, and
+only those files are listed.
+
+  PYTHONPATH=. python3 dashboard/scripts/ingest_influxdb.py dashboard/data --workers 4 \
+      --points-per-sec 20000
+  PYTHONPATH=. python3 dashboard/scripts/ingest_influxdb.py 'exports/*/daily_*.jsonl'
+
+--spool DIR keeps a write-ahead spool (utils.ingest_spool): if the health
+check fails, batches are encoded into the spool (and checkpoints advance)
+instead of exiting; batches that exhaust their retries are spooled too.
+The next healthy run drains the spool first at --drain-points-per-sec,
+then ingests new data. The spool is capped at --spool-max-mb, evicting
+the oldest batches.
+
+--rollups also writes weekly/monthly wb_score_rollup / wb_contrib_rollup
+points (utils.rollups) for the periods touched by this run, merged with
+earlier runs through <records>.rollups.json, so long-window panels read
+one point per week or month. A directory/glob run folds every file into
+one shared state (<directory>/ingest.rollups.json) and writes the rollups
+once, after all files, so files covering the same week add up instead of
+overwriting each other's partial points.
 
 Requires:
   pip install influxdb-client
@@ -21,10 +64,31 @@ Environment (.env):
 """
 from __future__ import annotations
 import os, sys, json, pathlib
-from typing import Any, Dict
+import argparse
+import glob
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 from datetime import datetime, timezone
 import time
 
+# Add dashboard path for utils import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.batch_pipeline import (
+    BatchPipeline, DEFAULT_MAX_ITEMS, DEFAULT_MAX_BYTES, DEFAULT_MAX_IN_FLIGHT, DEFAULT_MAX_RETRIES
+)
+from utils.line_protocol import DailyRecordEncoder
+from utils.ingest_checkpoint import (
+    checkpoint_path, iter_lines_from, line_hash, load_checkpoint, plan_resume, save_checkpoint
+)
+from utils.rate_limiter import TokenBucket
+from utils.ingest_spool import IngestSpool
+from utils.rollups import RollupState, rollup_state_path
+from config import Config
+
+ENCODERS = ("point", "fast")
+DAILY_RECORD_KEYS = ("date", "score", "band", "contrib", "formula_version")
+DEFAULT_WORKERS = 4
+
 try:
     from influxdb_client import InfluxDBClient, Point, WritePrecision
     from influxdb_client.client.write_api import SYNCHRONOUS
@@ -109,9 +173,31 @@ def create_wb_quality_point(record: Dict[str, Any]) -> Point:
     
     return point
 
-def ingest_records(client: InfluxDBClient, config: dict, records_path: pathlib.Path) -> int:
+def create_record_points(record: Dict[str, Any]) -> list[Point]:
+    """All measurement points for one daily record."""
+    points = [create_wb_score_point(record)]
+    points.extend(create_wb_contrib_points(record))
+    points.append(create_wb_quality_point(record))
+    return points
+
+def record_line_encoder(encoder: str = "point"):
+    """
+    Return a callable mapping a record to its line-protocol lines.
+    
+    'point' builds Point objects (reference path); 'fast' uses the direct
+    encoder, which produces identical lines without the object overhead.
+    """
+    if encoder == "point":
+        return lambda record: [point.to_line_protocol() for point in create_record_points(record)]
+    if encoder == "fast":
+        return DailyRecordEncoder().encode
+    raise ValueError(f"Unknown encoder: {encoder} (expected one of {', '.join(ENCODERS)})")
+
+def ingest_records(client: InfluxDBClient, config: dict, records_path: pathlib.Path,
+                   encoder: str = "point") -> int:
     """Ingest all records from JSON Lines file."""
     write_api = client.write_api(write_options=SYNCHRONOUS)
+    encode = record_line_encoder(encoder) if encoder != "point" else None
     
     ingested_count = 0
     batch_points = []
@@ -125,10 +211,11 @@ def ingest_records(client: InfluxDBClient, config: dict, records_path: pathlib.P
             try:
                 record = json.loads(line)
                 
-                # Create points for all measurements
-                batch_points.append(create_wb_score_point(record))
-                batch_points.extend(create_wb_contrib_points(record))
-                batch_points.append(create_wb_quality_point(record))
+                # Create points (or encoded lines) for all measurements
+                if encode is None:
+                    batch_points.extend(create_record_points(record))
+                else:
+                    batch_points.extend(encode(record))
                 
                 ingested_count += 1
                 
@@ -137,29 +224,466 @@ def ingest_records(client: InfluxDBClient, config: dict, records_path: pathlib.P
                 continue
     
     if batch_points:
-        write_api.write(bucket=config["bucket"], org=config["org"], record=batch_points)
+        write_api.write(bucket=config["bucket"], org=config["org"], record=batch_points,
+                        write_precision=WritePrecision.S)
         print(f"Ingested {ingested_count} records into InfluxDB ({len(batch_points)} total points)")
     else:
         print("No valid records found to ingest")
     
     return ingested_count
 
-def main():
-    if len(sys.argv) != 2:
-        print("Usage: ingest_influxdb.py <records.jsonl>", file=sys.stderr)
-        return 1
+def stream_record_lines(records_path: pathlib.Path, encoder: str = "point",
+                        start_offset: int = 0, min_date: Optional[str] = None,
+                        cursor: Optional[Dict[str, Any]] = None, on_record=None):
+    """
+    Yield (line_protocol, record_index, position) for each point in the file.
+    
+    Reads one record at a time from start_offset; malformed records are
+    skipped with a warning and records dated before min_date are skipped
+    silently. cursor (offset, last_line_offset, last_line_hash, last_date)
+    is updated in place as lines are consumed; position is a snapshot of it
+    on each record's last point (None on the others). on_record, if given,
+    is called with each record that is encoded.
+    """
+    encode = record_line_encoder(encoder)
+    if cursor is None:
+        cursor = {}
+    cursor.setdefault('offset', start_offset)
+    record_index = 0
+    for line_no, (raw, line_offset, end_offset, complete) in enumerate(
+            iter_lines_from(records_path, start_offset), start=1):
+        line = raw.strip()
+        lines = []
+        if line:
+            try:
+                record = json.loads(line)
+                record_date = str(record.get("date", ""))[:10]
+                if record_date and record_date > (cursor.get('last_date') or ""):
+                    cursor['last_date'] = record_date
+                if min_date is None or record_date >= min_date:
+                    lines = encode(record)
+                    if on_record is not None:
+                        on_record(record)
+            except (json.JSONDecodeError, AttributeError, KeyError, ValueError) as e:
+                print(f"Warning: Skipping line {line_no}: {e}", file=sys.stderr)
+        if complete:
+            cursor['offset'] = end_offset
+            if line:
+                cursor['last_line_offset'] = line_offset
+                cursor['last_line_hash'] = line_hash(raw)
+        if lines:
+            record_index += 1
+            for encoded in lines[:-1]:
+                yield encoded, record_index, None
+            yield lines[-1], record_index, dict(cursor)
+
+def ingest_records_streaming(write_batch, records_path: pathlib.Path,
+                             batch_points: int = DEFAULT_MAX_ITEMS,
+                             batch_bytes: int = DEFAULT_MAX_BYTES,
+                             max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                             max_retries: int = DEFAULT_MAX_RETRIES,
+                             backoff_base: float = 0.5,
+                             encoder: str = "point",
+                             checkpoint_file: Optional[str] = None,
+                             resume: Optional[Dict[str, Any]] = None,
+                             spool: Optional[IngestSpool] = None,
+                             rollups: Optional[RollupState] = None,
+                             write_rollups: bool = True) -> Dict[str, Any]:
+    """
+    Stream records into fixed-size line-protocol batches.
+    
+    Args:
+        write_batch: Callable taking a list of line-protocol strings; raises on failure
+        records_path: JSON Lines daily records
+        batch_points: Max points per batch
+        batch_bytes: Max line-protocol bytes per batch
+        max_in_flight: Batches queued or being written before reading pauses
+        max_retries: Retries per batch (full-jitter exponential backoff)
+        backoff_base: First retry delay ceiling in seconds
+        encoder: 'point' (Point objects) or 'fast' (direct line-protocol encoder)
+        checkpoint_file: Save a resume checkpoint here as batches are written
+        resume: plan_resume() result plus the previous checkpoint under
+            'checkpoint'; None reads the whole file
+        spool: Batches that fail after retries are appended here instead of
+            being dropped (and no longer hold the checkpoint back)
+        rollups: Fold ingested records into these weekly/monthly rollups and
+            write the touched periods after the records (state is pruned and
+            saved if it has a path)
+        write_rollups: False only folds records into rollups; the caller
+            writes them (write_pending_rollups), e.g. once for many files
+    
+    Returns:
+        Summary: records read, pipeline stats (per-batch latency, points/sec),
+        and the saved checkpoint (None if not saved)
+    """
+    resume = resume or {}
+    start_offset = resume.get('start_offset', 0)
+    cursor = {'offset': start_offset}
+    if resume.get('mode') == 'resume':
+        # Carry forward the last ingested line so the next run can verify it
+        previous = resume.get('checkpoint') or {}
+        for key in ('last_line_offset', 'last_line_hash', 'last_date'):
+            if previous.get(key) is not None:
+                cursor[key] = previous[key]
+    inode = os.stat(records_path).st_ino
+    saved = {}
+    spooled = {'batches': 0, 'points': 0, 'lost': 0}
+    
+    def on_failure(batch, error):
+        if spool is not None:
+            try:
+                spool.append(batch)
+                spooled['batches'] += 1
+                spooled['points'] += len(batch)
+                return
+            except OSError as e:
+                print(f"❌ Could not spool batch: {e}", file=sys.stderr)
+        spooled['lost'] += 1
+    
+    def advance(position):
+        # Batches are written in order (one writer), so once any batch has
+        # been lost the checkpoint must stay behind it
+        if checkpoint_file and spooled['lost'] == 0:
+            saved['checkpoint'] = dict(position, file=str(records_path), inode=inode)
+            save_checkpoint(checkpoint_file, saved['checkpoint'])
+    
+    records_read = 0
+    pipeline = BatchPipeline(write_batch, max_items=batch_points, max_bytes=batch_bytes,
+                             max_in_flight=max_in_flight, max_retries=max_retries,
+                             backoff_base=backoff_base, on_failure=on_failure, on_written=advance)
+    with pipeline:
+        for line, records_read, position in stream_record_lines(
+                records_path, encoder, start_offset=start_offset,
+                min_date=resume.get('min_date'), cursor=cursor,
+                on_record=rollups.add if rollups is not None else None):
+            pipeline.add(line, len(line) + 1, mark=position)
+        rollup_lines = rollups.lines() if rollups is not None and write_rollups else []
+        for line in rollup_lines:
+            pipeline.add(line, len(line) + 1)
+    
+    if rollups is not None and write_rollups:
+        if spooled['lost'] == 0:
+            rollups.mark_written()
+            rollups.prune()
+        if rollups.path:
+            rollups.save()
+    
+    # Trailing blank/skipped lines produce no points; record them as consumed
+    if cursor.get('offset') != (saved.get('checkpoint') or {}).get('offset'):
+        advance(cursor)
+    
+    stats = pipeline.stats()
+    stats['records_read'] = records_read
+    stats['checkpoint'] = saved.get('checkpoint')
+    stats['spooled_batches'] = spooled['batches']
+    stats['spooled_points'] = spooled['points']
+    stats['rollup_points'] = len(rollup_lines)
+    return stats
+
+def write_pending_rollups(write_batch, rollups: RollupState,
+                          batch_points: int = DEFAULT_MAX_ITEMS,
+                          batch_bytes: int = DEFAULT_MAX_BYTES,
+                          max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                          max_retries: int = DEFAULT_MAX_RETRIES,
+                          backoff_base: float = 0.5,
+                          spool: Optional[IngestSpool] = None) -> Dict[str, Any]:
+    """
+    Write every pending rollup period, then mark, prune and save the state.
+    
+    Batches that fail after retries are spooled if a spool is given; if any
+    is lost, the periods stay pending for the next run.
+    
+    Returns:
+        {'points', 'spooled_points', 'error'}
+    """
+    lost = {'points': 0, 'spooled': 0, 'error': None}
+    
+    def on_failure(batch, error):
+        if spool is not None:
+            try:
+                spool.append(batch)
+                lost['spooled'] += len(batch)
+                return
+            except OSError as e:
+                print(f"❌ Could not spool batch: {e}", file=sys.stderr)
+        lost['points'] += len(batch)
+        lost['error'] = str(error)
     
-    records_path = pathlib.Path(sys.argv[1])
-    if not records_path.exists():
+    lines = rollups.lines()
+    pipeline = BatchPipeline(write_batch, max_items=batch_points, max_bytes=batch_bytes,
+                             max_in_flight=max_in_flight, max_retries=max_retries,
+                             backoff_base=backoff_base, on_failure=on_failure)
+    with pipeline:
+        for line in lines:
+            pipeline.add(line, len(line) + 1)
+    
+    if not lost['points']:
+        rollups.mark_written()
+        rollups.prune()
+    if rollups.path:
+        rollups.save()
+    return {'points': len(lines), 'spooled_points': lost['spooled'], 'error': lost['error']}
+
+def print_stream_summary(stats: Dict[str, Any]) -> None:
+    latency = stats['batch_latency']
+    print(f"Streamed {stats['records_read']} records: {stats['items_written']} points in "
+          f"{stats['batches_written']} batches ({stats['elapsed_s']}s, {stats['items_per_sec']} points/sec)")
+    print(f"   Batch latency: p50 {latency['p50_ms']}ms, p95 {latency['p95_ms']}ms, "
+          f"max {latency['max_ms']}ms; retries: {stats['retries']}")
+    if stats.get('rollup_points'):
+        print(f"   Rollups: {stats['rollup_points']} weekly/monthly points updated")
+    if stats.get('checkpoint'):
+        print(f"   Checkpoint: byte {stats['checkpoint']['offset']} (last date {stats['checkpoint'].get('last_date')})")
+    if stats.get('spooled_batches'):
+        print(f"⚠️  {stats['spooled_batches']} batches ({stats['spooled_points']} points) spooled for later: "
+              f"{stats['last_error']}")
+    lost = stats['failed_batches'] - stats.get('spooled_batches', 0)
+    if lost:
+        print(f"❌ {lost} batches failed after retries: {stats['last_error']}", file=sys.stderr)
+
+def print_drain_summary(result: Dict[str, Any]) -> None:
+    if result['batches'] or result['error']:
+        print(f"Drained {result['points']} spooled points in {result['batches']} batches ({result['elapsed_s']}s)")
+    if result['error']:
+        print(f"⚠️  Spool drain stopped: {result['error']}", file=sys.stderr)
+
+def print_spool_depth(depth: Dict[str, Any]) -> None:
+    print(f"   Spool: {depth['depth_points']} points in {depth['depth_batches']} batches "
+          f"({depth['depth_bytes']} bytes, oldest {depth['oldest_age_s']}s); "
+          f"evicted {depth['evicted_points']} points so far")
+
+def is_multi_file_target(target: str) -> bool:
+    """True for a directory or a glob pattern (ingested as many files)."""
+    return os.path.isdir(target) or glob.has_magic(target)
+
+def is_daily_record_file(path: str) -> bool:
+    """True if the first non-blank line of path is a daily score record."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    return isinstance(record, dict) and all(key in record for key in DAILY_RECORD_KEYS)
+    except (OSError, UnicodeDecodeError, ValueError):
+        return False
+    return False
+
+def discover_record_files(target: str, pattern: str = "*.jsonl") -> List[pathlib.Path]:
+    """
+    Files to ingest for a directory (matching pattern), glob or single file.
+    
+    Paths are de-duplicated by real path and returned sorted. For a
+    directory or glob, files that do not hold daily score records (see
+    is_daily_record_file) are skipped with a note, so they are neither
+    ingested nor checkpointed.
+    """
+    if os.path.isdir(target):
+        candidates = glob.glob(os.path.join(target, pattern))
+    elif glob.has_magic(target):
+        candidates = glob.glob(target)
+    else:
+        candidates = [target]
+    
+    files = {}
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            files.setdefault(os.path.realpath(candidate), pathlib.Path(candidate))
+    if not is_multi_file_target(target):
+        return sorted(files.values())
+    
+    daily = []
+    for path in sorted(files.values()):
+        if is_daily_record_file(str(path)):
+            daily.append(path)
+        else:
+            print(f"Skipping {path}: not daily score records", file=sys.stderr)
+    return daily
+
+def shared_rollup_state_path(target: str, paths: List[pathlib.Path]) -> str:
+    """Rollup state shared by a directory/glob run: ingest.rollups.json in the target directory."""
+    if os.path.isdir(target):
+        directory = target
+    else:
+        directory = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths])
+    return os.path.join(directory, "ingest.rollups.json")
+
+def ingest_files_parallel(write_batch, paths: List[pathlib.Path], workers: int = DEFAULT_WORKERS,
+                          points_per_sec: float = 0, rewind_days: Optional[int] = None,
+                          rollups: Optional[RollupState] = None, **stream_kwargs) -> Dict[str, Any]:
+    """
+    Ingest many files on a thread pool, resuming each from its checkpoint.
+    
+    Args:
+        write_batch: Shared sink (see ingest_records_streaming); must be thread-safe
+        paths: Files to ingest (see discover_record_files)
+        workers: Files ingested at once
+        points_per_sec: Combined write rate cap across all workers (0: unlimited)
+        rewind_days: Window for truncated/rewritten files (see plan_resume)
+        rollups: Shared weekly/monthly rollup state; every file is folded
+            into it and the rollups are written once, after all files
+        **stream_kwargs: Passed to ingest_records_streaming (batch sizes, retries, encoder)
+    
+    Returns:
+        Aggregate summary with per-file results and the failed files
+    """
+    limiter = TokenBucket(points_per_sec) if points_per_sec and points_per_sec > 0 else None
+    
+    def limited_write(lines):
+        if limiter is not None:
+            limiter.acquire(len(lines))
+        write_batch(lines)
+    
+    def ingest_one(path: pathlib.Path) -> Dict[str, Any]:
+        checkpoint_file = checkpoint_path(str(path))
+        result = {'file': str(path), 'mode': None, 'records_read': 0, 'items_written': 0,
+                  'batches_written': 0, 'retries': 0, 'failed_batches': 0, 'error': None}
+        try:
+            previous = load_checkpoint(checkpoint_file)
+            resume = plan_resume(str(path), previous, rewind_days=rewind_days)
+            resume['checkpoint'] = previous
+            result['mode'] = resume['mode']
+            if resume['mode'] == 'up_to_date':
+                return result
+            stats = ingest_records_streaming(limited_write, path, checkpoint_file=checkpoint_file,
+                                             resume=resume, rollups=rollups, write_rollups=False,
+                                             **stream_kwargs)
+        except Exception as e:
+            result['error'] = str(e)
+            return result
+        for key in ('records_read', 'items_written', 'batches_written', 'retries', 'failed_batches'):
+            result[key] = stats[key]
+        result['p95_ms'] = stats['batch_latency']['p95_ms']
+        result['spooled_points'] = stats['spooled_points']
+        if stats['failed_batches'] > stats['spooled_batches']:
+            result['error'] = stats['last_error']
+        return result
+    
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        results = list(executor.map(ingest_one, paths))
+    rollup_result = None
+    if rollups is not None:
+        pipeline_kwargs = {key: stream_kwargs[key] for key in
+                           ('batch_points', 'batch_bytes', 'max_in_flight', 'max_retries', 'backoff_base', 'spool')
+                           if key in stream_kwargs}
+        rollup_result = write_pending_rollups(limited_write, rollups, **pipeline_kwargs)
+    elapsed = time.monotonic() - started
+    
+    points = sum(r['items_written'] for r in results)
+    return {
+        'files_total': len(results),
+        'files_skipped': sum(1 for r in results if r['mode'] == 'up_to_date'),
+        'failed_files': [r for r in results if r['error']],
+        'records_read': sum(r['records_read'] for r in results),
+        'items_written': points,
+        'batches_written': sum(r['batches_written'] for r in results),
+        'retries': sum(r['retries'] for r in results),
+        'spooled_points': sum(r.get('spooled_points', 0) for r in results),
+        'elapsed_s': round(elapsed, 3),
+        'items_per_sec': round(points / elapsed, 1) if elapsed > 0 else 0.0,
+        'max_file_p95_ms': max((r.get('p95_ms', 0.0) for r in results), default=0.0),
+        'rate_limiter': limiter.stats() if limiter is not None else None,
+        'rollups': rollup_result,
+        'files': results,
+    }
+
+def print_parallel_summary(summary: Dict[str, Any]) -> None:
+    ingested = summary['files_total'] - summary['files_skipped'] - len(summary['failed_files'])
+    print(f"Files: {summary['files_total']} found, {ingested} ingested, "
+          f"{summary['files_skipped']} up to date, {len(summary['failed_files'])} failed")
+    print(f"Wrote {summary['items_written']} points from {summary['records_read']} records in "
+          f"{summary['batches_written']} batches ({summary['elapsed_s']}s, {summary['items_per_sec']} points/sec)")
+    print(f"   Worst per-file batch p95: {summary['max_file_p95_ms']}ms; retries: {summary['retries']}")
+    if summary['spooled_points']:
+        print(f"⚠️  {summary['spooled_points']} points spooled for later")
+    rollups = summary.get('rollups')
+    if rollups:
+        print(f"   Rollups: {rollups['points']} weekly/monthly points updated")
+        if rollups['error']:
+            print(f"❌ Rollup points failed after retries: {rollups['error']}", file=sys.stderr)
+    limiter = summary['rate_limiter']
+    if limiter:
+        print(f"   Rate limit: {limiter['rate']:.0f} points/sec, throttled {limiter['wait_s']}s")
+    for failed in summary['failed_files']:
+        print(f"❌ {failed['file']}: {failed['error']}", file=sys.stderr)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest daily records JSONL into InfluxDB")
+    parser.add_argument("records", help="JSON Lines daily records file, directory or glob")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream fixed-size batches on a background writer")
+    parser.add_argument("--batch-points", type=int, default=DEFAULT_MAX_ITEMS,
+                        help=f"Points per batch in --stream mode (default: {DEFAULT_MAX_ITEMS})")
+    parser.add_argument("--batch-bytes", type=int, default=DEFAULT_MAX_BYTES,
+                        help=f"Line-protocol bytes per batch in --stream mode (default: {DEFAULT_MAX_BYTES})")
+    parser.add_argument("--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                        help=f"Batches in flight in --stream mode (default: {DEFAULT_MAX_IN_FLIGHT})")
+    parser.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES,
+                        help=f"Retries per batch in --stream mode (default: {DEFAULT_MAX_RETRIES})")
+    parser.add_argument("--encoder", choices=ENCODERS, default="point",
+                        help="Line-protocol encoding: Point objects or the direct 'fast' encoder (default: point)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Only ingest lines added since the last checkpoint (implies --stream)")
+    parser.add_argument("--checkpoint",
+                        help="Checkpoint file for --resume (default: <records>.ingest-checkpoint.json)")
+    parser.add_argument("--rewind-days", type=int,
+                        help="If the file was truncated/rewritten, re-ingest only this many days "
+                             "before the last checkpointed date (default: full re-ingest)")
+    parser.add_argument("--spool", default=Config.INGEST_SPOOL_DIR or None,
+                        help="Spool directory: batches that cannot be written (InfluxDB down or retries "
+                             "exhausted) are kept here and drained on the next healthy run (implies --stream; "
+                             "default: $INGEST_SPOOL_DIR)")
+    parser.add_argument("--spool-max-mb", type=int, default=Config.INGEST_SPOOL_MAX_MB,
+                        help=f"Spool size cap; oldest batches are evicted beyond it (default: {Config.INGEST_SPOOL_MAX_MB})")
+    parser.add_argument("--drain-points-per-sec", type=float, default=Config.INGEST_SPOOL_DRAIN_POINTS_PER_SEC,
+                        help=f"Spool drain rate (default: {Config.INGEST_SPOOL_DRAIN_POINTS_PER_SEC})")
+    parser.add_argument("--rollups", action="store_true",
+                        help="Also write weekly/monthly rollups (wb_score_rollup, wb_contrib_rollup), "
+                             "merged via <records>.rollups.json (implies --stream)")
+    parser.add_argument("--pattern", default="*.jsonl",
+                        help="File pattern when records is a directory (default: *.jsonl)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Files ingested in parallel for a directory/glob (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--points-per-sec", type=float, default=0,
+                        help="Combined write rate limit for a directory/glob (default: unlimited)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    
+    records_path = pathlib.Path(args.records)
+    multi_file = is_multi_file_target(args.records)
+    if multi_file:
+        paths = discover_record_files(args.records, args.pattern)
+        if not paths:
+            print(f"No files match: {args.records}", file=sys.stderr)
+            return 1
+        print(f"Discovered {len(paths)} files under {args.records}")
+    elif not records_path.exists():
         print(f"File not found: {records_path}", file=sys.stderr)
         return 1
     
+    spool = IngestSpool(args.spool, max_bytes=args.spool_max_mb * 1024 * 1024) if args.spool else None
+    
+    resume = None
+    checkpoint_file = None
+    if args.resume and not multi_file:
+        checkpoint_file = args.checkpoint or checkpoint_path(str(records_path))
+        previous = load_checkpoint(checkpoint_file)
+        resume = plan_resume(str(records_path), previous, rewind_days=args.rewind_days)
+        resume['checkpoint'] = previous
+        print(f"Resume: {resume['mode']} ({resume['reason']})")
+        if resume['mode'] == 'up_to_date':
+            print("✅ Nothing new to ingest")
+            return 0
+    
     try:
         config = get_config()
         print(f"Connecting to InfluxDB: {config['url']} (bucket: {config['bucket']})")
         
         with InfluxDBClient(url=config["url"], token=config["token"], org=config["org"]) as client:
             # Test connection
+            healthy = True
             try:
                 health = client.health()
                 if health.status != "pass":
@@ -167,11 +691,55 @@ def main():
                 print("✅ InfluxDB connection healthy")
             except Exception as e:
                 print(f"❌ InfluxDB connection failed: {e}", file=sys.stderr)
-                return 1
+                if spool is None:
+                    return 1
+                healthy = False
+                print(f"⚠️  Spooling batches to {spool.directory} until InfluxDB recovers")
+            
+            if healthy:
+                write_api = client.write_api(write_options=SYNCHRONOUS)
+                
+                def write_batch(lines):
+                    write_api.write(bucket=config["bucket"], org=config["org"], record=lines,
+                                    write_precision=WritePrecision.S)
+                
+                if spool is not None:
+                    drained = spool.drain(write_batch, points_per_sec=args.drain_points_per_sec)
+                    print_drain_summary(drained)
+            else:
+                write_batch = spool.append
             
             # Ingest records
-            count = ingest_records(client, config, records_path)
-            print(f"✅ Successfully ingested {count} daily records")
+            if multi_file:
+                summary = ingest_files_parallel(
+                    write_batch, paths, workers=args.workers, points_per_sec=args.points_per_sec,
+                    rewind_days=args.rewind_days, batch_points=args.batch_points,
+                    batch_bytes=args.batch_bytes, max_in_flight=args.max_in_flight,
+                    max_retries=args.max_retries, encoder=args.encoder, spool=spool,
+                    rollups=RollupState(shared_rollup_state_path(args.records, paths)) if args.rollups else None,
+                )
+                print_parallel_summary(summary)
+                if summary['failed_files'] or (summary['rollups'] or {}).get('error'):
+                    return 1
+                print(f"✅ Successfully ingested {summary['records_read']} daily records")
+            elif args.stream or args.resume or args.rollups or spool is not None:
+                stats = ingest_records_streaming(
+                    write_batch, records_path, batch_points=args.batch_points,
+                    batch_bytes=args.batch_bytes, max_in_flight=args.max_in_flight,
+                    max_retries=args.max_retries, encoder=args.encoder,
+                    checkpoint_file=checkpoint_file, resume=resume, spool=spool,
+                    rollups=RollupState(rollup_state_path(str(records_path))) if args.rollups else None,
+                )
+                print_stream_summary(stats)
+                if stats['failed_batches'] > stats['spooled_batches']:
+                    return 1
+                print(f"✅ Successfully ingested {stats['records_read']} daily records")
+            else:
+                count = ingest_records(client, config, records_path, encoder=args.encoder)
+                print(f"✅ Successfully ingested {count} daily records")
+            
+            if spool is not None:
+                print_spool_depth(spool.stats())
             
         return 0
         
@@ -16,6 +16,7 @@ from typing import Dict, List, Optional
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from dashboard.config import Config
+from dashboard.utils.file_utils import tail_jsonl
 from dashboard.scripts.ops.metrics_exporter import MetricsCollector
 
 
@@ -130,25 +131,17 @@ class AlertManager:
         # Check if we have today's plan
         from datetime import date
         import os
-        import json
         
         plan_file = os.path.join(
             os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
             'data', 'plan_daily.jsonl'
         )
         
-        has_todays_plan = False
-        if os.path.exists(plan_file):
-            today = date.today().isoformat()
-            with open(plan_file, 'r') as f:
-                for line in f:
-                    try:
-                        plan = json.loads(line.strip())
-                        if plan.get('date') == today:
-                            has_todays_plan = True
-                            break
-                    except json.JSONDecodeError:
-                        continue
+        # Plans are appended in date order, so today's plan is among the last few
+        today = date.today().isoformat()
+        has_todays_plan = any(
+            plan.get('date') == today for plan in tail_jsonl(plan_file, 3)
+        )
         
         if not has_todays_plan:
             return {
@@ -15,6 +15,8 @@ from pathlib import Path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from dashboard.config import Config
+from dashboard.utils.ingest_spool import IngestSpool
+from dashboard.utils.segment_store import STORE_SUFFIX, SegmentStore, is_segment_store
 from dashboard.scripts.phase3.integrity_monitor import calculate_integrity_failure_rate, load_telemetry_records
 from dashboard.scripts.phase3.auto_run_tracker import calculate_success_rate
 # Note: completeness metrics are handled within completeness_monitor when needed.
@@ -31,25 +33,51 @@ class MetricsCollector:
             'data'
         )
         self.metrics_file = os.path.join(self.data_dir, 'ops_metrics.json')
+        self.telemetry_store_dir = os.path.join(self.data_dir, 'telemetry' + STORE_SUFFIX)
         self.timestamp = datetime.now()
     
+    def iter_compacted_telemetry(self, start_date: str = None):
+        """Telemetry records already compacted out of daily shards (segment_compactor.py)."""
+        if not is_segment_store(self.telemetry_store_dir):
+            return iter(())
+        return SegmentStore(self.telemetry_store_dir).iter_records(start_date)
+    
+    def load_telemetry_history(self, days: int = 30) -> List[Dict]:
+        """
+        Latest telemetry record per date over the last `days` days, from the
+        compacted segment store plus the daily shards not yet compacted.
+        """
+        start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        records = list(self.iter_compacted_telemetry(start_date))
+        for shard in sorted(Path(self.data_dir).glob('telemetry_*.jsonl')):
+            records.extend(load_telemetry_records(str(shard)))
+        # Each fetch re-records its whole window: keep the newest record per date
+        latest: Dict[str, Dict] = {}
+        undated = []
+        for record in records:
+            date = record.get('date')
+            if not date:
+                undated.append(record)
+            elif date >= start_date and (date not in latest or
+                                         record.get('timestamp_utc', '') >= latest[date].get('timestamp_utc', '')):
+                latest[date] = record
+        return [latest[date] for date in sorted(latest)] + undated
+    
     def collect_integrity_metrics(self, days: int = 14) -> Dict:
         """Collect integrity monitoring metrics."""
         try:
-            # Find most recent telemetry file
-            telemetry_files = sorted(Path(self.data_dir).glob('telemetry_*.jsonl'))
-            if not telemetry_files:
-                telemetry_files = sorted(Path(self.data_dir).glob('*.jsonl'))
-            
-            if not telemetry_files:
-                return {
-                    'status': 'no_data',
-                    'failure_rate_pct': 0,
-                    'records_checked': 0
-                }
-            
-            latest_file = str(telemetry_files[-1])
-            records = load_telemetry_records(latest_file)
+            # Telemetry history: compacted segments + remaining daily shards
+            records = self.load_telemetry_history(30)
+            if not records:
+                # No telemetry kept yet: fall back to the most recent data file
+                data_files = sorted(Path(self.data_dir).glob('*.jsonl'))
+                if not data_files:
+                    return {
+                        'status': 'no_data',
+                        'failure_rate_pct': 0,
+                        'records_checked': 0
+                    }
+                records = load_telemetry_records(str(data_files[-1]))
             
             # Calculate metrics for different windows
             result_7d = calculate_integrity_failure_rate(records, 7)
@@ -77,9 +105,9 @@ class MetricsCollector:
     def collect_auto_run_metrics(self, days: int = 14) -> Dict:
         """Collect auto-run success metrics."""
         try:
-            # Load records
+            # Load records (including telemetry compacted out of daily shards)
             telemetry_files = sorted(Path(self.data_dir).glob('*.jsonl'))
-            all_records = []
+            all_records = list(self.iter_compacted_telemetry())
             
             for file_path in telemetry_files:
                 with open(file_path, 'r') as f:
@@ -226,15 +254,28 @@ class MetricsCollector:
                 'total_records': 0
             }
     
+    def collect_spool_metrics(self) -> Dict:
+        """Collect ingestion spool depth (batches waiting for InfluxDB)."""
+        spool_dir = Config.INGEST_SPOOL_DIR or os.path.join(self.data_dir, 'ingest_spool')
+        if not os.path.isdir(spool_dir):
+            return {'status': 'disabled', 'depth_points': 0, 'depth_batches': 0}
+        try:
+            depth = IngestSpool(spool_dir, max_bytes=Config.INGEST_SPOOL_MAX_MB * 1024 * 1024).stats()
+            depth['status'] = 'ok'
+            return depth
+        except Exception as e:
+            return {'status': 'error', 'error': str(e), 'depth_points': 0, 'depth_batches': 0}
+    
     def collect_plan_metrics(self) -> Dict:
         """Collect Phase 5 plan engine metrics."""
         try:
             plan_file = os.path.join(self.data_dir, 'plan_daily.jsonl')
             adherence_file = os.path.join(self.data_dir, 'adherence_daily.jsonl')
             
-            # Count plans generated
+            # Count plans generated (one pass; the last plan read is the latest)
             plans_generated = 0
             plans_skipped_missing_data = 0
+            latest_plan_date = None
             if os.path.exists(plan_file):
                 with open(plan_file, 'r') as f:
                     for line in f:
@@ -242,6 +283,7 @@ class MetricsCollector:
                             try:
                                 plan = json.loads(line)
                                 plans_generated += 1
+                                latest_plan_date = plan.get('date')
                                 if 'conservative' in plan.get('plan_text', '').lower():
                                     plans_skipped_missing_data += 1
                             except json.JSONDecodeError:
@@ -251,6 +293,7 @@ class MetricsCollector:
             adherence_logged = 0
             avg_adherence_pct = 0
             avg_energy = 0
+            latest_adherence_date = None
             if os.path.exists(adherence_file):
                 adherence_records = []
                 with open(adherence_file, 'r') as f:
@@ -264,6 +307,7 @@ class MetricsCollector:
                                 continue
                 
                 if adherence_records:
+                    latest_adherence_date = adherence_records[-1].get('date')
                     total_adherence = sum(r.get('adherence_pct', 0) for r in adherence_records)
                     avg_adherence_pct = round(total_adherence / len(adherence_records), 1)
                     
@@ -273,6 +317,8 @@ class MetricsCollector:
             
             return {
                 'status': 'ok',
+                'latest_plan_date': latest_plan_date,
+                'latest_adherence_date': latest_adherence_date,
                 'plans_generated': plans_generated,
                 'plans_skipped_missing_data': plans_skipped_missing_data,
                 'adherence_logged': adherence_logged,
@@ -297,6 +343,7 @@ class MetricsCollector:
             'auto_run': self.collect_auto_run_metrics(),
             'remediation': self.collect_remediation_metrics(),
             'ingestion': self.collect_ingestion_metrics(),
+            'ingest_spool': self.collect_spool_metrics(),
             'config': {
                 'integrity_threshold_pct': Config.INTEGRITY_FAILURE_THRESHOLD_PCT,
                 'auto_run_target_pct': Config.AUTO_RUN_SUCCESS_TARGET_PCT,
@@ -344,6 +391,21 @@ class MetricsCollector:
             lines.append(f'# TYPE wellness_ingestion_days_behind gauge')
             lines.append(f'wellness_ingestion_days_behind {metrics["ingestion"].get("days_behind", -1)}')
             
+            spool = metrics['ingest_spool']
+            lines.append(f'# HELP wellness_ingest_spool_depth_points Points waiting in the ingestion spool')
+            lines.append(f'# TYPE wellness_ingest_spool_depth_points gauge')
+            lines.append(f'wellness_ingest_spool_depth_points {spool["depth_points"]}')
+            if spool['status'] == 'ok':
+                lines.append(f'# HELP wellness_ingest_spool_depth_bytes Bytes waiting in the ingestion spool')
+                lines.append(f'# TYPE wellness_ingest_spool_depth_bytes gauge')
+                lines.append(f'wellness_ingest_spool_depth_bytes {spool["depth_bytes"]}')
+                lines.append(f'# HELP wellness_ingest_spool_oldest_age_seconds Age of the oldest spooled batch')
+                lines.append(f'# TYPE wellness_ingest_spool_oldest_age_seconds gauge')
+                lines.append(f'wellness_ingest_spool_oldest_age_seconds {spool["oldest_age_s"]}')
+                lines.append(f'# HELP wellness_ingest_spool_evicted_points_total Points evicted at the spool size cap')
+                lines.append(f'# TYPE wellness_ingest_spool_evicted_points_total counter')
+                lines.append(f'wellness_ingest_spool_evicted_points_total {spool["evicted_points"]}')
+            
             # Add Phase 5 plan metrics if enabled
             if Config.ENABLE_PLAN_ENGINE and 'plan_engine' in metrics:
                 lines.append(f'# HELP wellness_plans_generated_total Total plans generated')
@@ -6,18 +6,33 @@ Compare 7-day vs 30-day completeness averages and alert on regression.
 
 import json
 import logging
+import os
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+# Add dashboard to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from utils.jsonl_index import read_range
+
 logger = logging.getLogger(__name__)
 
-def load_telemetry_records(file_path: str) -> List[Dict]:
-    """Load telemetry records from JSONL file."""
+def load_telemetry_records(file_path: str, days: Optional[int] = None) -> List[Dict]:
+    """Load telemetry records from JSONL file.
+    
+    With days set, only the last N days are read via the date sidecar index
+    (same cutoff as filter_records_by_days).
+    """
     records = []
     if not Path(file_path).exists():
         return records
     
+    if days is not None:
+        cutoff_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        return read_range(file_path, start_date=cutoff_date)
+    
     with open(file_path, 'r') as f:
         for line in f:
             if line.strip():
@@ -176,7 +191,8 @@ def main():
         report = generate_completeness_report(args.file)
         print(json.dumps(report, indent=2))
     else:
-        records = load_telemetry_records(args.file)
+        # Regression check only looks at the long window
+        records = load_telemetry_records(args.file, days=30)
         result = check_completeness_regression(records, args.threshold)
         
         if result['alert']:
@@ -13,7 +13,7 @@ from typing import Dict, List, Tuple
 # Add dashboard to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from score.engine import compute_score, MetricInputs, ScoreFlags
+from score.engine import compute_score, score_stream, MetricInputs, ScoreFlags
 from utils.file_utils import atomic_write_jsonl
 
 
@@ -76,35 +76,33 @@ def fix_integrity_issues(input_file: str, output_file: str = None) -> Dict:
     
     print(f"🔧 Fixing integrity issues in {input_file}")
     
-    # Read all records
-    records = []
-    with open(input_file, 'r') as f:
-        for line in f:
-            if line.strip():
-                records.append(json.loads(line))
-    
-    # Process each record
-    updated_records = []
+    # First pass: diagnose record by record without holding the file in memory
+    total_records = 0
     changes_made = 0
     score_fixes = 0
     band_fixes = 0
     
-    for record in records:
-        updated, was_changed = recalculate_record(record)
-        updated_records.append(updated)
-        
-        if was_changed:
-            changes_made += 1
-            if record.get('score') != updated['score']:
-                score_fixes += 1
-            if record.get('band') != updated['band']:
-                band_fixes += 1
-    
-    # Write back if changes were made
+    with open(input_file, 'r') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            total_records += 1
+            updated, was_changed = recalculate_record(record)
+            
+            if was_changed:
+                changes_made += 1
+                if record.get('score') != updated['score']:
+                    score_fixes += 1
+                if record.get('band') != updated['band']:
+                    band_fixes += 1
+    
+    # Second pass: stream re-scored records straight into the atomic writer
     if changes_made > 0:
-        print(f"\n✏️ Writing {len(updated_records)} corrected records to {output_file}")
-        # Use atomic write to prevent corruption
-        if atomic_write_jsonl(updated_records, output_file):
+        print(f"\n✏️ Writing {total_records} corrected records to {output_file}")
+        with open(input_file, 'r') as f:
+            written = atomic_write_jsonl(score_stream(f), output_file)
+        if written:
             print(f"✅ Fixed {changes_made} records ({score_fixes} scores, {band_fixes} bands)")
         else:
             print(f"❌ Failed to write corrected records")
@@ -113,7 +111,7 @@ def fix_integrity_issues(input_file: str, output_file: str = None) -> Dict:
         print("✅ No corrections needed - all records are valid")
     
     return {
-        'total_records': len(records),
+        'total_records': total_records,
         'changes_made': changes_made,
         'score_fixes': score_fixes,
         'band_fixes': band_fixes
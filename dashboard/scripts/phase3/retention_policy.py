@@ -62,20 +62,12 @@ class RetentionManager:
         newest = None
         
         try:
-            with open(file_path, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        try:
-                            record = json.loads(line)
-                            date_str = record.get('date')
-                            if date_str:
-                                date = datetime.strptime(date_str, '%Y-%m-%d')
-                                if oldest is None or date < oldest:
-                                    oldest = date
-                                if newest is None or date > newest:
-                                    newest = date
-                        except (json.JSONDecodeError, ValueError):
-                            continue
+            # Date sidecar index keeps entries sorted, so bounds are O(1) reads
+            from utils.jsonl_index import date_bounds
+            first, last = date_bounds(file_path)
+            if first:
+                oldest = datetime.strptime(first, '%Y-%m-%d')
+                newest = datetime.strptime(last, '%Y-%m-%d')
         except Exception:
             pass
         
@@ -83,10 +75,13 @@ class RetentionManager:
     
     def prune_jsonl_file(self, file_path: str, dry_run: bool = False) -> Dict:
         """
-        Prune old records from JSONL file.
+        Prune old records from JSONL file or segment store.
+        
+        Plain files are rewritten without expired lines; a segment store
+        (utils.segment_store) only drops whole expired segments.
         
         Args:
-            file_path: Path to JSONL file
+            file_path: Path to JSONL file or segment store directory
             dry_run: If True, only report what would be done
             
         Returns:
@@ -104,6 +99,11 @@ class RetentionManager:
             stats['error'] = 'File not found'
             return stats
         
+        # Segment stores drop whole expired segments from the manifest
+        from utils.segment_store import SegmentStore, is_segment_store
+        if is_segment_store(file_path):
+            return self._prune_segment_store(SegmentStore(file_path), stats, dry_run)
+        
         try:
             kept_records = []
             pruned_records = []
@@ -144,6 +144,20 @@ class RetentionManager:
         
         return stats
     
+    def _prune_segment_store(self, store, stats: Dict, dry_run: bool) -> Dict:
+        """O(segments) retention: drop segments entirely older than cutoff."""
+        try:
+            total = sum(entry['records'] for entry in store.segment_list())
+            dropped = store.drop_before(self.cutoff_date.strftime('%Y-%m-%d'), dry_run)
+            pruned = sum(entry['records'] for entry in dropped)
+            stats['total_records'] = total
+            stats['pruned_records'] = pruned
+            stats['kept_records'] = total - pruned
+            stats['segments_dropped'] = [entry['name'] for entry in dropped]
+        except Exception as e:
+            stats['error'] = str(e)
+        return stats
+    
     def prune_old_files(self, directory: str, pattern: str = '*.jsonl', 
                        dry_run: bool = False) -> List[Dict]:
         """
@@ -178,6 +192,11 @@ class RetentionManager:
                     try:
                         os.unlink(file_path)
                         action['executed'] = True
+                        # Drop the file's date sidecar index along with it
+                        from utils.jsonl_index import index_paths
+                        for sidecar in index_paths(str(file_path)):
+                            if os.path.exists(sidecar):
+                                os.unlink(sidecar)
                     except Exception as e:
                         action['error'] = str(e)
                 
@@ -221,6 +240,7 @@ class RetentionManager:
         # Process telemetry files
         if os.path.exists(telemetry_dir):
             telemetry_files = list(Path(telemetry_dir).glob('telemetry_*.jsonl'))
+            telemetry_files += [p for p in Path(telemetry_dir).glob('*.segments') if p.is_dir()]
             report['telemetry']['files_scanned'] = len(telemetry_files)
             report['telemetry']['files_pruned'] = []
             
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Compact daily telemetry shards into the segmented telemetry store.
+
+Merges data/telemetry_YYYYMMDD.jsonl shards older than --min-age-days into
+per-month segments under data/telemetry.segments (see utils.segment_store),
+then deletes the merged shards. Intended to run from cron, off the fetch
+hot path; today's shard is left alone so appends never race compaction.
+"""
+
+import json
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict
+
+# Add dashboard to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from utils.segment_store import SegmentStore, STORE_SUFFIX, compact_shards
+
+_SHARD_NAME_RE = re.compile(r'^telemetry_([0-9]{8})\.jsonl$')
+
+
+def compact_telemetry(data_dir: str, store_dir: str = None, min_age_days: int = 1,
+                      dry_run: bool = False) -> Dict:
+    """
+    Merge eligible telemetry shards from data_dir into the segment store.
+
+    Args:
+        data_dir: Directory holding telemetry_YYYYMMDD.jsonl shards
+        store_dir: Segment store (default: <data_dir>/telemetry.segments)
+        min_age_days: Only shards at least this many days old are merged
+        dry_run: Report eligible shards without merging
+
+    Returns:
+        Compaction summary
+    """
+    store_dir = store_dir or os.path.join(data_dir, 'telemetry' + STORE_SUFFIX)
+    newest = (datetime.now() - timedelta(days=min_age_days)).strftime('%Y%m%d')
+
+    shards = []
+    for path in sorted(Path(data_dir).glob('telemetry_*.jsonl')):
+        match = _SHARD_NAME_RE.match(path.name)
+        if match and match.group(1) <= newest:
+            shards.append(path)
+
+    summary = {
+        'store': store_dir,
+        'dry_run': dry_run,
+        'shards_eligible': len(shards),
+        'shards_merged': 0,
+        'records_merged': 0,
+    }
+    if dry_run or not shards:
+        summary['shards'] = [p.name for p in shards]
+        return summary
+
+    store = SegmentStore(store_dir)
+    summary.update(compact_shards(shards, store))
+    summary['segments'] = len(store.segment_list())
+    return summary
+
+
+def main():
+    """CLI interface for telemetry compaction."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compact daily telemetry shards into monthly segments')
+    parser.add_argument('--data-dir', default=os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data'),
+        help='Directory with telemetry_YYYYMMDD.jsonl shards')
+    parser.add_argument('--store-dir', help='Segment store (default: <data-dir>/telemetry.segments)')
+    parser.add_argument('--min-age-days', type=int, default=1,
+                        help='Only merge shards at least this old (default: 1)')
+    parser.add_argument('--dry-run', action='store_true', help='Show eligible shards only')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+
+    args = parser.parse_args()
+
+    try:
+        summary = compact_telemetry(args.data_dir, args.store_dir, args.min_age_days, args.dry_run)
+    except Exception as e:
+        print(f"❌ Compaction failed: {e}")
+        return 1
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"🗜️  Telemetry compaction ({'DRY RUN' if args.dry_run else 'APPLIED'})")
+        print(f"   Store: {summary['store']}")
+        print(f"   Eligible shards: {summary['shards_eligible']}")
+        if not args.dry_run:
+            print(f"   Merged: {summary['shards_merged']} shards, {summary['records_merged']} records")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -236,7 +236,7 @@ def generate_daily_plan(data_dir: str = "dashboard/data") -> Dict:
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
     
     from dashboard.config import Config
-    from dashboard.utils.file_utils import atomic_write_jsonl
+    from dashboard.utils.file_utils import atomic_write_jsonl, tail_jsonl
     
     # Check if plan already exists for today
     today = date.today().isoformat()
@@ -262,42 +262,31 @@ def generate_daily_plan(data_dir: str = "dashboard/data") -> Dict:
     wellness_file = os.path.join(data_dir, "garmin_wellness.jsonl")
     latest_metrics = None
     
-    if os.path.exists(wellness_file):
-        with open(wellness_file, 'r') as f:
-            lines = f.readlines()
-            if lines:
-                try:
-                    # Get last 7 days for trend calculation
-                    recent_records = []
-                    for line in lines[-7:]:
-                        recent_records.append(json.loads(line))
-                    
-                    if recent_records:
-                        latest_metrics = recent_records[-1]
-                        
-                        # Calculate RHR delta (7-day)
-                        if len(recent_records) >= 7:
-                            rhr_values = [r.get('restingHeartRate', 0) for r in recent_records if r.get('restingHeartRate')]
-                            if len(rhr_values) >= 2:
-                                latest_metrics['rhr_delta_7d'] = rhr_values[-1] - sum(rhr_values[:-1]) / len(rhr_values[:-1])
-                        
-                        # Calculate steps trend
-                        if len(recent_records) >= 7:
-                            steps_values = [(i, r.get('steps', 0)) for i, r in enumerate(recent_records) if r.get('steps')]
-                            if len(steps_values) >= 2:
-                                # Simple linear regression for trend
-                                n = len(steps_values)
-                                sum_x = sum(x for x, _ in steps_values)
-                                sum_y = sum(y for _, y in steps_values)
-                                sum_xy = sum(x * y for x, y in steps_values)
-                                sum_x2 = sum(x * x for x, _ in steps_values)
-                                
-                                if n * sum_x2 - sum_x * sum_x != 0:
-                                    slope = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x * sum_x)
-                                    latest_metrics['steps_trend_7d'] = slope
+    # Get last 7 days for trend calculation (tail read, independent of history size)
+    recent_records = tail_jsonl(wellness_file, 7)
+    if recent_records:
+        latest_metrics = recent_records[-1]
+        
+        # Calculate RHR delta (7-day)
+        if len(recent_records) >= 7:
+            rhr_values = [r.get('restingHeartRate', 0) for r in recent_records if r.get('restingHeartRate')]
+            if len(rhr_values) >= 2:
+                latest_metrics['rhr_delta_7d'] = rhr_values[-1] - sum(rhr_values[:-1]) / len(rhr_values[:-1])
+        
+        # Calculate steps trend
+        if len(recent_records) >= 7:
+            steps_values = [(i, r.get('steps', 0)) for i, r in enumerate(recent_records) if r.get('steps')]
+            if len(steps_values) >= 2:
+                # Simple linear regression for trend
+                n = len(steps_values)
+                sum_x = sum(x for x, _ in steps_values)
+                sum_y = sum(y for _, y in steps_values)
+                sum_xy = sum(x * y for x, y in steps_values)
+                sum_x2 = sum(x * x for x, _ in steps_values)
                 
-                except json.JSONDecodeError:
-                    logger.error("Failed to parse wellness data")
+                if n * sum_x2 - sum_x * sum_x != 0:
+                    slope = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x * sum_x)
+                    latest_metrics['steps_trend_7d'] = slope
     
     # Initialize plan engine
     engine = PlanEngine({
@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """
 Test Garmin Connect connection with MFA support.
+
+Reuses the session saved in private/ when it is still valid, and saves
+the session after a successful (MFA) login so later runs skip it.
 """
 
 import os
@@ -10,6 +13,11 @@ from dotenv import load_dotenv
 from garminconnect import Garmin
 import getpass
 
+dashboard_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, dashboard_path)
+from utils.garmin_session import GarminSessionStore
+from config import Config
+
 # Load environment variables
 load_dotenv()
 
@@ -27,12 +35,17 @@ def test_connection_with_mfa():
     try:
         # Connect to Garmin
         print("📡 Connecting to Garmin Connect...")
-        client = Garmin(email, password)
+        store = GarminSessionStore(Config.GARMIN_SESSION_DIR or 'private', email)
+        client = store.resume(email, password, factory=Garmin)
         
         try:
-            # Try regular login first
-            client.login()
-            print("✅ Successfully connected (no MFA)!")
+            if client is not None:
+                print(f"✅ Reused saved session ({store.stats['mode']}, {store.stats['resume_s']}s)")
+            else:
+                # Try regular login first
+                client = Garmin(email, password)
+                client.login()
+                print("✅ Successfully connected (no MFA)!")
         except Exception as e:
             if "MFA" in str(e) or "code" in str(e).lower():
                 print("\n📱 MFA detected. Please enter your 6-digit code from your authenticator app.")
@@ -45,6 +58,9 @@ def test_connection_with_mfa():
             else:
                 raise e
         
+        if store.save_client(client):
+            print(f"🔒 Session saved to {store.path} (mode 0600)")
+        
         # Get user info
         print("\n👤 User Information:")
         try:
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Tests for lock-coordinated check-and-append in duplicate_guard.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Add dashboard path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.file_utils import jsonl_lock, fcntl
+from scripts.duplicate_guard import append_unique
+from scripts.bench.dedupe_stress import run_stress
+
+
+@unittest.skipIf(fcntl is None, "fcntl advisory locks not available")
+class TestAppendLocking(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.target = os.path.join(self.temp_dir, 'target.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_parallel_writers_no_duplicates(self):
+        report = run_stress(self.target, writers=4, batches=10, batch_size=10, days=60)
+        self.assertEqual(report['duplicates'], 0)
+        self.assertEqual(report['records_added'], report['lines_in_target'])
+
+    def test_lock_timeout(self):
+        with jsonl_lock(self.target):
+            with self.assertRaises(TimeoutError):
+                with jsonl_lock(self.target, timeout=0.05):
+                    pass
+            # Held lock makes the append give up rather than race
+            self.assertEqual(append_unique([{'date': '2025-08-01'}], self.target, lock_timeout=0.05), -1)
+        self.assertEqual(append_unique([{'date': '2025-08-01'}], self.target, lock_timeout=1), 1)
+        self.assertEqual(append_unique([{'date': '2025-08-01'}], self.target, lock_timeout=1), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
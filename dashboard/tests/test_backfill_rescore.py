@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for parallel backfill re-scoring.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Add dashboard path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from score.engine import score_stream
+from scripts.backfill_rescore import (
+    backfill, plan_shards, read_shard_lines, prepare_work_dir, part_path, score_shard
+)
+
+
+class TestBackfillRescore(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.temp_dir, 'garmin_wellness.jsonl')
+        self.records = []
+        for i in range(200):
+            self.records.append({
+                "date": f"2024-{1 + i // 28:02d}-{1 + i % 28:02d}",
+                "metrics": {
+                    "steps": 1000 + i * 97,
+                    "restingHeartRate": 45 + i % 30,
+                    "sleepHours": None if i % 7 == 0 else 5 + (i % 4),
+                    "stress": 10 + i % 80
+                },
+                "score": 0,
+                "band": "stale"
+            })
+        with open(self.source, 'w') as f:
+            for record in self.records:
+                f.write(json.dumps(record) + '\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def read(self, path):
+        with open(path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def test_shards_cover_every_line_once(self):
+        for shard_bytes in (1, 37, 500, 10**9):
+            with self.subTest(shard_bytes=shard_bytes):
+                lines = []
+                for shard in plan_shards(self.source, shard_bytes):
+                    lines.extend(read_shard_lines(self.source, shard['start'], shard['end']))
+                self.assertEqual(len(lines), len(self.records))
+                self.assertEqual([json.loads(l)['date'] for l in lines],
+                                 [r['date'] for r in self.records])
+
+    def test_parallel_output_matches_stream(self):
+        out_dir = os.path.join(self.temp_dir, 'out')
+        report = backfill([self.source], output_dir=out_dir, workers=2, shard_bytes=2000)
+
+        self.assertEqual(report['failed'], [])
+        self.assertEqual(report['records'], len(self.records))
+        self.assertGreater(report['shards_total'], 1)
+        self.assertEqual(self.read(os.path.join(out_dir, 'garmin_wellness.jsonl')),
+                         list(score_stream(self.records)))
+        self.assertFalse(os.path.exists(os.path.join(out_dir, 'garmin_wellness.jsonl.backfill')))
+
+    def test_in_place_rewrite(self):
+        backfill([self.source], workers=1)
+        rescored = self.read(self.source)
+        self.assertEqual(len(rescored), len(self.records))
+        self.assertNotIn('stale', {r['band'] for r in rescored})
+
+    def test_resume_skips_completed_shards(self):
+        out_dir = os.path.join(self.temp_dir, 'out')
+        os.makedirs(out_dir)
+        work_dir = os.path.join(out_dir, 'garmin_wellness.jsonl.backfill')
+        manifest = prepare_work_dir(self.source, work_dir, 2000)
+
+        # Simulate an interrupted run that finished the first shard
+        first = manifest['shards'][0]
+        manifest['counts']['0'] = score_shard(self.source, first['start'], first['end'],
+                                              part_path(work_dir, 0))
+        with open(os.path.join(work_dir, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f)
+
+        report = backfill([self.source], output_dir=out_dir, workers=2, shard_bytes=2000)
+        self.assertEqual(report['shards_resumed'], 1)
+        self.assertEqual(report['records'], len(self.records))
+
+    def test_rejects_non_wellness_records(self):
+        """Daily-record exports (metrics_raw) fail the shard instead of being zeroed."""
+        export = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'synth_export.jsonl')
+        out_dir = os.path.join(self.temp_dir, 'out')
+        report = backfill([export], output_dir=out_dir, workers=1)
+        self.assertEqual(len(report['failed']), 1)
+        self.assertFalse(os.path.exists(os.path.join(out_dir, 'synth_export.jsonl')))
+
+    def test_changed_source_discards_partials(self):
+        work_dir = os.path.join(self.temp_dir, 'garmin_wellness.jsonl.backfill')
+        prepare_work_dir(self.source, work_dir, 2000)
+        with open(self.source, 'a') as f:
+            f.write(json.dumps(self.records[0]) + '\n')
+        manifest = prepare_work_dir(self.source, work_dir, 2000)
+        self.assertEqual(manifest['counts'], {})
+        self.assertEqual(manifest['source']['size'], os.path.getsize(self.source))
+
+
+if __name__ == '__main__':
+    unittest.main()
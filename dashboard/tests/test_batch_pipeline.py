@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for the bounded batch pipeline and streaming InfluxDB ingestion.
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add dashboard path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from utils.batch_pipeline import BatchPipeline, jittered_backoff
+
+SYNTH_EXPORT = Path(__file__).parent / 'synth_export.jsonl'
+
+
+class TestBatchPipeline(unittest.TestCase):
+
+    def test_batches_cut_by_items_and_bytes(self):
+        batches = []
+        with BatchPipeline(batches.append, max_items=4, max_bytes=100) as pipeline:
+            for i in range(10):
+                pipeline.add(i, 10)
+        self.assertEqual([len(b) for b in batches], [4, 4, 2])
+
+        batches = []
+        with BatchPipeline(batches.append, max_items=100, max_bytes=25) as pipeline:
+            for i in range(5):
+                pipeline.add(i, 10)
+        self.assertEqual(batches, [[0, 1], [2, 3], [4]])
+
+    def test_in_flight_bounded(self):
+        release = threading.Event()
+
+        def slow_write(batch):
+            release.wait(2)
+
+        pipeline = BatchPipeline(slow_write, max_items=1, max_in_flight=2).start()
+        producer = threading.Thread(target=lambda: [pipeline.add(i) for i in range(6)])
+        producer.start()
+        time.sleep(0.1)
+        self.assertTrue(producer.is_alive())  # blocked on backpressure
+        release.set()
+        producer.join(2)
+        stats = pipeline.close()
+        self.assertEqual(stats['items_written'], 6)
+        self.assertLessEqual(stats['max_observed_in_flight'], 2)
+
+    def test_transient_errors_retried(self):
+        calls = []
+
+        def flaky(batch):
+            calls.append(list(batch))
+            if len(calls) % 2:
+                raise ConnectionError("transient")
+
+        with BatchPipeline(flaky, max_items=2, max_retries=3, backoff_base=0.001) as pipeline:
+            for i in range(4):
+                pipeline.add(i)
+        stats = pipeline.stats()
+        self.assertEqual((stats['items_written'], stats['failed_batches']), (4, 0))
+        self.assertEqual(stats['retries'], 2)
+        self.assertEqual(stats['batch_latency']['count'], 2)
+
+    def test_batch_dropped_after_retries(self):
+        dropped = []
+
+        def always_fail(batch):
+            raise ConnectionError("down")
+
+        pipeline = BatchPipeline(always_fail, max_items=3, max_retries=2, backoff_base=0.001,
+                                 on_failure=lambda batch, e: dropped.append(batch))
+        with pipeline:
+            for i in range(5):
+                pipeline.add(i)
+        stats = pipeline.stats()
+        self.assertEqual((stats['failed_batches'], stats['failed_items']), (2, 5))
+        self.assertEqual(stats['retries'], 4)
+        self.assertEqual(dropped, [[0, 1, 2], [3, 4]])
+        self.assertEqual(stats['last_error'], 'down')
+
+    def test_backoff_bounds(self):
+        for attempt in range(1, 10):
+            delay = jittered_backoff(attempt, 0.5, 4.0)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(4.0, 0.5 * 2 ** (attempt - 1)))
+
+    def test_closed_pipeline_rejects_items(self):
+        pipeline = BatchPipeline(lambda batch: None)
+        pipeline.close()
+        with self.assertRaises(RuntimeError):
+            pipeline.add(1)
+
+
+class TestStreamingIngest(unittest.TestCase):
+
+    def test_stream_matches_point_path(self):
+        import ingest_influxdb
+        import json
+
+        expected = []
+        with open(SYNTH_EXPORT) as f:
+            for line in f:
+                if line.strip():
+                    expected.extend(p.to_line_protocol()
+                                    for p in ingest_influxdb.create_record_points(json.loads(line)))
+
+        batches = []
+        stats = ingest_influxdb.ingest_records_streaming(batches.append, SYNTH_EXPORT, batch_points=25)
+        self.assertEqual([line for batch in batches for line in batch], expected)
+        self.assertTrue(all(len(batch) <= 25 for batch in batches))
+        self.assertEqual(stats['records_read'], 30)
+        self.assertEqual(stats['items_written'], len(expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Parity tests for vectorized batch scoring.
+compute_scores_batch must match compute_score row by row.
+"""
+
+import os
+import random
+import sys
+import unittest
+
+# Add dashboard path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from score.engine import (
+    compute_score, compute_scores_batch, MetricInputs, ScoreFlags, METRIC_ORDER,
+    BASE_WEIGHTS, WEIGHT_TABLE, WEIGHT_TABLE_ARRAY, weights_for_mask, redistribute_weights
+)
+from scripts.garmin_integrity import DataIntegrity
+
+
+def random_rows(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        rows.append((
+            None if rng.random() < 0.1 else rng.randint(0, 20000),
+            None if rng.random() < 0.1 else rng.randint(30, 90),
+            None if rng.random() < 0.2 else round(rng.uniform(0, 11), 1),
+            None if rng.random() < 0.2 else rng.randint(0, 100),
+        ))
+    return rows
+
+
+class TestBatchScoringParity(unittest.TestCase):
+    """Batch engine must reproduce the scalar engine exactly."""
+
+    def assert_parity(self, rows, flags):
+        steps, rhr, sleep, stress = (list(col) for col in zip(*rows))
+        batch = compute_scores_batch(steps, rhr, sleep, stress, flags=flags)
+        self.assertEqual(len(batch), len(rows))
+
+        for i, (s, r, sl, st) in enumerate(rows):
+            scalar = compute_score(MetricInputs(steps=s, rhr=r, sleep_hours=sl, stress=st), flags)
+            self.assertEqual(int(batch.score[i]), scalar.score, f"row {i}: {rows[i]}")
+            self.assertEqual(batch.band[i], scalar.band)
+            for j, key in enumerate(METRIC_ORDER):
+                self.assertEqual(float(batch.contributions[i, j]), scalar.contributions.get(key, 0.0))
+                self.assertEqual(float(batch.weights[i, j]), scalar.weights.get(key, 0.0))
+            missing = [key for j, key in enumerate(METRIC_ORDER) if batch.missing_mask[i] & (1 << j)]
+            self.assertEqual(missing, scalar.missing)
+
+    def test_parity_default_flags(self):
+        self.assert_parity(random_rows(500), ScoreFlags())
+
+    def test_parity_all_flags(self):
+        self.assert_parity(random_rows(500, seed=7), ScoreFlags(enable_sleep=True, enable_stress=True))
+
+    def test_rounding_half_up_vectors(self):
+        """PRD vectors A/B/C through the batch path."""
+        rows = [(8000, 55, 7, 35), (12500, 48, 7, 35), (3000, 70, None, None)]
+        self.assert_parity(rows, ScoreFlags(enable_sleep=True, enable_stress=True))
+        batch = compute_scores_batch([8000, 3000], [55, 70])
+        self.assertEqual(batch.score.tolist(), [65, 25])
+
+    def test_all_missing_scores_zero(self):
+        batch = compute_scores_batch([None], [None], [None], [None],
+                                     flags=ScoreFlags(enable_sleep=True, enable_stress=True))
+        self.assertEqual(int(batch.score[0]), 0)
+        self.assertEqual(batch.band[0], "Take it easy")
+        self.assertEqual(int(batch.missing_mask[0]), 0b1111)
+
+    def test_explicit_presence_flags(self):
+        """Presence flags mark a value absent even when a number is supplied."""
+        batch = compute_scores_batch([8000], [55], present={"rhr": [False]})
+        scalar = compute_score(MetricInputs(steps=8000, rhr=None))
+        self.assertEqual(int(batch.score[0]), scalar.score)
+
+    def test_mismatched_column_lengths(self):
+        with self.assertRaises(ValueError):
+            compute_scores_batch([8000, 9000], [55])
+
+
+class TestWeightTable(unittest.TestCase):
+    """Precomputed weight table keyed by presence mask."""
+
+    def test_table_matches_per_call_normalization(self):
+        for mask in range(16):
+            active = {k: BASE_WEIGHTS[k] for i, k in enumerate(METRIC_ORDER) if mask & (1 << i)}
+            total = sum(active.values())
+            expected = tuple(active[k] / total if k in active else 0.0 for k in METRIC_ORDER) \
+                if total else (0.0,) * 4
+            self.assertEqual(weights_for_mask(mask), expected, f"mask {mask:04b}")
+
+    def test_table_is_immutable(self):
+        self.assertIsInstance(WEIGHT_TABLE, tuple)
+        with self.assertRaises(ValueError):
+            WEIGHT_TABLE_ARRAY[0, 0] = 1.0
+
+    def test_invalid_mask(self):
+        with self.assertRaises(ValueError):
+            weights_for_mask(16)
+
+    def test_lookup_by_integrity_mask(self):
+        """calculate_metrics_mask output indexes the table directly."""
+        record = {"metrics": {"steps": 8000, "restingHeartRate": 55, "sleepHours": 0, "stress": 30}}
+        mask = DataIntegrity.calculate_metrics_mask(record)
+        flags = ScoreFlags(enable_sleep=True, enable_stress=True)
+        legacy = redistribute_weights(flags, MetricInputs(steps=8000, rhr=55, stress=30))
+        self.assertEqual(dict(zip(METRIC_ORDER, weights_for_mask(mask))),
+                         {k: legacy.get(k, 0.0) for k in METRIC_ORDER})
+
+
+if __name__ == '__main__':
+    unittest.main()
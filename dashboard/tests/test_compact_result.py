@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for CompactScoreResult (slotted score representation).
+"""
+
+import os
+import sys
+import unittest
+from dataclasses import asdict
+
+# Add dashboard path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from score.engine import (
+    compute_score, compute_score_compact, CompactScoreResult, MetricInputs, ScoreFlags
+)
+
+
+class TestCompactScoreResult(unittest.TestCase):
+    """Compact results must expose the same data as ScoreResult."""
+
+    CASES = [
+        (MetricInputs(steps=8000, rhr=55), ScoreFlags()),
+        (MetricInputs(steps=12500, rhr=48, sleep_hours=7, stress=35),
+         ScoreFlags(enable_sleep=True, enable_stress=True)),
+        (MetricInputs(steps=None, rhr=62, sleep_hours=None, stress=20),
+         ScoreFlags(enable_sleep=True, enable_stress=True)),
+        (MetricInputs(steps=None, rhr=None), ScoreFlags()),
+    ]
+
+    def test_to_dict_matches_dataclass(self):
+        for inputs, flags in self.CASES:
+            with self.subTest(inputs=inputs):
+                full = compute_score(inputs, flags)
+                compact = compute_score_compact(inputs, flags)
+                self.assertEqual(compact.to_dict(), asdict(full))
+
+    def test_attribute_compatibility(self):
+        """Callers reading ScoreResult attributes keep working."""
+        inputs, flags = self.CASES[1]
+        full = compute_score(inputs, flags)
+        compact = compute_score_compact(inputs, flags)
+        for attr in ('score', 'band', 'contributions', 'weights', 'normalized', 'missing'):
+            self.assertEqual(getattr(compact, attr), getattr(full, attr), attr)
+
+    def test_bitmasks(self):
+        inputs, flags = self.CASES[2]
+        compact = compute_score_compact(inputs, flags)
+        self.assertEqual(compact.active_mask, 0b1010)
+        self.assertEqual(compact.missing_mask, 0b0101)
+        self.assertEqual(compact.missing, ['steps', 'sleep'])
+
+    def test_slots_no_instance_dict(self):
+        compact = compute_score_compact(*self.CASES[0])
+        self.assertFalse(hasattr(compact, '__dict__'))
+        with self.assertRaises(AttributeError):
+            compact.extra = 1
+
+    def test_equality(self):
+        a = compute_score_compact(*self.CASES[0])
+        b = CompactScoreResult.from_result(compute_score(*self.CASES[0]))
+        self.assertEqual(a, b)
+
+
+if __name__ == '__main__':
+    unittest.main()
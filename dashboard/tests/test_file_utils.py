@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for JSONL file utilities (atomic writes and durable appends).
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+# Add dashboard path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.file_utils import (
+    atomic_write_jsonl, atomic_append_jsonl, durable_append_jsonl, fcntl, jsonl_lock,
+    repair_torn_tail, tail_jsonl
+)
+
+
+class TestDurableAppend(unittest.TestCase):
+    """O(1) append path with torn-tail recovery."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'telemetry.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def read(self):
+        with open(self.path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def test_append_creates_and_extends(self):
+        self.assertTrue(durable_append_jsonl([{'date': '2025-08-01'}], self.path))
+        self.assertTrue(atomic_append_jsonl([{'date': '2025-08-02'}], self.path, mode='append'))
+        self.assertEqual([r['date'] for r in self.read()], ['2025-08-01', '2025-08-02'])
+
+    def test_append_does_not_rewrite_history(self):
+        atomic_write_jsonl([{'date': '2025-08-01'}], self.path)
+        inode = os.stat(self.path).st_ino
+        durable_append_jsonl([{'date': '2025-08-02'}], self.path)
+        self.assertEqual(os.stat(self.path).st_ino, inode)
+
+    def test_torn_tail_truncated(self):
+        with open(self.path, 'w') as f:
+            f.write(json.dumps({'date': '2025-08-01'}) + '\n')
+            f.write('{"date": "2025-08-0')  # crash mid-line
+        removed = repair_torn_tail(self.path)
+        self.assertEqual(removed, len('{"date": "2025-08-0'))
+        self.assertEqual(self.read(), [{'date': '2025-08-01'}])
+
+    def test_complete_tail_without_newline_kept(self):
+        with open(self.path, 'w') as f:
+            f.write(json.dumps({'date': '2025-08-01'}))
+        durable_append_jsonl([{'date': '2025-08-02'}], self.path)
+        self.assertEqual([r['date'] for r in self.read()], ['2025-08-01', '2025-08-02'])
+
+    def test_torn_only_line(self):
+        with open(self.path, 'w') as f:
+            f.write('{"date"')
+        durable_append_jsonl([{'date': '2025-08-02'}], self.path)
+        self.assertEqual(self.read(), [{'date': '2025-08-02'}])
+
+    @unittest.skipIf(fcntl is None, "fcntl advisory locks not available")
+    def test_concurrent_append_waits_for_line_in_progress(self):
+        durable_append_jsonl([{'date': '2025-08-01'}], self.path)
+        with jsonl_lock(self.path):
+            # Another appender is midway through its line
+            with open(self.path, 'a') as f:
+                f.write('{"date": "2025-')
+            other = threading.Thread(target=durable_append_jsonl, args=([{'date': '2025-08-03'}], self.path))
+            other.start()
+            other.join(0.2)
+            self.assertTrue(other.is_alive())  # blocked, not repairing the live line
+            with open(self.path, 'a') as f:
+                f.write('08-02"}\n')
+        other.join(5)
+        self.assertEqual([r['date'] for r in self.read()], ['2025-08-01', '2025-08-02', '2025-08-03'])
+
+    def test_rewrite_mode_unchanged(self):
+        with open(self.path, 'w') as f:
+            f.write('not json\n')
+        atomic_append_jsonl([{'date': '2025-08-01'}], self.path)
+        self.assertEqual(self.read(), [{'date': '2025-08-01'}])
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            atomic_append_jsonl([], self.path, mode='bogus')
+
+
+class TestTailJsonl(unittest.TestCase):
+    """Backwards mmap scan for the last N records."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'wellness.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_last_n_in_file_order(self):
+        atomic_write_jsonl([{'n': i} for i in range(100)], self.path)
+        self.assertEqual([r['n'] for r in tail_jsonl(self.path, 7)], list(range(93, 100)))
+        self.assertEqual(len(tail_jsonl(self.path, 500)), 100)
+
+    def test_missing_and_empty(self):
+        self.assertEqual(tail_jsonl(self.path, 3), [])
+        open(self.path, 'w').close()
+        self.assertEqual(tail_jsonl(self.path, 3), [])
+        self.assertEqual(tail_jsonl(self.path, 0), [])
+
+    def test_skips_blank_malformed_and_torn_lines(self):
+        with open(self.path, 'w') as f:
+            f.write(json.dumps({'n': 1}) + '\n')
+            f.write('\n')
+            f.write(json.dumps({'n': 2}) + '\n')
+            f.write('not json\n')
+            f.write('[1, 2]\n')
+            f.write('{"n": 3')  # torn tail
+        self.assertEqual(tail_jsonl(self.path, 2), [{'n': 1}, {'n': 2}])
+
+    def test_complete_tail_without_newline(self):
+        with open(self.path, 'w') as f:
+            f.write(json.dumps({'n': 1}) + '\n' + json.dumps({'n': 2}))
+        self.assertEqual(tail_jsonl(self.path, 1), [{'n': 2}])
+
+
+if __name__ == '__main__':
+    unittest.main()
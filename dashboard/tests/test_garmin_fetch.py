@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for GarminWellnessFetcher's concurrent per-day fetching (fake Garmin client).
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+
+# Add dashboard and scripts paths for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from fetch_garmin_data import ENDPOINTS, GarminWellnessFetcher
+
+
+class FakeGarmin:
+    """Deterministic per-date responses with a fixed delay per call."""
+
+    def __init__(self, delay=0.01, fail=None):
+        self.delay = delay
+        self.fail = fail or set()  # {(method, date_str)}
+        self.lock = threading.Lock()
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    def _call(self, method, date_str, response):
+        with self.lock:
+            self.calls.append((method, date_str))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if (method, date_str) in self.fail:
+                raise ConnectionError(f"{method} failed")
+            return response
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    def get_steps_data(self, date_str):
+        return self._call('get_steps_data', date_str, [{'steps': 5000 + int(date_str[-2:]) * 100}])
+
+    def get_heart_rates(self, date_str):
+        return self._call('get_heart_rates', date_str, {'restingHeartRate': 50 + int(date_str[-2:]) % 10})
+
+    def get_sleep_data(self, date_str):
+        return self._call('get_sleep_data', date_str, {'dailySleepDTO': {'sleepTimeSeconds': 7 * 3600}})
+
+    def get_stress_data(self, date_str):
+        return self._call('get_stress_data', date_str, [{'stressLevel': 30}, {'stressLevel': 40}])
+
+
+def make_fetcher(client, concurrency, requests_per_sec=0):
+    fetcher = GarminWellnessFetcher('user@example.com', 'secret', concurrency=concurrency,
+                                    requests_per_sec=requests_per_sec)
+    fetcher.client = client
+    return fetcher
+
+
+class TestConcurrentFetch(unittest.TestCase):
+
+    start = datetime(2025, 8, 1)
+    end = datetime(2025, 8, 10)
+
+    def strip(self, records):
+        return [{k: v for k, v in r.items() if k != 'auto_run'} for r in records]
+
+    def test_concurrent_matches_serial_in_date_order(self):
+        serial = make_fetcher(FakeGarmin(delay=0), 1).fetch_date_range(self.start, self.end)
+        client = FakeGarmin(delay=0.01)
+        concurrent = make_fetcher(client, 8).fetch_date_range(self.start, self.end)
+        self.assertEqual(self.strip(concurrent), self.strip(serial))
+        self.assertEqual([r['date'] for r in concurrent],
+                         [(self.start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(10)])
+        self.assertEqual(len(client.calls), 10 * len(ENDPOINTS))
+        self.assertGreater(client.max_active, 1)
+        self.assertLessEqual(client.max_active, 8)
+
+    def test_failed_call_skips_only_that_date(self):
+        client = FakeGarmin(delay=0, fail={('get_sleep_data', '2025-08-03')})
+        fetcher = make_fetcher(client, 4)
+        with self.assertLogs('fetch_garmin_data', level='ERROR'):
+            records = fetcher.fetch_date_range(self.start, self.end)
+        self.assertEqual(len(records), 9)
+        self.assertNotIn('2025-08-03', [r['date'] for r in records])
+        self.assertEqual(fetcher.endpoint_stats()['sleep']['errors'], 1)
+
+    def test_endpoint_latency_stats(self):
+        fetcher = make_fetcher(FakeGarmin(delay=0.005), 4, requests_per_sec=1000)
+        fetcher.fetch_date_range(self.start, self.end)
+        stats = fetcher.endpoint_stats()
+        for name, _ in ENDPOINTS:
+            self.assertEqual(stats[name]['count'], 10)
+            self.assertGreaterEqual(stats[name]['max_ms'], 5)
+        self.assertEqual(stats['rate_limiter']['acquired'], 40)
+
+    def test_rate_limit_shared_across_workers(self):
+        fetcher = make_fetcher(FakeGarmin(delay=0), 8, requests_per_sec=100)
+        started = time.monotonic()
+        fetcher.fetch_date_range(self.start, self.start + timedelta(days=49))  # 200 calls
+        # 100-call burst, then 100 more at 100/s
+        self.assertGreaterEqual(time.monotonic() - started, 0.9)
+
+
+if __name__ == '__main__':
+    unittest.main()
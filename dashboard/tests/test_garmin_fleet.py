@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tests for the multi-account fleet fetcher (fake Garmin clients, no network).
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+# Add dashboard and scripts paths for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from fetch_garmin_data import ENDPOINTS, GarminWellnessFetcher
+from fetch_garmin_fleet import FleetFetcher, load_manifest, partition_path, percentile
+from tests.test_garmin_fetch import FakeGarmin
+
+ENV = {'PW_ALICE': 'a', 'PW_BOB': 'b', 'PW_CAROL': 'c'}
+
+
+def accounts(*ids, **overrides):
+    return [dict({'id': i, 'email': f'{i}@example.com', 'password_env': f'PW_{i.upper()}'},
+                 **overrides.get(i, {})) for i in ids]
+
+
+class FakeFleetFetcher(GarminWellnessFetcher):
+    """Connects to a per-account FakeGarmin instead of Garmin Connect."""
+
+    clients = {}
+    fail_login = set()
+
+    def connect(self):
+        if self.email in self.fail_login:
+            return False
+        self.client = self.clients.setdefault(self.email, FakeGarmin(delay=0.002))
+        self.session_stats = {'mode': 'resumed'}
+        return True
+
+
+class TestGarminFleet(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.output_dir = os.path.join(self.test_dir, 'accounts')
+        FakeFleetFetcher.clients = {}
+        FakeFleetFetcher.fail_login = set()
+        self.env = mock.patch.dict(os.environ, ENV)
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def fleet(self, manifest, **kwargs):
+        kwargs.setdefault('days', 5)
+        kwargs.setdefault('requests_per_sec', 0)
+        kwargs.setdefault('global_requests_per_sec', 0)
+        return FleetFetcher(manifest, self.output_dir, fetcher_factory=FakeFleetFetcher, **kwargs)
+
+    def read(self, account_id):
+        with open(partition_path(self.output_dir, account_id)) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def test_manifest_validation(self):
+        path = os.path.join(self.test_dir, 'accounts.json')
+        cases = [
+            ({'accounts': accounts('alice', 'bob')}, None),
+            (accounts('alice'), None),
+            ({'accounts': []}, 'non-empty'),
+            (accounts('alice', 'alice'), 'Duplicate'),
+            (accounts('alice') + [{'id': '../bob', 'email': 'b', 'password_env': 'X'}], 'safe'),
+            ([{'id': 'bob', 'email': 'b', 'password_env': 'X', 'password': 'p'}], 'inline'),
+            ([{'id': 'bob', 'email': 'b'}], 'password_env'),
+        ]
+        for manifest, error in cases:
+            with open(path, 'w') as f:
+                json.dump(manifest, f)
+            if error is None:
+                self.assertTrue(load_manifest(path))
+            else:
+                with self.assertRaisesRegex(ValueError, error):
+                    load_manifest(path)
+
+    def test_partitions_and_summary(self):
+        summary = self.fleet(accounts('alice', 'bob', 'carol'), workers=2).run()
+        self.assertEqual((summary['accounts'], summary['succeeded'], summary['failed']), (3, 3, 0))
+        self.assertEqual(summary['records'], 15)
+        self.assertEqual([r['account'] for r in summary['results']], ['alice', 'bob', 'carol'])
+        for account_id in ('alice', 'bob', 'carol'):
+            self.assertEqual(len(self.read(account_id)), 5)
+        for result in summary['results']:
+            self.assertEqual(result['calls'], 5 * len(ENDPOINTS))
+        latency = summary['account_latency_s']
+        self.assertGreater(latency['p50'], 0)
+        self.assertLessEqual(latency['p50'], latency['p95'])
+        self.assertEqual(latency['p95'], latency['max'])
+
+    def test_failures_isolated(self):
+        FakeFleetFetcher.fail_login = {'bob@example.com'}
+        manifest = accounts('alice', 'bob') + [{'id': 'dave', 'email': 'd', 'password_env': 'PW_DAVE'}]
+        with self.assertLogs('fetch_garmin_fleet', level='ERROR'):
+            summary = self.fleet(manifest, workers=3).run()
+        self.assertEqual((summary['succeeded'], summary['failed'], summary['records']), (1, 2, 5))
+        errors = {r['account']: r['error'] for r in summary['results']}
+        self.assertIsNone(errors['alice'])
+        self.assertEqual(errors['bob'], 'login failed')
+        self.assertIn('PW_DAVE', errors['dave'])
+        self.assertFalse(os.path.exists(partition_path(self.output_dir, 'bob')))
+
+    def test_global_rate_limit_shared_across_accounts(self):
+        fleet = self.fleet(accounts('alice', 'bob', 'carol'), workers=3, days=10,
+                           global_requests_per_sec=100)
+        started = time.monotonic()
+        summary = fleet.run()
+        # 3 logins + 120 calls: a 100-token burst, then 23 more at 100/s
+        self.assertGreaterEqual(time.monotonic() - started, 0.2)
+        self.assertEqual(summary['global_rate_limiter']['acquired'], 123)
+
+    def test_per_account_rate_override(self):
+        manifest = accounts('alice', 'bob', bob={'requests_per_sec': 10, 'days': 4})
+        summary = self.fleet(manifest, workers=2, days=2).run()
+        by_id = {r['account']: r for r in summary['results']}
+        # bob: 16 calls at 10/s (10-call burst) takes >= 0.6s; alice is unthrottled
+        self.assertGreaterEqual(by_id['bob']['elapsed_s'], 0.55)
+        self.assertLess(by_id['alice']['elapsed_s'], by_id['bob']['elapsed_s'])
+        self.assertEqual(by_id['bob']['records'], 4)
+
+    def test_incremental_second_run_fetches_recent_days_only(self):
+        self.fleet(accounts('alice', 'bob'), incremental=True, days=10).run()
+        FakeFleetFetcher.clients = {}
+        summary = self.fleet(accounts('alice', 'bob'), incremental=True, days=10, refetch_days=2).run()
+        for result in summary['results']:
+            self.assertEqual((result['dates'], result['calls']), (2, 2 * len(ENDPOINTS)))
+            self.assertEqual(result['merge']['unchanged'], 2)
+            self.assertEqual(len(self.read(result['account'])), 10)
+
+    def test_percentile(self):
+        values = [float(n) for n in range(1, 21)]
+        self.assertEqual(percentile(values, 50), 10.0)
+        self.assertEqual(percentile(values, 95), 19.0)
+        self.assertEqual(percentile([3.0], 95), 3.0)
+        self.assertEqual(percentile([], 50), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
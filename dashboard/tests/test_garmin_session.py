@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Tests for the on-disk Garmin session store (fake Garmin client, no network).
+"""
+
+import json
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add dashboard and scripts paths for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from utils.garmin_session import GarminSessionStore, is_auth_rejection
+from fetch_garmin_data import GarminWellnessFetcher
+
+try:
+    import requests
+    from garminconnect import Garmin
+    from garminconnect.client import Client as NativeClient
+except ImportError:  # garminconnect < 0.3 (garth-based) or not installed
+    Garmin = NativeClient = None
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeHTTPError(ConnectionError):
+    """Shaped like requests.HTTPError (status on .response)."""
+
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.response = FakeResponse(status_code)
+
+
+class GarthHTTPError(Exception):
+    """Shaped like garth's wrapper (HTTPError on .error)."""
+
+    def __init__(self, message, error):
+        super().__init__(message)
+        self.error = error
+
+
+class GarminConnectAuthenticationError(Exception):
+    pass
+
+
+class FakeGarth:
+    def __init__(self, server):
+        self.server = server
+        self.tokens = None
+
+    def dumps(self):
+        return self.tokens
+
+    def loads(self, tokens):
+        if not tokens.startswith(('T', 'R')):
+            raise ValueError("not a token dump")
+        self.tokens = tokens
+
+    def connectapi(self, path):
+        self.server.profile_checks += 1
+        if self.server.outage is not None:
+            raise self.server.outage
+        if self.tokens not in self.server.valid:
+            raise FakeHTTPError("session expired", 401)
+        self.tokens = self.server.rotate.pop(self.tokens, self.tokens)
+        self.server.valid.add(self.tokens)
+        return {'displayName': 'user-1234', 'fullName': 'User'}
+
+
+class FakeGarminServer:
+    """Issues tokens on credential login and accepts/rotates/rejects them."""
+
+    def __init__(self):
+        self.credential_logins = 0
+        self.profile_checks = 0
+        self.valid = set()
+        self.rotate = {}  # old tokens -> new tokens on next profile check
+        self.issued = 0
+        self.outage = None  # exception raised by profile checks while set
+
+    def factory(self, email, password):
+        return FakeGarmin(self, email, password)
+
+
+class FakeGarmin:
+    def __init__(self, server, email, password):
+        self.server = server
+        self.email = email
+        self.password = password
+        self.garth = FakeGarth(server)
+        self.display_name = None
+
+    def login(self, tokenstore=None):
+        if tokenstore is not None:
+            raise AssertionError("sessions are resumed through the token client, not login(tokens)")
+        if self.password != 'secret':
+            raise FakeHTTPError("bad credentials", 401)
+        self.server.credential_logins += 1
+        self.server.issued += 1
+        self.garth.tokens = 'T' * 600 + str(self.server.issued)
+        self.server.valid.add(self.garth.tokens)
+        self.display_name = 'user-1234'
+
+
+class TestGarminSessionStore(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.private_dir = os.path.join(self.test_dir, 'private')
+        self.server = FakeGarminServer()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def connect(self, password='secret'):
+        store = GarminSessionStore(self.private_dir, 'user@example.com')
+        return store, store.connect('user@example.com', password, factory=self.server.factory)
+
+    def test_first_run_logs_in_and_saves_private_session(self):
+        store, client = self.connect()
+        self.assertEqual(store.stats['mode'], 'login')
+        self.assertIsNotNone(store.stats['login_s'])
+        self.assertIsNone(store.stats['resume_s'])
+        self.assertEqual(stat.S_IMODE(os.stat(self.private_dir).st_mode), 0o700)
+        self.assertEqual(stat.S_IMODE(os.stat(store.path).st_mode), 0o600)
+        with open(store.path) as f:
+            contents = f.read()
+        self.assertNotIn('example.com', contents)
+        self.assertEqual(json.loads(contents)['tokens'], client.garth.tokens)
+
+    def test_next_run_resumes_without_credential_login(self):
+        self.connect()
+        store, client = self.connect()
+        self.assertEqual(store.stats['mode'], 'resumed')
+        self.assertIsNotNone(store.stats['resume_s'])
+        self.assertIsNone(store.stats['login_s'])
+        self.assertEqual((self.server.credential_logins, self.server.profile_checks), (1, 1))
+        self.assertEqual(client.display_name, 'user-1234')
+
+    def test_refreshed_tokens_written_back(self):
+        store, client = self.connect()
+        self.server.rotate[client.garth.tokens] = 'R' * 600
+        store, _ = self.connect()
+        self.assertEqual(store.stats['mode'], 'refreshed')
+        self.assertEqual(store.load_tokens(), 'R' * 600)
+        store, _ = self.connect()
+        self.assertEqual(store.stats['mode'], 'resumed')
+        self.assertEqual(self.server.credential_logins, 1)
+
+    def test_rejected_session_falls_back_to_login(self):
+        store, client = self.connect()
+        self.server.valid.clear()
+        with self.assertLogs('utils.garmin_session', level='WARNING'):
+            store, client = self.connect()
+        self.assertEqual(store.stats['mode'], 'login')
+        self.assertIn('expired', store.stats['resume_error'])
+        self.assertEqual(self.server.credential_logins, 2)
+        self.assertEqual(store.load_tokens(), client.garth.tokens)
+
+    def test_transient_resume_failure_keeps_session(self):
+        store, client = self.connect()
+        tokens = client.garth.tokens
+        self.server.outage = ConnectionError("Read timed out")
+        with self.assertLogs('utils.garmin_session', level='WARNING'):
+            with self.assertRaises(ConnectionError):
+                self.connect()
+        self.assertEqual(self.server.credential_logins, 1)
+        self.assertEqual(store.load_tokens(), tokens)
+        self.server.outage = None
+        store, _ = self.connect()
+        self.assertEqual(store.stats['mode'], 'resumed')
+
+    def test_auth_rejection_detection(self):
+        try:
+            try:
+                raise FakeHTTPError("Forbidden", 403)
+            except FakeHTTPError as e:
+                raise RuntimeError("profile call failed") from e
+        except RuntimeError as e:
+            chained = e
+        try:
+            try:
+                raise ConnectionError("Read timed out")
+            except ConnectionError as e:
+                raise GarminConnectAuthenticationError("Failed to retrieve social profile") from e
+        except GarminConnectAuthenticationError as e:
+            timed_out = e
+        cases = [
+            (FakeHTTPError("Unauthorized", 401), True),
+            (GarthHTTPError("Error in request", FakeHTTPError("Unauthorized", 401)), True),
+            (ConnectionError("API Error 401 - Unauthorized"), True),
+            (chained, True),
+            (timed_out, False),  # the class name alone says nothing
+            (FakeHTTPError("Too Many Requests", 429), False),
+            (GarthHTTPError("Error in request", FakeHTTPError("Bad Gateway", 502)), False),
+            (ConnectionError("API Error 503 - Service Unavailable"), False),
+            (ConnectionError("Read timed out"), False),
+        ]
+        for error, expected in cases:
+            self.assertEqual(is_auth_rejection(error), expected, repr(error))
+
+    def test_unloadable_session_falls_back_to_login(self):
+        store, _ = self.connect()
+        store.save_tokens('corrupted')
+        with self.assertLogs('utils.garmin_session', level='WARNING'):
+            store, _ = self.connect()
+        self.assertEqual(store.stats['mode'], 'login')
+        self.assertEqual((self.server.credential_logins, self.server.profile_checks), (2, 0))
+
+    def test_failed_login_raises_and_leaves_no_session(self):
+        store = GarminSessionStore(self.private_dir, 'user@example.com')
+        with self.assertRaises(ConnectionError):
+            store.connect('user@example.com', 'wrong', factory=self.server.factory)
+        self.assertIsNone(store.load_tokens())
+
+    def test_loose_permissions_tightened_and_other_account_ignored(self):
+        store, _ = self.connect()
+        os.chmod(store.path, 0o644)
+        with self.assertLogs('utils.garmin_session', level='WARNING'):
+            self.assertIsNotNone(store.load_tokens())
+        self.assertEqual(stat.S_IMODE(os.stat(store.path).st_mode), 0o600)
+        other = GarminSessionStore(self.private_dir, 'other@example.com')
+        shutil.copy(store.path, other.path)
+        self.assertIsNone(other.load_tokens())
+
+    def test_fetcher_connect_reports_session_timings(self):
+        import fetch_garmin_data
+        original = fetch_garmin_data.Garmin
+        fetch_garmin_data.Garmin = self.server.factory
+        try:
+            for expected in ('login', 'resumed'):
+                store = GarminSessionStore(self.private_dir, 'user@example.com')
+                fetcher = GarminWellnessFetcher('user@example.com', 'secret', session_store=store)
+                self.assertTrue(fetcher.connect())
+                self.assertEqual(fetcher.endpoint_stats()['session']['mode'], expected)
+        finally:
+            fetch_garmin_data.Garmin = original
+        self.assertEqual(self.server.credential_logins, 1)
+
+
+class NativeGarminServer:
+    """Stands in for Garmin's HTTP endpoints behind garminconnect 0.3's native client."""
+
+    def __init__(self):
+        self.credential_logins = 0
+        self.valid = set()
+        self.outage = None  # exception raised by API requests while set
+
+    def login(self, client, email, password, **kwargs):
+        self.credential_logins += 1
+        client.di_token = f"di-token-{self.credential_logins}"
+        client.di_refresh_token = 'refresh'
+        client.di_client_id = 'client-id'
+        self.valid.add(client.di_token)
+        return None, None
+
+    def request(self, method, url, headers=None, **kwargs):
+        if self.outage is not None:
+            raise self.outage
+        if headers.get('Authorization', '').split(' ')[-1] not in self.valid:
+            return NativeResponse(401, {'message': 'Unauthorized'})
+        if 'socialProfile' in url:
+            return NativeResponse(200, {'displayName': 'user-1234', 'fullName': 'User'})
+        return NativeResponse(200, {'userData': {'measurementSystem': 'metric'}})
+
+
+class NativeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.body = body
+        self.text = json.dumps(body)
+        self.content = self.text.encode()
+
+    def json(self):
+        return self.body
+
+
+@unittest.skipIf(NativeClient is None, "garminconnect >= 0.3 not installed")
+class TestNativeGarminSession(unittest.TestCase):
+    """The real garminconnect.Garmin, with only its network calls faked."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.private_dir = os.path.join(self.test_dir, 'private')
+        self.server = server = NativeGarminServer()
+        session = mock.Mock()
+        session.request.side_effect = server.request
+        patches = [
+            mock.patch.object(NativeClient, 'login', lambda client, *a, **kw: server.login(client, *a, **kw)),
+            mock.patch.object(NativeClient, '_fresh_api_session', lambda client: session),
+            mock.patch.object(NativeClient, '_http_post', lambda client, *a, **kw: NativeResponse(401, {})),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def connect(self):
+        store = GarminSessionStore(self.private_dir, 'user@example.com')
+        return store, store.connect('user@example.com', 'secret', factory=Garmin)
+
+    def test_resume_without_credential_login(self):
+        self.connect()
+        store, client = self.connect()
+        self.assertEqual(store.stats['mode'], 'resumed')
+        self.assertEqual(self.server.credential_logins, 1)
+        self.assertEqual(client.display_name, 'user-1234')
+
+    def test_unloadable_session_reported_as_login(self):
+        store, _ = self.connect()
+        broken = json.dumps({'di_token': None, 'padding': 'x' * 600})  # > 512 chars: token data, not a path
+        # Garmin.login(tokens) itself hides the failure behind a credential login
+        Garmin('user@example.com', 'secret').login(broken)
+        self.assertEqual(self.server.credential_logins, 2)
+
+        store.save_tokens(broken)
+        with self.assertLogs('utils.garmin_session', level='WARNING'):
+            store, _ = self.connect()
+        self.assertEqual(store.stats['mode'], 'login')
+        self.assertIsNotNone(store.stats['login_s'])
+        self.assertIn('structurally failed', store.stats['resume_error'])
+        self.assertEqual(self.server.credential_logins, 3)
+
+    def test_rejected_session_cleared(self):
+        self.connect()
+        self.server.valid.clear()
+        with self.assertLogs('utils.garmin_session', level='WARNING'):
+            store, _ = self.connect()
+        self.assertEqual(store.stats['mode'], 'login')
+        self.assertIn('API Error 401', store.stats['resume_error'])
+        self.assertEqual(self.server.credential_logins, 2)
+
+    def test_timeout_keeps_session(self):
+        store, _ = self.connect()
+        tokens = store.load_tokens()
+        self.server.outage = requests.exceptions.ReadTimeout("Read timed out")
+        with self.assertLogs('utils.garmin_session', level='WARNING'):
+            with self.assertRaises(requests.exceptions.ReadTimeout):
+                self.connect()
+        self.assertEqual(store.load_tokens(), tokens)
+        self.assertEqual(self.server.credential_logins, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental Garmin fetching: gap planning from the date index and merging into history.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+
+# Add dashboard and scripts paths for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from utils.file_utils import atomic_write_jsonl
+from utils.jsonl_index import indexed_dates
+from fetch_garmin_data import ENDPOINTS, merge_into_history, plan_incremental_dates
+from tests.test_garmin_fetch import FakeGarmin, make_fetcher
+
+
+def day(n):
+    return (date(2025, 8, 1) + timedelta(days=n - 1)).isoformat()
+
+
+def record(n, score=70, auto_run=1):
+    return {'date': day(n), 'metrics': {'steps': 1000 * n}, 'score': score, 'band': 'Maintain',
+            'auto_run': auto_run}
+
+
+class TestIncrementalFetch(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, 'garmin_wellness.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def read(self):
+        with open(self.path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def test_plan_gaps_plus_refetch_window(self):
+        present = [day(n) for n in range(1, 31) if n not in (4, 5, 17)]
+        dates = plan_incremental_dates(present, date(2025, 8, 1), date(2025, 8, 30), refetch_days=2)
+        self.assertEqual([d.isoformat() for d in dates], [day(4), day(5), day(17), day(29), day(30)])
+        self.assertEqual(len(plan_incremental_dates([], date(2025, 8, 1), date(2025, 8, 30), 2)), 30)
+        self.assertEqual(plan_incremental_dates(present[:-2] + [day(29), day(30)],
+                                                date(2025, 8, 1), date(2025, 8, 30), 0),
+                         [date(2025, 8, 4), date(2025, 8, 5), date(2025, 8, 17)])
+
+    def test_new_file_written_in_date_order(self):
+        stats = merge_into_history([record(3), record(1), record(2)], self.path)
+        self.assertEqual((stats['added'], stats['mode'], stats['ok']), (3, 'rewrite', True))
+        self.assertEqual([r['date'] for r in self.read()], [day(1), day(2), day(3)])
+
+    def test_newer_dates_appended(self):
+        atomic_write_jsonl([record(n) for n in range(1, 11)], self.path)
+        inode = os.stat(self.path).st_ino
+        stats = merge_into_history([record(10, auto_run=0), record(11)], self.path)
+        self.assertEqual((stats['added'], stats['unchanged'], stats['mode']), (1, 1, 'append'))
+        self.assertEqual(os.stat(self.path).st_ino, inode)
+        rows = self.read()
+        self.assertEqual([r['date'] for r in rows], [day(n) for n in range(1, 12)])
+        self.assertEqual(rows[9]['auto_run'], 1)  # unchanged record kept as stored
+
+    def test_changed_and_gap_dates_rewrite_in_order(self):
+        atomic_write_jsonl([record(n) for n in range(1, 11) if n != 4], self.path)
+        stats = merge_into_history([record(4), record(10, score=80), record(11)], self.path)
+        self.assertEqual((stats['added'], stats['replaced'], stats['mode']), (2, 1, 'rewrite'))
+        rows = self.read()
+        self.assertEqual([r['date'] for r in rows], [day(n) for n in range(1, 12)])
+        self.assertEqual(rows[9]['score'], 80)
+        self.assertEqual(indexed_dates(self.path), [day(n) for n in range(1, 12)])
+
+    def test_nothing_changed_leaves_file_untouched(self):
+        atomic_write_jsonl([record(n) for n in range(1, 6)], self.path)
+        before = os.stat(self.path)
+        stats = merge_into_history([record(4), record(5)], self.path)
+        self.assertEqual((stats['unchanged'], stats['mode']), (2, 'none'))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, before.st_mtime_ns)
+
+    def test_steady_state_run_fetches_only_recent_days(self):
+        start, end = date(2025, 8, 1), date(2025, 8, 30)
+        fetcher = make_fetcher(FakeGarmin(delay=0), 4)
+        dates = plan_incremental_dates(indexed_dates(self.path), start, end, refetch_days=2)
+        merge_into_history(fetcher.fetch_dates([datetime.combine(d, datetime.min.time()) for d in dates]),
+                           self.path)
+        self.assertEqual(len(self.read()), 30)
+
+        client = FakeGarmin(delay=0)
+        fetcher = make_fetcher(client, 4)
+        end += timedelta(days=1)
+        start += timedelta(days=1)
+        dates = plan_incremental_dates(indexed_dates(self.path, start.isoformat(), end.isoformat()),
+                                       start, end, refetch_days=2)
+        stats = merge_into_history(fetcher.fetch_dates([datetime.combine(d, datetime.min.time())
+                                                        for d in dates]), self.path)
+        self.assertEqual(sorted({d for _, d in client.calls}), ['2025-08-30', '2025-08-31'])
+        self.assertEqual(len(client.calls), 2 * len(ENDPOINTS))
+        self.assertEqual((stats['added'], stats['unchanged'], stats['mode']), (1, 1, 'append'))
+        self.assertEqual(len(self.read()), 31)
+
+
+if __name__ == '__main__':
+    unittest.main()
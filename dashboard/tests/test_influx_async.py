@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for the asyncio write pool/runner against the local InfluxDB stand-in.
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add dashboard path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.influx_async import AsyncIngestRunner, AsyncWritePool, WriteError
+from utils.influx_standin import StandInWriteServer
+from utils.line_protocol import DailyRecordEncoder
+
+SYNTH_EXPORT = Path(__file__).parent / 'synth_export.jsonl'
+
+
+def expected_lines():
+    encoder = DailyRecordEncoder()
+    with open(SYNTH_EXPORT) as f:
+        return [line for raw in f if raw.strip() for line in encoder.encode(json.loads(raw))]
+
+
+class TestAsyncIngest(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def run_files(self, server, paths, concurrency=4, **kwargs):
+        pool = AsyncWritePool(server.url, org='o', bucket='b', token='t', pool_size=concurrency)
+        runner = AsyncIngestRunner(pool, concurrency=concurrency, batch_points=kwargs.pop('batch_points', 12),
+                                   backoff_base=0, **kwargs)
+        return asyncio.run(runner.run(paths))
+
+    def test_payloads_arrive_gzipped_and_complete(self):
+        with StandInWriteServer() as server:
+            stats = self.run_files(server, [SYNTH_EXPORT])
+        self.assertEqual(stats['failed_batches'], 0)
+        self.assertEqual(sorted(server.lines()), sorted(expected_lines()))
+        self.assertEqual(stats['points_written'], len(expected_lines()))
+        write = server.writes[0]
+        self.assertEqual((write['org'], write['bucket'], write['precision'], write['encoding']),
+                         ('o', 'b', 's', 'gzip'))
+        self.assertGreater(stats['pool']['compression_ratio'], 1)
+
+    def test_connections_reused_and_concurrency_bounded(self):
+        paths = []
+        for n in range(4):
+            path = os.path.join(self.test_dir, f'user_{n}.jsonl')
+            shutil.copy(SYNTH_EXPORT, path)
+            paths.append(path)
+        with StandInWriteServer(latency_ms=5) as server:
+            stats = self.run_files(server, paths, concurrency=3)
+        self.assertEqual(stats['points_written'], 4 * len(expected_lines()))
+        self.assertEqual(len(stats['files']), 4)
+        self.assertLessEqual(stats['max_observed_in_flight'], 3)
+        self.assertLessEqual(stats['pool']['connections_opened'], 3)
+        self.assertEqual(server.stats()['connections'], stats['pool']['connections_opened'])
+        self.assertGreater(stats['pool']['reused_requests'], 0)
+        self.assertEqual(stats['request_latency']['count'], stats['batches_written'])
+
+    def test_retryable_errors_retried(self):
+        with StandInWriteServer(fail_first=3) as server:
+            stats = self.run_files(server, [SYNTH_EXPORT], concurrency=1, max_retries=5)
+        self.assertEqual(stats['retries'], 3)
+        self.assertEqual(stats['failed_batches'], 0)
+        self.assertEqual(len(server.lines()), len(expected_lines()))
+
+    def test_non_retryable_error_fails_batch(self):
+        with StandInWriteServer(error_rate=1.0, error_status=400) as server:
+            stats = self.run_files(server, [SYNTH_EXPORT], concurrency=2, max_retries=5)
+        self.assertEqual(stats['retries'], 0)
+        self.assertEqual(stats['failed_batches'], stats['request_latency']['count'])
+        self.assertIn('400', stats['files'][0]['last_error'])
+
+    def test_server_closing_connections(self):
+        with StandInWriteServer(max_requests_per_connection=2) as server:
+            stats = self.run_files(server, [SYNTH_EXPORT], concurrency=1)
+        self.assertEqual(stats['failed_batches'], 0)
+        self.assertEqual(stats['pool']['connections_opened'], (stats['batches_written'] + 1) // 2)
+
+    def test_connection_refused(self):
+        server = StandInWriteServer().start()
+        url = server.url
+        server.stop()
+        pool = AsyncWritePool(url, org='o', bucket='b')
+        with self.assertRaises(WriteError) as ctx:
+            asyncio.run(pool.write(['m f=1i 1']))
+        self.assertTrue(ctx.exception.retryable)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Tests for resumable ingestion checkpoints (utils.ingest_checkpoint + ingest_influxdb --resume).
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add dashboard path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from utils.ingest_checkpoint import (
+    checkpoint_path, load_checkpoint, plan_resume, save_checkpoint
+)
+
+SYNTH_EXPORT = Path(__file__).parent / 'synth_export.jsonl'
+
+
+def read_lines():
+    with open(SYNTH_EXPORT) as f:
+        return [line for line in f if line.strip()]
+
+
+class TestIngestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.records = os.path.join(self.test_dir, 'records.jsonl')
+        self.checkpoint = checkpoint_path(self.records)
+        self.lines = read_lines()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def write(self, lines, mode='w'):
+        with open(self.records, mode) as f:
+            f.writelines(lines)
+
+    def ingest(self, write_batch=None, rewind_days=None, **kwargs):
+        import ingest_influxdb
+        batches = []
+        previous = load_checkpoint(self.checkpoint)
+        resume = plan_resume(self.records, previous, rewind_days=rewind_days)
+        resume['checkpoint'] = previous
+        if resume['mode'] == 'up_to_date':
+            return resume, [], None
+        stats = ingest_influxdb.ingest_records_streaming(
+            write_batch or batches.append, self.records, batch_points=6,
+            max_retries=kwargs.pop('max_retries', 0), backoff_base=0,
+            checkpoint_file=self.checkpoint, resume=resume, encoder='fast', **kwargs)
+        dates = sorted({line.rsplit(' ', 1)[1] for batch in batches for line in batch})
+        return resume, dates, stats
+
+    def test_first_run_is_full_and_saves_checkpoint(self):
+        self.write(self.lines[:10])
+        resume, dates, stats = self.ingest()
+        self.assertEqual(resume['mode'], 'full')
+        self.assertEqual(len(dates), 10)
+        checkpoint = load_checkpoint(self.checkpoint)
+        self.assertEqual(checkpoint['offset'], os.path.getsize(self.records))
+        self.assertEqual(checkpoint['last_date'], json.loads(self.lines[9])['date'])
+
+    def test_resume_sends_only_appended_records(self):
+        self.write(self.lines[:10])
+        self.ingest()
+        self.assertEqual(self.ingest()[0]['mode'], 'up_to_date')
+
+        self.write(self.lines[10:15], mode='a')
+        resume, dates, stats = self.ingest()
+        self.assertEqual(resume['mode'], 'resume')
+        self.assertEqual(stats['records_read'], 5)
+        self.assertEqual(len(dates), 5)
+        self.assertEqual(load_checkpoint(self.checkpoint)['offset'], os.path.getsize(self.records))
+
+    def test_truncation_falls_back_to_full(self):
+        self.write(self.lines[:10])
+        self.ingest()
+        self.write(self.lines[:5])
+        resume, dates, _ = self.ingest()
+        self.assertEqual(resume['mode'], 'full')
+        self.assertIn('truncated', resume['reason'])
+        self.assertEqual(len(dates), 5)
+
+    def test_atomic_rewrite_detected_by_inode(self):
+        self.write(self.lines[:10])
+        self.ingest()
+        replacement = self.records + '.tmp'
+        with open(replacement, 'w') as f:
+            f.writelines(self.lines[:12])
+        os.replace(replacement, self.records)
+        resume, dates, _ = self.ingest()
+        self.assertEqual(resume['mode'], 'full')
+        self.assertEqual(len(dates), 12)
+
+    def test_in_place_rewrite_detected_by_hash(self):
+        self.write(self.lines[:10])
+        self.ingest()
+        record = json.loads(self.lines[9])
+        record['score'] = 0 if record['score'] else 1
+        with open(self.records, 'r+') as f:
+            f.writelines(self.lines[:9])
+            f.write(json.dumps(record) + '\n')
+            f.writelines(self.lines[10:12])
+        resume, _, _ = self.ingest()
+        self.assertEqual(resume['mode'], 'full')
+        self.assertIn('rewritten', resume['reason'])
+
+    def test_rewind_days_window(self):
+        self.write(self.lines[:10])
+        self.ingest()
+        self.write(self.lines[:8])
+        resume, dates, stats = self.ingest(rewind_days=3)
+        self.assertEqual(resume['mode'], 'window')
+        last_date = json.loads(self.lines[9])['date']
+        self.assertLess(resume['min_date'], last_date)
+        self.assertEqual(stats['records_read'],
+                         sum(1 for line in self.lines[:8] if json.loads(line)['date'] >= resume['min_date']))
+
+    def test_failed_batch_does_not_advance_checkpoint(self):
+        self.write(self.lines[:5])
+        self.ingest()
+        before = load_checkpoint(self.checkpoint)['offset']
+        self.write(self.lines[5:10], mode='a')
+
+        def broken(batch):
+            raise ConnectionError("down")
+
+        _, _, stats = self.ingest(write_batch=broken)
+        self.assertGreater(stats['failed_batches'], 0)
+        self.assertIsNone(stats['checkpoint'])
+        self.assertEqual(load_checkpoint(self.checkpoint)['offset'], before)
+        resume, dates, _ = self.ingest()
+        self.assertEqual(resume['mode'], 'resume')
+        self.assertEqual(len(dates), 5)
+
+    def test_unterminated_last_line_not_checkpointed(self):
+        self.write(self.lines[:3] + [self.lines[3].rstrip('\n')])
+        _, dates, _ = self.ingest()
+        self.assertEqual(len(dates), 4)  # still ingested...
+        self.write(['\n'] + self.lines[4:6], mode='a')
+        resume, dates, _ = self.ingest()
+        self.assertEqual(resume['mode'], 'resume')  # ...but re-read once complete
+        self.assertEqual(len(dates), 3)
+
+    def test_invalid_checkpoint_ignored(self):
+        with open(self.checkpoint, 'w') as f:
+            f.write('{not json')
+        self.assertIsNone(load_checkpoint(self.checkpoint))
+        save_checkpoint(self.checkpoint, {'offset': 1})
+        self.assertEqual(load_checkpoint(self.checkpoint)['offset'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
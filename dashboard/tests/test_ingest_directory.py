@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for directory/glob ingestion in ingest_influxdb.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add dashboard path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+SYNTH_EXPORT = Path(__file__).parent / 'synth_export.jsonl'
+POINTS_PER_FILE = 30 * 6
+
+
+class TestDirectoryIngest(unittest.TestCase):
+
+    def setUp(self):
+        import ingest_influxdb
+        self.ingest = ingest_influxdb
+        self.test_dir = tempfile.mkdtemp()
+        for name in ('user_a.jsonl', 'user_b.jsonl', 'user_c.jsonl'):
+            shutil.copy(SYNTH_EXPORT, os.path.join(self.test_dir, name))
+        with open(os.path.join(self.test_dir, 'notes.txt'), 'w') as f:
+            f.write('not records\n')
+        self.lock = threading.Lock()
+        self.lines = []
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def write_batch(self, lines):
+        with self.lock:
+            self.lines.extend(lines)
+
+    def run_dir(self, write_batch=None, **kwargs):
+        paths = self.ingest.discover_record_files(self.test_dir)
+        return self.ingest.ingest_files_parallel(write_batch or self.write_batch, paths, workers=3,
+                                                 batch_points=50, max_retries=0, backoff_base=0,
+                                                 encoder='fast', **kwargs)
+
+    def test_discovery(self):
+        names = [p.name for p in self.ingest.discover_record_files(self.test_dir)]
+        self.assertEqual(names, ['user_a.jsonl', 'user_b.jsonl', 'user_c.jsonl'])
+        names = [p.name for p in self.ingest.discover_record_files(os.path.join(self.test_dir, 'user_[ab]*'))]
+        self.assertEqual(names, ['user_a.jsonl', 'user_b.jsonl'])
+        os.symlink(os.path.join(self.test_dir, 'user_a.jsonl'), os.path.join(self.test_dir, 'alias.jsonl'))
+        self.assertEqual(len(self.ingest.discover_record_files(self.test_dir)), 3)
+        self.assertTrue(self.ingest.is_multi_file_target(self.test_dir))
+        self.assertFalse(self.ingest.is_multi_file_target(str(SYNTH_EXPORT)))
+
+    def test_non_daily_files_skipped(self):
+        others = {
+            'telemetry_20250801.jsonl': {'date': '2025-08-01', 'timestamp_utc': '2025-08-01T06:00:00',
+                                         'score': 70, 'band': 'Maintain', 'metrics_mask': 15},
+            'plan_daily.jsonl': {'date': '2025-08-01', 'plan_text': 'Go'},
+            'empty.jsonl': None,
+        }
+        for name, record in others.items():
+            with open(os.path.join(self.test_dir, name), 'w') as f:
+                if record is not None:
+                    f.write(json.dumps(record) + '\n')
+        with open(os.devnull, 'w') as devnull, mock.patch('sys.stderr', devnull):
+            names = [p.name for p in self.ingest.discover_record_files(self.test_dir)]
+            self.assertEqual(names, ['user_a.jsonl', 'user_b.jsonl', 'user_c.jsonl'])
+            summary = self.run_dir()
+        self.assertEqual((summary['files_total'], summary['failed_files']), (3, []))
+        for name in others:
+            self.assertFalse(os.path.exists(os.path.join(self.test_dir, name + '.ingest-checkpoint.json')))
+        self.assertTrue(self.ingest.is_daily_record_file(str(SYNTH_EXPORT)))
+
+    def test_all_files_ingested_then_skipped(self):
+        summary = self.run_dir()
+        self.assertEqual(summary['files_total'], 3)
+        self.assertEqual(summary['failed_files'], [])
+        self.assertEqual(summary['items_written'], 3 * POINTS_PER_FILE)
+        self.assertEqual(len(self.lines), 3 * POINTS_PER_FILE)
+
+        with open(os.path.join(self.test_dir, 'user_b.jsonl'), 'a') as f:
+            with open(SYNTH_EXPORT) as src:
+                f.write(src.readline())
+        self.lines = []
+        summary = self.run_dir()
+        self.assertEqual(summary['files_skipped'], 2)
+        self.assertEqual(summary['records_read'], 1)
+        self.assertEqual(len(self.lines), 6)
+
+    def test_only_failed_files_reported(self):
+        bad = os.path.join(self.test_dir, 'user_b.jsonl')
+        with open(bad) as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        with open(bad, 'w') as f:
+            f.writelines(json.dumps(dict(r, band='Failing')) + '\n' for r in records)
+
+        def flaky_write(lines):
+            if any('band=Failing' in line for line in lines):
+                raise ConnectionError("write refused")
+            self.write_batch(lines)
+
+        summary = self.run_dir(write_batch=flaky_write)
+        self.assertEqual([os.path.basename(f['file']) for f in summary['failed_files']], ['user_b.jsonl'])
+        self.assertIn('write refused', summary['failed_files'][0]['error'])
+        self.assertEqual(summary['items_written'], 2 * POINTS_PER_FILE)
+
+        # The failed file is retried on the next run; the others are up to date
+        summary = self.run_dir()
+        self.assertEqual(summary['files_skipped'], 2)
+        self.assertEqual(summary['failed_files'], [])
+        self.assertEqual(summary['items_written'], POINTS_PER_FILE)
+
+    def test_global_rate_limit(self):
+        summary = self.run_dir(points_per_sec=400)
+        self.assertEqual(summary['items_written'], 3 * POINTS_PER_FILE)
+        self.assertEqual(summary['rate_limiter']['acquired'], 3 * POINTS_PER_FILE)
+        # 540 points with a 400-point burst: the last 140 wait ~0.35s
+        self.assertGreater(summary['rate_limiter']['wait_s'], 0.2)
+        self.assertLess(summary['items_per_sec'], 3 * POINTS_PER_FILE / 0.3)
+
+if __name__ == '__main__':
+    unittest.main()
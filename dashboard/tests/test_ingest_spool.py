@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Tests for the on-disk ingestion spool and its use by ingest_influxdb.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add dashboard path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from utils.ingest_spool import IngestSpool, STATE_FILE
+
+SYNTH_EXPORT = Path(__file__).parent / 'synth_export.jsonl'
+
+
+def batch(n, points=10):
+    return [f'm,batch={n} v={i}i {1700000000 + i}' for i in range(points)]
+
+
+class TestIngestSpool(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.spool_dir = os.path.join(self.test_dir, 'spool')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_fifo_append_and_drain(self):
+        spool = IngestSpool(self.spool_dir)
+        for n in range(5):
+            spool.append(batch(n))
+        depth = spool.stats()
+        self.assertEqual((depth['depth_batches'], depth['depth_points']), (5, 50))
+
+        written = []
+        result = spool.drain(written.append)
+        self.assertEqual(written, [batch(n) for n in range(5)])
+        self.assertEqual((result['batches'], result['points'], result['error']), (5, 50, None))
+        self.assertEqual(result['remaining']['depth_batches'], 0)
+        self.assertEqual(spool.segments(), [])
+
+    def test_failed_drain_keeps_batch(self):
+        spool = IngestSpool(self.spool_dir)
+        for n in range(3):
+            spool.append(batch(n))
+        calls = []
+
+        def flaky(lines):
+            calls.append(lines)
+            if len(calls) == 2:
+                raise ConnectionError("still down")
+
+        result = spool.drain(flaky)
+        self.assertEqual(result['batches'], 1)
+        self.assertIn('still down', result['error'])
+        self.assertEqual(result['remaining']['depth_batches'], 2)
+
+        spool.append(batch(3))  # appends continue behind the cursor
+        written = []
+        IngestSpool(self.spool_dir).drain(written.append)
+        self.assertEqual(written, [batch(1), batch(2), batch(3)])
+
+    def test_size_cap_evicts_oldest_segments(self):
+        frame_bytes = 20 + len('\n'.join(batch(0)).encode())
+        spool = IngestSpool(self.spool_dir, max_bytes=frame_bytes * 6, segment_bytes=frame_bytes * 2)
+        for n in range(10):
+            spool.append(batch(n))
+        depth = spool.stats()
+        self.assertLessEqual(depth['depth_bytes'], frame_bytes * 6)
+        self.assertEqual(depth['evicted_batches'], 10 - depth['depth_batches'])
+        self.assertEqual(depth['evicted_points'], 10 * (10 - depth['depth_batches']))
+        written = []
+        spool.drain(written.append)
+        self.assertEqual(written, [batch(n) for n in range(10 - depth['depth_batches'], 10)])
+
+    def test_torn_tail_repaired(self):
+        spool = IngestSpool(self.spool_dir)
+        spool.append(batch(0))
+        segment = os.path.join(self.spool_dir, spool.segments()[-1])
+        with open(segment, 'ab') as f:
+            f.write(b'\x99' * 30)  # crash mid-frame
+        self.assertEqual(spool.stats()['depth_batches'], 1)
+        spool.append(batch(1))
+        written = []
+        spool.drain(written.append)
+        self.assertEqual(written, [batch(0), batch(1)])
+
+    def test_lost_state_does_not_reuse_segments(self):
+        spool = IngestSpool(self.spool_dir, segment_bytes=1)
+        spool.append(batch(0))
+        spool.append(batch(1))
+        os.unlink(os.path.join(self.spool_dir, STATE_FILE))
+        spool.append(batch(2))
+        self.assertEqual(len(spool.segments()), 3)
+        written = []
+        spool.drain(written.append)
+        self.assertEqual(written, [batch(0), batch(1), batch(2)])
+
+    def test_drain_rate_limited(self):
+        spool = IngestSpool(self.spool_dir)
+        for n in range(12):
+            spool.append(batch(n, points=100))
+        result = spool.drain(lambda lines: None, points_per_sec=1000)
+        self.assertEqual(result['points'], 1200)
+        self.assertGreaterEqual(result['elapsed_s'], 0.15)  # 200 points over the 1000-point burst
+
+
+class TestStreamingSpool(unittest.TestCase):
+
+    def setUp(self):
+        import ingest_influxdb
+        self.ingest = ingest_influxdb
+        self.test_dir = tempfile.mkdtemp()
+        self.records = os.path.join(self.test_dir, 'records.jsonl')
+        shutil.copy(SYNTH_EXPORT, self.records)
+        self.spool = IngestSpool(os.path.join(self.test_dir, 'spool'))
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_failed_batches_spooled_and_checkpoint_advances(self):
+        from utils.ingest_checkpoint import checkpoint_path, load_checkpoint
+
+        def down(lines):
+            raise ConnectionError("influx down")
+
+        checkpoint_file = checkpoint_path(self.records)
+        stats = self.ingest.ingest_records_streaming(
+            down, self.records, batch_points=50, max_retries=0, backoff_base=0, encoder='fast',
+            checkpoint_file=checkpoint_file, spool=self.spool)
+        self.assertEqual(stats['spooled_batches'], stats['failed_batches'])
+        self.assertEqual(stats['spooled_points'], 30 * 6)
+        self.assertEqual(load_checkpoint(checkpoint_file)['offset'], os.path.getsize(self.records))
+
+        delivered = []
+        self.spool.drain(delivered.extend)
+        expected = []
+        self.ingest.ingest_records_streaming(expected.extend, self.records, encoder='fast')
+        self.assertEqual(delivered, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for the date-indexed JSONL sidecar.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+
+# Add dashboard path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.file_utils import atomic_write_jsonl, durable_append_jsonl
+from utils.jsonl_index import (
+    build_index, update_index, read_range, date_bounds, index_paths, indexed_dates, _load_meta
+)
+from scripts.phase3.retention_policy import RetentionManager
+
+
+class TestJsonlIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'history.jsonl')
+        start = date(2025, 1, 1)
+        self.records = [{'date': (start + timedelta(days=i)).isoformat(), 'n': i} for i in range(60)]
+        atomic_write_jsonl(self.records, self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def scan(self, start=None, end=None):
+        """Reference: full-file scan filter."""
+        with open(self.path) as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        return [r for r in rows if 'date' in r and (start is None or r['date'] >= start)
+                and (end is None or r['date'] <= end)]
+
+    def test_range_matches_full_scan(self):
+        for start, end in [('2025-01-10', '2025-01-20'), (None, '2025-01-05'),
+                           ('2025-02-25', None), ('2026-01-01', None), (None, None)]:
+            with self.subTest(start=start, end=end):
+                self.assertEqual(read_range(self.path, start, end), self.scan(start, end))
+
+    def test_missing_index_built_transparently(self):
+        entries_path, meta_path = index_paths(self.path)
+        self.assertFalse(os.path.exists(meta_path))
+        read_range(self.path, '2025-01-01', '2025-01-01')
+        self.assertTrue(os.path.exists(entries_path))
+        self.assertEqual(_load_meta(meta_path)['count'], 60)
+
+    def test_append_updates_index_incrementally(self):
+        build_index(self.path)
+        durable_append_jsonl([{'date': '2025-03-05', 'n': 'new'}], self.path)
+        meta = _load_meta(index_paths(self.path)[1])
+        self.assertEqual(meta['count'], 61)
+        self.assertEqual(meta['size'], os.path.getsize(self.path))
+        self.assertEqual(read_range(self.path, '2025-03-05', '2025-03-05'), [{'date': '2025-03-05', 'n': 'new'}])
+
+    def test_out_of_order_append(self):
+        build_index(self.path)
+        durable_append_jsonl([{'date': '2025-01-15', 'n': 'late'}], self.path)
+        rows = read_range(self.path, '2025-01-15', '2025-01-15')
+        self.assertEqual([r['n'] for r in rows], [14, 'late'])
+
+    def test_rewrite_triggers_rebuild(self):
+        build_index(self.path)
+        atomic_write_jsonl(self.records[:10], self.path)
+        self.assertEqual(len(read_range(self.path)), 10)
+        self.assertEqual(date_bounds(self.path), ('2025-01-01', '2025-01-10'))
+
+    def test_torn_tail_not_indexed(self):
+        with open(self.path, 'a') as f:
+            f.write('{"date": "2025-03-0')
+        index = update_index(self.path)
+        self.assertEqual(len(index), 60)
+
+    def test_lines_without_dates_skipped(self):
+        with open(self.path, 'a') as f:
+            f.write(json.dumps({'raw': 'no date'}) + '\n')
+            f.write('not json\n')
+        self.assertEqual(len(read_range(self.path)), 60)
+
+    def test_indexed_dates_distinct_in_range(self):
+        durable_append_jsonl([{'date': '2025-01-15', 'n': 'dup'}], self.path)
+        self.assertEqual(indexed_dates(self.path, '2025-01-14', '2025-01-16'),
+                         ['2025-01-14', '2025-01-15', '2025-01-16'])
+        self.assertEqual(len(indexed_dates(self.path)), 60)
+        self.assertEqual(indexed_dates(os.path.join(self.temp_dir, 'missing.jsonl')), [])
+
+    def test_unwritable_sidecar_falls_back_to_scan(self):
+        build_index(self.path)
+        with open(self.path, 'a') as f:
+            f.write(json.dumps({'date': '2025-03-02', 'n': 60}) + '\n')  # index now stale
+        real_open, real_unlink = open, os.unlink
+        denied = PermissionError(13, 'Permission denied')
+
+        def read_only_open(path, mode='r', *args, **kwargs):
+            if str(path).startswith(self.path + '.idx') and any(c in mode for c in 'wa+'):
+                raise denied
+            return real_open(path, mode, *args, **kwargs)
+
+        def read_only_unlink(path, *args, **kwargs):
+            if str(path).startswith(self.path + '.idx'):
+                raise denied
+            return real_unlink(path, *args, **kwargs)
+
+        with mock.patch('builtins.open', read_only_open), mock.patch('os.unlink', read_only_unlink), \
+                mock.patch('tempfile.mkstemp', side_effect=denied):
+            self.assertEqual(read_range(self.path, '2025-02-27'), self.scan('2025-02-27'))
+            self.assertEqual(date_bounds(self.path), ('2025-01-01', '2025-03-02'))
+            self.assertEqual(len(indexed_dates(self.path)), 61)
+        self.assertEqual(_load_meta(index_paths(self.path)[1])['count'], 60)  # sidecar left as it was
+
+    def test_retention_date_range_uses_index(self):
+        oldest, newest = RetentionManager(30).get_jsonl_date_range(self.path)
+        self.assertEqual(oldest.date(), date(2025, 1, 1))
+        self.assertEqual(newest.date(), date(2025, 3, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for the group-commit JsonlWriter.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+
+# Add dashboard path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.jsonl_writer import JsonlWriter, LatencyHistogram
+
+
+class TestJsonlWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def read(self, path):
+        with open(path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def test_concurrent_producers_coalesced(self):
+        paths = [os.path.join(self.temp_dir, f'file_{i}.jsonl') for i in range(2)]
+        producers, per_producer = 8, 25
+
+        with JsonlWriter(max_batch_records=1000, max_delay_ms=50) as writer:
+            def produce(pid):
+                for n in range(per_producer):
+                    writer.write(paths[n % 2], [{'producer': pid, 'n': n}])
+
+            threads = [threading.Thread(target=produce, args=(p,)) for p in range(producers)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        total = sum(len(self.read(p)) for p in paths)
+        self.assertEqual(total, producers * per_producer)
+
+        stats = writer.stats()
+        self.assertEqual(stats['records_committed'], producers * per_producer)
+        self.assertEqual(stats['commit_latency']['count'], producers * per_producer)
+        # Concurrent writes share fsyncs
+        self.assertLess(stats['file_commits'], producers * per_producer)
+
+    def test_order_preserved_per_file(self):
+        path = os.path.join(self.temp_dir, 'ordered.jsonl')
+        with JsonlWriter(max_batch_records=3, max_delay_ms=5) as writer:
+            futures = [writer.submit(path, [{'n': n}]) for n in range(20)]
+            for future in futures:
+                future.result(timeout=5)
+        self.assertEqual([r['n'] for r in self.read(path)], list(range(20)))
+
+    def test_flush_and_close_drain(self):
+        path = os.path.join(self.temp_dir, 'drain.jsonl')
+        writer = JsonlWriter(max_batch_records=10000, max_delay_ms=10000).start()
+        writer.submit(path, [{'n': 1}])
+        writer.flush(timeout=5)
+        self.assertEqual(len(self.read(path)), 1)
+
+        writer.submit(path, [{'n': 2}])
+        writer.close()
+        self.assertEqual(len(self.read(path)), 2)
+        with self.assertRaises(RuntimeError):
+            writer.submit(path, [{'n': 3}])
+
+    def test_error_propagates(self):
+        bad_path = os.path.join(self.temp_dir, 'missing_dir', 'file.jsonl')
+        with JsonlWriter(max_delay_ms=0) as writer:
+            self.assertFalse(writer.write(bad_path, [{'n': 1}]))
+        self.assertEqual(writer.stats()['errors'], 1)
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_percentiles(self):
+        hist = LatencyHistogram()
+        for _ in range(90):
+            hist.observe(0.5)
+        for _ in range(10):
+            hist.observe(40)
+        self.assertEqual(hist.percentile(50), 1.0)
+        self.assertEqual(hist.percentile(95), 50.0)
+        summary = hist.to_dict()
+        self.assertEqual(summary['count'], 100)
+        self.assertEqual(summary['buckets']['le_1ms'], 90)
+
+    def test_empty(self):
+        self.assertEqual(LatencyHistogram().percentile(99), 0.0)
+
+    def test_importable_as_package_from_repo_root(self):
+        repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        modules = ['dashboard.utils.jsonl_writer', 'dashboard.utils.batch_pipeline',
+                   'dashboard.utils.influx_async']
+        result = subprocess.run([sys.executable, '-c', '; '.join(f'import {m}' for m in modules)],
+                                cwd=repo_root, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
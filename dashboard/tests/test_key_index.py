@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent duplicate-guard key index.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Add dashboard path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.file_utils import atomic_write_jsonl, durable_append_jsonl
+from utils.bloom_filter import BloomFilter
+from utils.key_index import KeyIndex, open_key_index, key_index_path, bloom_path
+from scripts.duplicate_guard import (
+    filter_duplicates, append_unique_records, rebuild_key_index, load_existing_records
+)
+
+
+class TestKeyIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'wellness.jsonl')
+        atomic_write_jsonl([
+            {'date': f'2025-08-{d:02d}', 'schema_version': 'v2.0.0'} for d in range(1, 11)
+        ], self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_matches_full_scan(self):
+        with open_key_index(self.path) as index:
+            self.assertEqual(len(index), len(load_existing_records(self.path)))
+            self.assertIn(('2025-08-05', '2.0.0'), index)
+            self.assertNotIn(('2025-08-05', '3.0.0'), index)
+            # Normalization applies to lookups too
+            self.assertTrue(index.contains_record({'date': '2025-08-05', 'schema_version': '2.0'}))
+
+    def test_append_syncs_incrementally(self):
+        open_key_index(self.path).close()
+        durable_append_jsonl([{'date': '2025-08-11', 'schema_version': 'v2.0.0'}], self.path)
+        with KeyIndex(self.path) as index:
+            self.assertEqual(index.sync(), 0)  # already synced by the append hook
+            self.assertIn(('2025-08-11', '2.0.0'), index)
+
+        # Append outside the hook: only the new line is scanned
+        with open(self.path, 'a') as f:
+            f.write(json.dumps({'date': '2025-08-12'}) + '\n')
+        with KeyIndex(self.path) as index:
+            self.assertEqual(index.sync(), 1)
+            self.assertIn(('2025-08-12', '1.0.0'), index)
+
+    def test_rewrite_triggers_reindex(self):
+        open_key_index(self.path).close()
+        atomic_write_jsonl([{'date': '2025-09-01', 'schema_version': 'v2.0.0'}], self.path)
+        with open_key_index(self.path) as index:
+            self.assertEqual(len(index), 1)
+            self.assertNotIn(('2025-08-01', '2.0.0'), index)
+
+    def test_filter_and_append_use_index(self):
+        new = [
+            {'date': '2025-08-10', 'schema_version': '2.0.0'},   # existing
+            {'date': '2025-08-20', 'schema_version': 'v2.0.0'},
+            {'date': '2025-08-20', 'schema_version': '2.0'},     # within-batch dup
+        ]
+        unique = filter_duplicates(new, self.path)
+        self.assertEqual([r['date'] for r in unique], ['2025-08-20'])
+        self.assertTrue(os.path.exists(key_index_path(self.path)))
+
+        source = os.path.join(self.temp_dir, 'source.jsonl')
+        atomic_write_jsonl(new, source)
+        self.assertEqual(append_unique_records(source, self.path), 1)
+        self.assertEqual(append_unique_records(source, self.path), 0)
+
+    def test_rebuild_index(self):
+        open_key_index(self.path).close()
+        # Corrupt the sidecar's contents
+        with KeyIndex(self.path) as index:
+            with index._conn:
+                index._conn.execute("DELETE FROM keys")
+        self.assertTrue(rebuild_key_index(self.path))
+        with KeyIndex(self.path) as index:
+            self.assertEqual(len(index), 10)
+        self.assertFalse(rebuild_key_index(os.path.join(self.temp_dir, 'missing.jsonl')))
+
+
+class TestBloomFilter(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_sizing_and_fp_rate(self):
+        bloom = BloomFilter(10000, 0.01)
+        self.assertEqual(bloom.num_hashes, 7)
+        self.assertAlmostEqual(bloom.num_bits / 10000, 9.59, places=1)
+        for i in range(10000):
+            bloom.add(f'key-{i}')
+        self.assertTrue(all(f'key-{i}' in bloom for i in range(10000)))  # no false negatives
+        false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+        self.assertLess(false_positives / 10000, 0.02)
+        self.assertAlmostEqual(bloom.estimated_fp_rate(), 0.01, delta=0.002)
+
+    def test_roundtrip(self):
+        path = os.path.join(self.temp_dir, 'f.bloom')
+        bloom = BloomFilter(100, 0.05)
+        bloom.add('a')
+        bloom.tag = {'size': 10}
+        bloom.save(path)
+        loaded = BloomFilter.load(path)
+        self.assertIn('a', loaded)
+        self.assertEqual((loaded.count, loaded.tag), (1, {'size': 10}))
+        with open(path, 'wb') as f:
+            f.write(b'garbage')
+        self.assertIsNone(BloomFilter.load(path))
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            BloomFilter(0)
+        with self.assertRaises(ValueError):
+            BloomFilter(10, 1.5)
+
+    def test_fast_path_skips_exact_lookups(self):
+        path = os.path.join(self.temp_dir, 'wellness.jsonl')
+        atomic_write_jsonl([{'date': f'2024-{m:02d}-{d:02d}'} for m in range(1, 13) for d in range(1, 29)], path)
+        new = [{'date': f'2025-{m:02d}-{d:02d}'} for m in range(1, 13) for d in range(1, 29)]
+
+        filter_duplicates(new, path)  # builds and persists index + filter
+        self.assertTrue(os.path.exists(bloom_path(path)))
+        with open_key_index(path) as index:
+            for record in new:
+                index.contains_record(record)
+            stats = index.stats()
+        self.assertEqual(stats['lookups'], len(new))
+        self.assertLess(stats['exact_lookups'], len(new) * 0.05)
+        self.assertEqual(stats['bloom']['count'], 12 * 28)
+
+    def test_stale_filter_rebuilt_from_keys(self):
+        path = os.path.join(self.temp_dir, 'wellness.jsonl')
+        atomic_write_jsonl([{'date': '2025-08-01'}], path)
+        open_key_index(path).close()
+        atomic_write_jsonl([{'date': '2025-09-01'}], path)  # rewrite
+        with open_key_index(path) as index:
+            self.assertIn(('2025-09-01', '1.0.0'), index)
+            self.assertNotIn(('2025-08-01', '1.0.0'), index)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Golden tests: direct line-protocol encoder vs influxdb_client Point path.
+"""
+
+import json
+import os
+import sys
+import unittest
+from pathlib import Path
+
+# Add dashboard path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from utils.line_protocol import DailyRecordEncoder, format_field_value
+
+TESTS_DIR = Path(__file__).parent
+
+
+def point_bytes(record):
+    import ingest_influxdb
+    return '\n'.join(p.to_line_protocol() for p in ingest_influxdb.create_record_points(record)).encode('utf-8')
+
+
+def base_record(**overrides):
+    record = {
+        "date": "2025-08-10", "score": 88, "band": "Go for it",
+        "metrics_raw": {"steps": 12000, "rhr": 48, "sleep_h": 7, "stress": 35},
+        "weights_active": {"steps": 0.4, "rhr": 0.3, "sleep": 0.2, "stress": 0.1},
+        "contrib": {"steps": 0.4, "rhr": 0.24, "sleep": 0.175, "stress": 0.065},
+        "missing": [], "formula_version": "1.0.0", "run_mode": "batch", "error_codes": [],
+    }
+    record.update(overrides)
+    return record
+
+
+class TestLineProtocolGolden(unittest.TestCase):
+
+    def assert_identical(self, record):
+        self.assertEqual(DailyRecordEncoder().encode_bytes(record), point_bytes(record))
+
+    def test_fixture_files_byte_identical(self):
+        encoder = DailyRecordEncoder()  # shared: exercises the prefix/timestamp caches
+        for name in ('synth_export.jsonl', 'sample_daily_records.jsonl'):
+            with open(TESTS_DIR / name) as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        with self.subTest(file=name, date=record['date']):
+                            self.assertEqual(encoder.encode_bytes(record), point_bytes(record))
+
+    def test_escaping(self):
+        cases = [
+            base_record(band='Take it easy'),
+            base_record(band='a,b=c d'),
+            base_record(formula_version='1.0 beta,x=y'),
+            base_record(run_mode='ends\\'),
+            base_record(run_mode='tab\there\nnew'),
+            base_record(contrib={'sleep h': 0.1, 'a=b': 0.2, 'c,d': 0.3}),
+            base_record(score='quoted "text" \\ slash'),
+        ]
+        for record in cases:
+            with self.subTest(record=record):
+                self.assert_identical(record)
+
+    def test_field_types_and_drops(self):
+        cases = [
+            base_record(score=71.0),
+            base_record(score=71.25),
+            base_record(score=True),
+            base_record(score=None),
+            base_record(score=1e21),
+            base_record(contrib={'steps': float('nan'), 'rhr': 0.1}),
+            base_record(run_mode=''),
+            base_record(missing=['sleep', 'stress'], error_codes=['E1']),
+            base_record(metrics_raw={}),
+            base_record(date='2025-08-10T06:30:00'),
+        ]
+        for record in cases:
+            with self.subTest(record=record):
+                self.assert_identical(record)
+
+    def test_missing_fields_raise_like_point_path(self):
+        record = base_record()
+        del record['band']
+        with self.assertRaises(KeyError):
+            DailyRecordEncoder().encode(record)
+
+    def test_unsupported_value(self):
+        with self.assertRaises(ValueError):
+            format_field_value([1, 2])
+
+
+class TestEncoderSelection(unittest.TestCase):
+
+    def test_streaming_encoders_agree(self):
+        import ingest_influxdb
+        outputs = {}
+        for encoder in ingest_influxdb.ENCODERS:
+            batches = []
+            ingest_influxdb.ingest_records_streaming(batches.append, TESTS_DIR / 'synth_export.jsonl',
+                                                     encoder=encoder)
+            outputs[encoder] = [line for batch in batches for line in batch]
+        self.assertEqual(outputs['fast'], outputs['point'])
+
+    def test_unknown_encoder(self):
+        import ingest_influxdb
+        with self.assertRaises(ValueError):
+            ingest_influxdb.record_line_encoder('bogus')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for the ops metrics exporter's JSONL readers.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+# Add repo root for dashboard.* imports (as the exporter itself uses)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from dashboard.scripts.ops.metrics_exporter import MetricsCollector
+from dashboard.scripts.phase3.segment_compactor import compact_telemetry
+
+
+class TestMetricsExporter(unittest.TestCase):
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.collector = MetricsCollector(self.data_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def write_jsonl(self, name, records):
+        with open(os.path.join(self.data_dir, name), 'w') as f:
+            for record in records:
+                f.write(json.dumps(record) + '\n')
+
+    def test_plan_metrics_single_pass(self):
+        self.write_jsonl('plan_daily.jsonl', [
+            {'date': '2025-08-01', 'plan_text': 'Go'},
+            {'date': '2025-08-02', 'plan_text': 'Conservative day'},
+            {'date': '2025-08-03', 'plan_text': 'Go'},
+        ])
+        self.write_jsonl('adherence_daily.jsonl', [
+            {'date': '2025-08-01', 'adherence_pct': 80, 'energy_rating': 3},
+            {'date': '2025-08-02', 'adherence_pct': 60, 'energy_rating': 5},
+        ])
+        metrics = self.collector.collect_plan_metrics()
+        self.assertEqual(metrics['status'], 'ok')
+        self.assertEqual((metrics['plans_generated'], metrics['plans_skipped_missing_data']), (3, 1))
+        self.assertEqual(metrics['latest_plan_date'], '2025-08-03')
+        self.assertEqual(metrics['latest_adherence_date'], '2025-08-02')
+        self.assertEqual((metrics['avg_adherence_pct'], metrics['avg_energy_rating']), (70.0, 4.0))
+
+    def test_plan_metrics_without_files(self):
+        metrics = self.collector.collect_plan_metrics()
+        self.assertEqual((metrics['plans_generated'], metrics['latest_plan_date']), (0, None))
+
+    def write_telemetry_shards(self, days=10, window=3):
+        """One shard per fetch day, each re-recording the last `window` days."""
+        today = datetime.now().date()
+        for back in range(days - 1, -1, -1):
+            fetch_day = today - timedelta(days=back)
+            records = []
+            for offset in range(window - 1, -1, -1):
+                day = fetch_day - timedelta(days=offset)
+                records.append({'date': day.isoformat(), 'timestamp_utc': f"{fetch_day.isoformat()}T06:00:00",
+                                'score': 70, 'band': 'Maintain', 'metrics_mask': 15,
+                                'auto_run': 1 if day.day % 2 else 0})
+            self.write_jsonl(f"telemetry_{fetch_day.strftime('%Y%m%d')}.jsonl", records)
+
+    def test_history_still_counted_after_compaction(self):
+        self.write_telemetry_shards(days=10, window=3)
+        before_integrity = self.collector.collect_integrity_metrics()
+        before_auto_run = self.collector.collect_auto_run_metrics()
+        self.assertEqual(before_integrity['records_checked'], 12)  # 10 fetch days + 2 earlier, once each
+        self.assertEqual(before_auto_run['total_distinct_days'], 12)
+
+        summary = compact_telemetry(self.data_dir, min_age_days=1)
+        self.assertEqual(summary['shards_merged'], 9)
+        remaining = [n for n in os.listdir(self.data_dir) if n.startswith('telemetry_')]
+        self.assertEqual(len(remaining), 1)  # today's shard
+
+        after = MetricsCollector(self.data_dir)
+        after_integrity = after.collect_integrity_metrics()
+        after_auto_run = after.collect_auto_run_metrics()
+        for key in ('records_checked', 'failed_records', 'failure_rate_14d_pct'):
+            self.assertEqual(after_integrity[key], before_integrity[key], key)
+        for key in ('success_rate_pct', 'distinct_days_with_auto', 'total_distinct_days'):
+            self.assertEqual(after_auto_run[key], before_auto_run[key], key)
+
+    def test_latest_record_per_date_wins(self):
+        self.write_telemetry_shards(days=3, window=3)
+        compact_telemetry(self.data_dir, min_age_days=1)
+        records = self.collector.load_telemetry_history(30)
+        self.assertEqual(len(records), 5)
+        today = datetime.now().date()
+        newest = {r['date']: r['timestamp_utc'][:10] for r in records}
+        yesterday = (today - timedelta(days=1)).isoformat()
+        self.assertEqual(newest[yesterday], today.isoformat())
+
+
+if __name__ == '__main__':
+    unittest.main()
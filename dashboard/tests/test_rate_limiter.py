@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for the token bucket rate limiter.
+"""
+
+import os
+import sys
+import threading
+import unittest
+
+# Add dashboard path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.rate_limiter import TokenBucket
+
+
+class FakeClock:
+    """Deterministic clock; sleep() advances time."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def make(self, rate, burst=None):
+        clock = FakeClock()
+        return TokenBucket(rate, burst, clock=clock, sleep=clock.sleep), clock
+
+    def test_burst_then_rate(self):
+        bucket, clock = self.make(10, burst=5)
+        for _ in range(5):
+            self.assertEqual(bucket.acquire(), 0.0)
+        self.assertFalse(bucket.try_acquire())
+        bucket.acquire(10)
+        self.assertAlmostEqual(clock.now, 1.0 / 10 * 5)  # wait for a full bucket
+        bucket.acquire(1)
+        self.assertAlmostEqual(clock.now, 0.5 + 0.6)  # repaid the 5-token debt first
+
+    def test_long_run_rate_holds(self):
+        bucket, clock = self.make(1000)
+        for _ in range(100):
+            bucket.acquire(500)
+        self.assertAlmostEqual(clock.now, (100 * 500 - 1000) / 1000, places=6)
+        self.assertEqual(bucket.stats()['acquired'], 50000)
+
+    def test_thread_safe(self):
+        bucket = TokenBucket(1e9)
+        threads = [threading.Thread(target=lambda: [bucket.acquire() for _ in range(1000)]) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(bucket.stats()['acquired'], 4000)
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
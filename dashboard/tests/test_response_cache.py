@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Tests for the Garmin response cache and its use by GarminWellnessFetcher.
+"""
+
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+# Add dashboard and scripts paths for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from utils.response_cache import ResponseCache, account_key
+from fetch_garmin_data import CACHE_TTLS, ENDPOINTS, GarminWellnessFetcher
+from tests.test_garmin_fetch import FakeGarmin
+
+NOW = datetime(2025, 8, 20, 12, 0).timestamp()
+
+
+class Clock:
+    def __init__(self, now=NOW):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.test_dir, 'cache')
+        self.clock = Clock()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def make_cache(self, **kwargs):
+        kwargs.setdefault('ttls', {'steps': (600, None), 'sleep': (600, 86400)})
+        return ResponseCache(self.cache_dir, clock=self.clock, **kwargs)
+
+    def test_round_trip_and_counters(self):
+        with self.make_cache() as cache:
+            self.assertEqual(cache.get('steps', '2025-08-01', 'a'), (False, None))
+            cache.put('steps', '2025-08-01', 'a', [{'steps': 1234}])
+            cache.put('steps', '2025-08-02', 'a', [])
+            self.assertEqual(cache.get('steps', '2025-08-01', 'a'), (True, [{'steps': 1234}]))
+            self.assertEqual(cache.get('steps', '2025-08-02', 'a'), (True, []))
+            self.assertEqual(cache.get('steps', '2025-08-01', 'b'), (False, None))
+            self.assertEqual(cache.get('sleep', '2025-08-01', 'a'), (False, None))
+            stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['stores'], stats['entries']), (2, 3, 2, 2))
+        self.assertEqual(stats['hit_rate'], 0.4)
+
+    def test_private_permissions_and_no_login_stored(self):
+        with self.make_cache() as cache:
+            cache.put('steps', '2025-08-01', account_key('User@Example.com'), [])
+        self.assertEqual(stat.S_IMODE(os.stat(self.cache_dir).st_mode), 0o700)
+        self.assertEqual(stat.S_IMODE(os.stat(cache.db_path).st_mode), 0o600)
+        with open(cache.db_path, 'rb') as f:
+            self.assertNotIn(b'example.com', f.read().lower())
+        self.assertEqual(account_key('User@Example.com'), account_key(' user@example.com'))
+
+    def test_recent_days_expire_settled_days_do_not(self):
+        with self.make_cache() as cache:
+            for day in ('2025-08-20', '2025-08-19', '2025-08-18'):
+                cache.put('steps', day, 'a', [{'steps': 1}])
+            self.clock.now += 601
+            self.assertFalse(cache.get('steps', '2025-08-20', 'a')[0])
+            self.assertFalse(cache.get('steps', '2025-08-19', 'a')[0])
+            self.assertTrue(cache.get('steps', '2025-08-18', 'a')[0])
+            self.clock.now += 365 * 86400
+            self.assertTrue(cache.get('steps', '2025-08-18', 'a')[0])
+            self.assertEqual(cache.stats()['expired'], 2)
+
+    def test_ttl_fixed_at_fetch_time(self):
+        with self.make_cache() as cache:
+            cache.put('steps', '2025-08-19', 'a', [{'steps': 1}])  # yesterday: partial
+            self.clock.now += 3 * 86400  # the day is settled now, the entry is not
+            self.assertFalse(cache.get('steps', '2025-08-19', 'a')[0])
+            cache.put('steps', '2025-08-19', 'a', [{'steps': 2}])
+            self.clock.now += 30 * 86400
+            self.assertEqual(cache.get('steps', '2025-08-19', 'a'), (True, [{'steps': 2}]))
+
+    def test_empty_bodies_for_old_days_expire_like_recent_ones(self):
+        with self.make_cache() as cache:
+            for n, body in enumerate(([], {}, None)):
+                cache.put('steps', f'2025-08-0{n + 1}', 'a', body)
+            cache.put('steps', '2025-08-05', 'a', [{'steps': 1}])
+            self.assertTrue(cache.get('steps', '2025-08-01', 'a')[0])
+            self.clock.now += 601  # watch synced late: empty days are fetched again
+            for n in range(3):
+                self.assertFalse(cache.get('steps', f'2025-08-0{n + 1}', 'a')[0])
+            self.assertTrue(cache.get('steps', '2025-08-05', 'a')[0])
+
+    def test_per_endpoint_settled_ttl(self):
+        with self.make_cache() as cache:
+            cache.put('sleep', '2025-08-01', 'a', {})
+            self.clock.now += 86401
+            self.assertFalse(cache.get('sleep', '2025-08-01', 'a')[0])
+
+    def test_lru_eviction_by_size(self):
+        body = {'x': 'y' * 90}  # ~100 bytes
+        with self.make_cache(max_bytes=350) as cache:
+            for n in range(1, 4):
+                self.clock.now += 1
+                cache.put('steps', f'2025-08-0{n}', 'a', body)
+            self.clock.now += 1
+            self.assertTrue(cache.get('steps', '2025-08-01', 'a')[0])  # 02 is now least recent
+            self.clock.now += 1
+            cache.put('steps', '2025-08-04', 'a', body)
+            self.assertFalse(cache.get('steps', '2025-08-02', 'a')[0])
+            for day in ('2025-08-01', '2025-08-03', '2025-08-04'):
+                self.assertTrue(cache.get('steps', day, 'a')[0])
+            stats = cache.stats()
+        self.assertEqual(stats['evictions'], 1)
+        self.assertLessEqual(stats['bytes'], 350)
+
+    def test_persists_across_instances(self):
+        with self.make_cache() as cache:
+            cache.put('steps', '2025-08-01', 'a', [{'steps': 9}])
+        with self.make_cache() as cache:
+            self.assertEqual(cache.get('steps', '2025-08-01', 'a'), (True, [{'steps': 9}]))
+
+
+class TestFetcherCache(unittest.TestCase):
+
+    start = datetime(2025, 8, 1)
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache = ResponseCache(self.test_dir, ttls=CACHE_TTLS)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def make_fetcher(self, client, concurrency=1):
+        fetcher = GarminWellnessFetcher('user@example.com', 'secret', concurrency=concurrency,
+                                        requests_per_sec=0, cache=self.cache)
+        fetcher.client = client
+        return fetcher
+
+    def test_repeat_and_overlapping_fetch_hit_cache(self):
+        client = FakeGarmin(delay=0)
+        first = self.make_fetcher(client, concurrency=4).fetch_date_range(self.start, self.start + timedelta(days=9))
+        self.assertEqual(len(client.calls), 10 * len(ENDPOINTS))
+
+        client = FakeGarmin(delay=0)
+        fetcher = self.make_fetcher(client, concurrency=4)
+        again = fetcher.fetch_date_range(self.start + timedelta(days=5), self.start + timedelta(days=14))
+        # Only the 5 new days reach Garmin
+        self.assertEqual(sorted({date for _, date in client.calls}),
+                         [f'2025-08-{d:02d}' for d in range(11, 16)])
+        self.assertEqual([r['date'] for r in again], [f'2025-08-{d:02d}' for d in range(6, 16)])
+        self.assertEqual(again[:5], first[5:])
+        stats = fetcher.endpoint_stats()
+        self.assertEqual(stats['cache']['hits'], 5 * len(ENDPOINTS))
+        self.assertEqual(stats['steps']['count'], 5)  # latency counts Garmin calls only
+
+    def test_late_sync_repairs_empty_day(self):
+        class LateSync(FakeGarmin):
+            synced = False
+
+            def get_steps_data(self, date_str):
+                if self.synced:
+                    return super().get_steps_data(date_str)
+                return self._call('get_steps_data', date_str, [])
+
+        self.cache.close()
+        clock = Clock()
+        self.cache = ResponseCache(self.test_dir, ttls=CACHE_TTLS, clock=clock)
+        record = self.make_fetcher(LateSync(delay=0)).fetch_daily_data(self.start)
+        self.assertEqual(record['metrics']['steps'], 0)
+        # The empty reply got the recent TTL; once it lapses the synced data is fetched
+        clock.now += CACHE_TTLS['steps'][0] + 1
+        client = LateSync(delay=0)
+        client.synced = True
+        record = self.make_fetcher(client).fetch_daily_data(self.start)
+        self.assertEqual(record['metrics']['steps'], 5100)
+        self.assertEqual(client.calls, [('get_steps_data', '2025-08-01')])
+
+    def test_failed_calls_not_cached(self):
+        client = FakeGarmin(delay=0, fail={('get_stress_data', '2025-08-01')})
+        with self.assertLogs('fetch_garmin_data', level='ERROR'):
+            self.assertIsNone(self.make_fetcher(client).fetch_daily_data(self.start))
+        client = FakeGarmin(delay=0)
+        self.assertIsNotNone(self.make_fetcher(client).fetch_daily_data(self.start))
+        self.assertEqual(client.calls, [('get_stress_data', '2025-08-01')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Tests for weekly/monthly rollups and their use by ingest_influxdb --rollups.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add dashboard path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from utils.rollups import RollupState, band_field, encode_rollup, period_start, rollup_state_path
+
+SYNTH_EXPORT = Path(__file__).parent / 'synth_export.jsonl'
+
+
+def load_records():
+    with open(SYNTH_EXPORT) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def record(day, score, band, steps=0.3):
+    return {'date': day, 'score': score, 'band': band, 'contrib': {'steps': steps, 'rhr': 0.2}}
+
+
+class TestRollups(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_period_boundaries(self):
+        self.assertEqual(period_start(date(2025, 8, 10), 'week'), date(2025, 8, 4))  # Sunday -> Monday
+        self.assertEqual(period_start(date(2025, 8, 11), 'week'), date(2025, 8, 11))
+        self.assertEqual(period_start(date(2025, 8, 10), 'month'), date(2025, 8, 1))
+        self.assertEqual(band_field('Take it easy'), 'band_take_it_easy_days')
+
+    def test_aggregates_match_full_recompute(self):
+        records = load_records()
+        state = RollupState()
+        state.add_all(records)
+        for (period, key) in state.pending:
+            rollup = state.rollup(period, key)
+            in_period = [r for r in records
+                         if period_start(date.fromisoformat(r['date']), period).isoformat() == key]
+            scores = [r['score'] for r in in_period]
+            self.assertEqual(rollup['days'], len(in_period))
+            self.assertAlmostEqual(rollup['score']['mean'], sum(scores) / len(scores))
+            self.assertEqual((rollup['score']['min'], rollup['score']['max']), (min(scores), max(scores)))
+            self.assertEqual(sum(rollup['bands'].values()), len(in_period))
+
+    def test_incremental_merge_and_replacement(self):
+        path = os.path.join(self.test_dir, 'r.rollups.json')
+        state = RollupState(path)
+        state.add_all([record('2025-08-04', 80, 'Go for it'), record('2025-08-05', 50, 'Maintain')])
+        state.mark_written()
+        state.save()
+
+        state = RollupState(path)
+        self.assertEqual(state.pending, set())
+        state.add(record('2025-08-06', 20, 'Take it easy'))
+        state.add(record('2025-08-04', 60, 'Maintain'))  # re-ingested day replaces, not double counts
+        self.assertEqual(state.pending, {('week', '2025-08-04'), ('month', '2025-08-01')})
+        week = state.rollup('week', '2025-08-04')
+        self.assertEqual(week['days'], 3)
+        self.assertAlmostEqual(week['score']['mean'], (60 + 50 + 20) / 3)
+        self.assertEqual(week['bands'], {'Maintain': 2, 'Take it easy': 1})
+
+    def test_line_protocol(self):
+        state = RollupState()
+        state.add_all([record('2025-08-04', 80, 'Go for it'), record('2025-08-05', 50, 'Maintain', steps=0.1)])
+        lines = encode_rollup(state.rollup('week', '2025-08-04'))
+        self.assertEqual(lines[0],
+                         'wb_score_rollup,period=week band_go_for_it_days=1i,band_maintain_days=1i,'
+                         'band_take_it_easy_days=0i,days=2i,score_max=80,score_mean=65,score_min=50 1754265600')
+        self.assertEqual(lines[2],
+                         'wb_contrib_rollup,metric=steps,period=week contribution_max=0.3,'
+                         'contribution_mean=0.2,contribution_min=0.1,days=2i 1754265600')
+
+    def test_prune_drops_closed_written_periods(self):
+        path = os.path.join(self.test_dir, 'r.rollups.json')
+        state = RollupState(path)
+        state.add_all(record(day.isoformat(), 50, 'Maintain')
+                      for day in (date(2025, 3, 1) + timedelta(days=n) for n in range(150)))
+        state.add(record('2025-07-28', 70, 'Maintain'))
+        state.mark_written()
+        removed = state.prune(retain_days=62)
+        # newest 2025-07-29: the horizon 2025-05-28 keeps May's month and weeks from 2025-05-26
+        self.assertEqual(min(state.periods['month']), '2025-05-01')
+        self.assertEqual(min(state.periods['week']), '2025-05-26')
+        self.assertEqual(removed, 61 + 86)  # March-April from months, March 1 - May 25 from weeks
+        state.save()
+
+        state = RollupState(path)
+        state.add(record('2025-03-10', 10, 'Take it easy'))  # pruned period: its rollup stays as written
+        self.assertEqual(state.pending, set())
+        state.add(record('2025-05-27', 10, 'Take it easy'))
+        self.assertEqual(state.pending, {('week', '2025-05-26'), ('month', '2025-05-01')})
+        self.assertEqual(state.rollup('month', '2025-05-01')['days'], 31)
+
+    def test_directory_ingest_shares_rollups_across_files(self):
+        import ingest_influxdb
+        template = load_records()[0]
+        data_dir = os.path.join(self.test_dir, 'exports')
+        os.makedirs(data_dir)
+        for name, day, score in (('daily_a.jsonl', '2025-08-04', 30), ('daily_b.jsonl', '2025-08-05', 90)):
+            with open(os.path.join(data_dir, name), 'w') as f:
+                f.write(json.dumps(dict(template, date=day, score=score)) + '\n')
+
+        def run():
+            lines = []
+            paths = ingest_influxdb.discover_record_files(data_dir)
+            state = RollupState(ingest_influxdb.shared_rollup_state_path(data_dir, paths))
+            summary = ingest_influxdb.ingest_files_parallel(
+                lines.extend, paths, workers=2, encoder='fast', max_retries=0, backoff_base=0, rollups=state)
+            self.assertIsNone(summary['rollups']['error'])
+            return [line for line in lines if line.startswith('wb_score_rollup,period=week')]
+
+        week = run()
+        self.assertEqual(len(week), 1)
+        self.assertIn('days=2i', week[0])
+        self.assertIn('score_mean=60', week[0])
+        self.assertTrue(week[0].endswith(' 1754265600'))
+        self.assertTrue(os.path.exists(os.path.join(data_dir, 'ingest.rollups.json')))
+
+        with open(os.path.join(data_dir, 'daily_a.jsonl'), 'a') as f:
+            f.write(json.dumps(dict(template, date='2025-08-06', score=60)) + '\n')
+        week = run()  # only daily_a has new lines; the rollup still covers all three days
+        self.assertEqual(len(week), 1)
+        self.assertIn('days=3i', week[0])
+        self.assertIn('score_mean=60', week[0])
+
+    def test_streaming_ingest_writes_rollups(self):
+        import ingest_influxdb
+        from utils.ingest_checkpoint import checkpoint_path, load_checkpoint, plan_resume
+        records_path = os.path.join(self.test_dir, 'records.jsonl')
+        records = load_records()
+        with open(records_path, 'w') as f:
+            f.writelines(json.dumps(r) + '\n' for r in records[:20])
+
+        def run():
+            lines = []
+            previous = load_checkpoint(checkpoint_path(records_path))
+            resume = plan_resume(records_path, previous)
+            resume['checkpoint'] = previous
+            ingest_influxdb.ingest_records_streaming(
+                lines.extend, records_path, encoder='fast', checkpoint_file=checkpoint_path(records_path),
+                resume=resume, rollups=RollupState(rollup_state_path(records_path)))
+            return [line for line in lines if '_rollup' in line]
+
+        first = run()
+        self.assertTrue(first)
+        with open(records_path, 'a') as f:
+            f.write(json.dumps(records[20]) + '\n')
+        second = run()
+        # Only the week and month containing the new day are rewritten, from merged state
+        self.assertEqual({line.split(' ')[0].split(',period=')[1] for line in second if 'wb_score' in line},
+                         {'week', 'month'})
+        full = RollupState()
+        full.add_all(records[:21])
+        day = date.fromisoformat(records[20]['date'])
+        expected = encode_rollup(full.rollup('week', period_start(day, 'week').isoformat()))
+        self.assertIn(expected[0], second)
+
+
+if __name__ == '__main__':
+    unittest.main()
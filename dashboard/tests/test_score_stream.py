@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming JSONL scorer (score_stream).
+"""
+
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Add dashboard path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from score.engine import compute_score, score_stream, inputs_from_wellness_metrics
+from scripts.phase3.fix_integrity import fix_integrity_issues, verify_integrity
+
+
+def wellness_record(day: int, steps=8000, rhr=55, sleep=7.5, stress=40, score=0, band="Unknown"):
+    return {
+        "date": f"2025-08-{day:02d}",
+        "metrics": {
+            "steps": steps,
+            "restingHeartRate": rhr,
+            "sleepHours": sleep,
+            "stress": stress
+        },
+        "score": score,
+        "band": band,
+        "auto_run": 1
+    }
+
+
+class TestScoreStream(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_matches_scalar_engine(self):
+        records = [
+            wellness_record(1),
+            wellness_record(2, steps=3000, rhr=70, sleep=None, stress=None),
+            wellness_record(3, steps=None, rhr=48, sleep=9.0, stress=None),
+            wellness_record(4, steps=15000, rhr=None, sleep=None, stress=90),
+        ]
+        for chunk_size in (1, 3, 1024):
+            with self.subTest(chunk_size=chunk_size):
+                for record, scored in zip(records, score_stream(records, chunk_size=chunk_size)):
+                    expected = compute_score(*inputs_from_wellness_metrics(record['metrics']))
+                    self.assertEqual(scored['score'], expected.score)
+                    self.assertEqual(scored['band'], expected.band)
+                    self.assertEqual(scored['date'], record['date'])
+                    self.assertEqual(scored['auto_run'], 1)
+
+    def test_parses_lines_and_skips_blanks(self):
+        lines = [json.dumps(wellness_record(1)) + '\n', '\n', json.dumps(wellness_record(2)).encode()]
+        scored = list(score_stream(lines))
+        self.assertEqual([r['date'] for r in scored], ["2025-08-01", "2025-08-02"])
+
+    def test_is_lazy(self):
+        """An unbounded source is consumed one chunk at a time."""
+        endless = (wellness_record(1 + i % 28) for i in itertools.count())
+        first = list(itertools.islice(score_stream(endless, chunk_size=8), 20))
+        self.assertEqual(len(first), 20)
+
+    def test_does_not_mutate_input(self):
+        record = wellness_record(1)
+        next(score_stream([record]))
+        self.assertEqual(record['score'], 0)
+
+    def test_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            list(score_stream([], chunk_size=0))
+
+    def test_fix_integrity_streams_corrections(self):
+        path = os.path.join(self.temp_dir, 'wellness.jsonl')
+        with open(path, 'w') as f:
+            for day in range(1, 6):
+                f.write(json.dumps(wellness_record(day)) + '\n')
+
+        stats = fix_integrity_issues(path)
+        self.assertEqual(stats['total_records'], 5)
+        self.assertEqual(stats['changes_made'], 5)
+
+        failures, _ = verify_integrity(path)
+        self.assertEqual(failures, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for the segmented JSONL store, shard compaction and segment retention.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+
+# Add dashboard path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.segment_store import SegmentStore, compact_shards, is_segment_store
+from scripts.phase3.retention_policy import RetentionManager
+from scripts.phase3.segment_compactor import compact_telemetry
+
+
+class TestSegmentStore(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store_dir = os.path.join(self.temp_dir, 'telemetry.segments')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def days(self, start, count):
+        return [{'date': (start + timedelta(days=i)).isoformat(), 'n': i} for i in range(count)]
+
+    def test_append_routes_by_month(self):
+        store = SegmentStore(self.store_dir)
+        store.append(self.days(date(2025, 1, 30), 5))
+        segments = store.segment_list()
+        self.assertEqual([s['name'] for s in segments], ['seg_202501.jsonl', 'seg_202502.jsonl'])
+        self.assertEqual([s['records'] for s in segments], [2, 3])
+        self.assertEqual(segments[1]['min_date'], '2025-02-01')
+        self.assertTrue(is_segment_store(self.store_dir))
+
+    def test_iter_records_range(self):
+        store = SegmentStore(self.store_dir)
+        store.append(self.days(date(2025, 1, 1), 90))
+        rows = list(store.iter_records('2025-02-27', '2025-03-02'))
+        self.assertEqual([r['date'] for r in rows], ['2025-02-27', '2025-02-28', '2025-03-01', '2025-03-02'])
+
+    def test_manifest_recovers_from_stale_stats(self):
+        store = SegmentStore(self.store_dir)
+        store.append(self.days(date(2025, 1, 1), 3))
+        # Simulate a crash between segment append and manifest update
+        with open(os.path.join(self.store_dir, 'seg_202501.jsonl'), 'a') as f:
+            f.write(json.dumps({'date': '2025-01-20'}) + '\n')
+        reopened = SegmentStore(self.store_dir)
+        entry = reopened.segment_list()[0]
+        self.assertEqual(entry['records'], 4)
+        self.assertEqual(entry['max_date'], '2025-01-20')
+
+    def test_drop_before_whole_segments(self):
+        store = SegmentStore(self.store_dir)
+        store.append(self.days(date(2025, 1, 1), 75))  # Jan, Feb, part of Mar
+        dropped = store.drop_before('2025-02-15')
+        self.assertEqual([s['name'] for s in dropped], ['seg_202501.jsonl'])
+        self.assertFalse(os.path.exists(os.path.join(self.store_dir, 'seg_202501.jsonl')))
+        # Straddling segment kept whole
+        self.assertEqual(min(r['date'] for r in store.iter_records()), '2025-02-01')
+        self.assertEqual(len(SegmentStore(self.store_dir).segment_list()), 2)
+
+    def test_drop_before_expires_undated_segments_by_month(self):
+        store = SegmentStore(self.store_dir)
+        store.append([{'n': 1}, {'date': 'unknown'}], default_date='2025-01-10')
+        store.append([{'n': 2}], default_date='2025-02-10')
+        self.assertEqual([s['max_date'] for s in store.segment_list()], [None, None])
+        self.assertEqual(store.drop_before('2025-01-31'), [])  # January not over yet
+        dropped = store.drop_before('2025-02-01')
+        self.assertEqual([(s['name'], s['records']) for s in dropped], [('seg_202501.jsonl', 2)])
+        self.assertEqual([s['name'] for s in SegmentStore(self.store_dir).segment_list()], ['seg_202502.jsonl'])
+
+    def test_compact_shards(self):
+        shard = os.path.join(self.temp_dir, 'telemetry_20250105.jsonl')
+        with open(shard, 'w') as f:
+            f.write(json.dumps({'date': '2025-01-04', 'auto_run': 1}) + '\n')
+            f.write(json.dumps({'auto_run': 0}) + '\n')  # undated: placed by shard date
+        store = SegmentStore(self.store_dir)
+        summary = compact_shards([shard], store)
+        self.assertEqual(summary['records_merged'], 2)
+        self.assertFalse(os.path.exists(shard))
+        self.assertEqual(store.segment_list()[0]['records'], 2)
+
+
+class TestSegmentRetentionAndCompaction(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_shard(self, day):
+        path = os.path.join(self.temp_dir, f"telemetry_{day.strftime('%Y%m%d')}.jsonl")
+        with open(path, 'w') as f:
+            f.write(json.dumps({'date': day.isoformat(), 'auto_run': 1}) + '\n')
+        return path
+
+    def test_compaction_skips_recent_shards(self):
+        today = date.today()
+        for offset in (0, 2, 40, 100):
+            self.write_shard(today - timedelta(days=offset))
+        summary = compact_telemetry(self.temp_dir, min_age_days=1)
+        self.assertEqual(summary['shards_merged'], 3)
+        remaining = [p for p in os.listdir(self.temp_dir) if p.startswith('telemetry_')]
+        self.assertEqual(remaining, [f"telemetry_{today.strftime('%Y%m%d')}.jsonl"])
+
+    def test_retention_prunes_store_by_segment(self):
+        old_day = date.today() - timedelta(days=120)
+        self.write_shard(old_day)
+        self.write_shard(date.today() - timedelta(days=2))
+        compact_telemetry(self.temp_dir, min_age_days=1)
+
+        manager = RetentionManager(retention_days=30)
+        report = manager.apply_retention_policy(telemetry_dir=self.temp_dir,
+                                                quarantine_dir=os.path.join(self.temp_dir, 'q'))
+        pruned = report['telemetry']['files_pruned']
+        self.assertEqual(len(pruned), 1)
+        self.assertEqual(pruned[0]['pruned_records'], 1)
+        self.assertEqual(pruned[0]['segments_dropped'], [f"seg_{old_day.strftime('%Y%m')}.jsonl"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,217 @@
+"""
+Bounded, pipelined batch writer.
+
+Producers add items (e.g. line-protocol lines); items are cut into batches
+of at most max_items / max_bytes and handed to background writer threads.
+At most max_in_flight batches are queued or being written at once, so a
+slow sink applies backpressure to the producer instead of letting memory
+grow. Each batch is retried with full-jitter exponential backoff; a batch
+that exhausts its retries is counted as failed and the pipeline moves on.
+
+Usage:
+    with BatchPipeline(write_batch, max_items=5000, max_in_flight=2) as pipeline:
+        for line in lines:
+            pipeline.add(line, len(line))
+    print(pipeline.stats())
+"""
+
+import queue
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .jsonl_writer import LatencyHistogram
+
+DEFAULT_MAX_ITEMS = 5000
+DEFAULT_MAX_BYTES = 1024 * 1024
+DEFAULT_MAX_IN_FLIGHT = 2
+DEFAULT_MAX_RETRIES = 5
+
+_STOP = object()
+
+
+def jittered_backoff(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter delay for a retry attempt (1-based): U(0, min(cap, base * 2^(attempt-1)))."""
+    return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
+
+
+class BatchPipeline:
+    """Cuts a stream of items into batches and writes them in the background."""
+
+    def __init__(self, write_batch: Callable[[List[Any]], None],
+                 max_items: int = DEFAULT_MAX_ITEMS,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 writers: int = 1,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff_base: float = 0.5,
+                 backoff_max: float = 30.0,
+                 on_failure: Optional[Callable[[List[Any], Exception], None]] = None,
+                 on_written: Optional[Callable[[Any], None]] = None):
+        """
+        Args:
+            write_batch: Sink called with each batch; raises on failure
+            max_items: Items per batch
+            max_bytes: Approximate bytes per batch (sum of sizes given to add)
+            max_in_flight: Batches queued or being written before add() blocks
+            writers: Background writer threads (1 keeps batches in order)
+            max_retries: Retries per batch after the first attempt
+            backoff_base: First retry delay ceiling (seconds)
+            backoff_max: Retry delay ceiling (seconds)
+            on_failure: Called with (batch, last_error) when a batch is dropped
+            on_written: Called with the batch's mark (the last non-None mark
+                passed to add) after it is written; with writers=1 this runs
+                in batch order, e.g. to advance a checkpoint
+        """
+        if max_items <= 0 or max_bytes <= 0 or max_in_flight <= 0 or writers <= 0:
+            raise ValueError("max_items, max_bytes, max_in_flight and writers must be positive")
+        self.write_batch = write_batch
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.on_failure = on_failure
+        self.on_written = on_written
+
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._queue: "queue.Queue" = queue.Queue()
+        self._threads = [
+            threading.Thread(target=self._run, name=f'batch-writer-{i}', daemon=True)
+            for i in range(writers)
+        ]
+        self._lock = threading.Lock()
+        self._batch: List[Any] = []
+        self._batch_bytes = 0
+        self._batch_mark: Any = None
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._closed = False
+
+        self.batch_latency = LatencyHistogram()  # successful write, incl. retries
+        self.batches_written = 0
+        self.items_written = 0
+        self.bytes_written = 0
+        self.retries = 0
+        self.failed_batches = 0
+        self.failed_items = 0
+        self.last_error: Optional[str] = None
+        self.max_observed_in_flight = 0
+        self._in_flight = 0
+
+    def start(self) -> 'BatchPipeline':
+        if self._started_at is None:
+            self._started_at = time.monotonic()
+            for thread in self._threads:
+                thread.start()
+        return self
+
+    def __enter__(self) -> 'BatchPipeline':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def add(self, item: Any, size: int = 0, mark: Any = None) -> None:
+        """
+        Add one item; blocks while max_in_flight batches are pending.
+
+        mark (optional) travels with the batch and is handed to on_written.
+        """
+        if self._closed:
+            raise RuntimeError("BatchPipeline is closed")
+        self.start()
+        if self._batch and (len(self._batch) >= self.max_items
+                            or self._batch_bytes + size > self.max_bytes):
+            self._dispatch()
+        self._batch.append(item)
+        self._batch_bytes += size
+        if mark is not None:
+            self._batch_mark = mark
+
+    def _dispatch(self) -> None:
+        batch, size, mark = self._batch, self._batch_bytes, self._batch_mark
+        self._batch, self._batch_bytes, self._batch_mark = [], 0, None
+        self._slots.acquire()  # backpressure
+        with self._lock:
+            self._in_flight += 1
+            self.max_observed_in_flight = max(self.max_observed_in_flight, self._in_flight)
+        self._queue.put((batch, size, mark))
+
+    def close(self) -> Dict:
+        """Write the partial batch, wait for all writers, return stats()."""
+        if not self._closed:
+            self._closed = True
+            if self._started_at is not None:
+                if self._batch:
+                    self._dispatch()
+                for _ in self._threads:
+                    self._queue.put(_STOP)
+                for thread in self._threads:
+                    thread.join()
+                self._finished_at = time.monotonic()
+        return self.stats()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch, size, mark = item
+            try:
+                self._write_with_retry(batch, size, mark)
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+                self._slots.release()
+
+    def _write_with_retry(self, batch: List[Any], size: int, mark: Any = None) -> None:
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                self.write_batch(batch)
+                break
+            except Exception as e:
+                attempt += 1
+                with self._lock:
+                    self.last_error = str(e)
+                if attempt > self.max_retries:
+                    with self._lock:
+                        self.failed_batches += 1
+                        self.failed_items += len(batch)
+                    if self.on_failure is not None:
+                        self.on_failure(batch, e)
+                    return
+                with self._lock:
+                    self.retries += 1
+                time.sleep(jittered_backoff(attempt, self.backoff_base, self.backoff_max))
+
+        self.batch_latency.observe((time.monotonic() - started) * 1000)
+        with self._lock:
+            self.batches_written += 1
+            self.items_written += len(batch)
+            self.bytes_written += size
+        if mark is not None and self.on_written is not None:
+            self.on_written(mark)
+
+    def stats(self) -> Dict:
+        """Throughput, retry/failure counters and per-batch latency."""
+        end = self._finished_at or time.monotonic()
+        elapsed = end - self._started_at if self._started_at is not None else 0.0
+        return {
+            'batches_written': self.batches_written,
+            'items_written': self.items_written,
+            'bytes_written': self.bytes_written,
+            'retries': self.retries,
+            'failed_batches': self.failed_batches,
+            'failed_items': self.failed_items,
+            'last_error': self.last_error,
+            'elapsed_s': round(elapsed, 3),
+            'items_per_sec': round(self.items_written / elapsed, 1) if elapsed > 0 else 0.0,
+            'max_in_flight': self.max_in_flight,
+            'max_observed_in_flight': self.max_observed_in_flight,
+            'batch_latency': self.batch_latency.to_dict(),
+        }
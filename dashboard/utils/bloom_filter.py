@@ -0,0 +1,132 @@
+"""
+Serializable Bloom filter.
+
+Answers "definitely not seen" / "maybe seen" for string keys in constant
+time and memory, so callers only pay for an exact lookup on "maybe".
+Sized from expected cardinality and target false-positive rate:
+
+    bits   m = -n * ln(p) / ln(2)^2
+    hashes k = m / n * ln(2)
+
+File format: 'WBF1' magic, header (bits, hashes, count, capacity, error
+rate), a length-prefixed JSON tag for the owner's bookkeeping, then the
+bit array.
+"""
+
+import hashlib
+import json
+import math
+import os
+import struct
+import tempfile
+from typing import Dict, Optional
+
+_MAGIC = b'WBF1'
+_HEADER = struct.Struct('<4sQIQQdI')  # magic, bits, hashes, count, capacity, error_rate, tag_len
+
+
+class BloomFilter:
+    """Bloom filter over string keys (double hashing on one blake2b digest)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """
+        Args:
+            capacity: Expected number of distinct keys
+            error_rate: Target false-positive rate at capacity (0 < p < 1)
+        """
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        if not 0 < error_rate < 1:
+            raise ValueError(f"error_rate must be in (0, 1), got {error_rate}")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+        self.tag: Dict = {}
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> bool:
+        """Add key. Returns True if it was (probably) new."""
+        new = False
+        for pos in self._positions(key):
+            mask = 1 << (pos & 7)
+            if not self.bits[pos >> 3] & mask:
+                self.bits[pos >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def estimated_fp_rate(self) -> float:
+        """Expected false-positive rate at the current fill: (1 - e^(-kn/m))^k."""
+        return (1.0 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    @property
+    def saturated(self) -> bool:
+        """True once more keys than planned were added (FP rate above target)."""
+        return self.count > self.capacity
+
+    def stats(self) -> Dict:
+        return {
+            'capacity': self.capacity,
+            'count': self.count,
+            'num_bits': self.num_bits,
+            'num_hashes': self.num_hashes,
+            'size_bytes': len(self.bits),
+            'target_fp_rate': self.error_rate,
+            'estimated_fp_rate': round(self.estimated_fp_rate(), 6),
+        }
+
+    def save(self, path: str) -> None:
+        """Write atomically (temp file + rename)."""
+        tag = json.dumps(self.tag).encode('utf-8')
+        header = _HEADER.pack(_MAGIC, self.num_bits, self.num_hashes, self.count,
+                              self.capacity, self.error_rate, len(tag))
+        fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + '_', dir=os.path.dirname(path) or '.')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(header)
+                f.write(tag)
+                f.write(self.bits)
+            os.replace(tmp, path)
+        except Exception:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> Optional['BloomFilter']:
+        """Read a saved filter; None if missing or not a valid filter file."""
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            magic, num_bits, num_hashes, count, capacity, error_rate, tag_len = _HEADER.unpack_from(data)
+            if magic != _MAGIC:
+                return None
+            bloom = cls.__new__(cls)
+            bloom.capacity = capacity
+            bloom.error_rate = error_rate
+            bloom.num_bits = num_bits
+            bloom.num_hashes = num_hashes
+            bloom.count = count
+            offset = _HEADER.size
+            bloom.tag = json.loads(data[offset:offset + tag_len])
+            bloom.bits = bytearray(data[offset + tag_len:])
+            if len(bloom.bits) != (num_bits + 7) // 8:
+                return None
+            return bloom
+        except (OSError, ValueError, struct.error):
+            return None
@@ -4,13 +4,21 @@ Addresses crash mid-write corruption risk identified in ChatGPT-5 review.
 """
 
 import json
+import mmap
 import os
 import tempfile
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
 
+try:
+    import fcntl
+except ImportError:  # non-POSIX: advisory locks unavailable, lock is a no-op
+    fcntl = None
 
-def atomic_write_jsonl(data: List[Dict], file_path: str) -> bool:
+
+def atomic_write_jsonl(data: Iterable[Dict], file_path: str) -> bool:
     """
     Atomically write JSONL data to file using temp file + rename.
     
@@ -18,7 +26,8 @@ def atomic_write_jsonl(data: List[Dict], file_path: str) -> bool:
     then atomically renaming to target file.
     
     Args:
-        data: List of dictionaries to write as JSONL
+        data: Dictionaries to write as JSONL (a list or a lazy iterator,
+              e.g. score.engine.score_stream, is consumed once)
         file_path: Target file path
         
     Returns:
@@ -59,19 +68,267 @@ def atomic_write_jsonl(data: List[Dict], file_path: str) -> bool:
         return False
 
 
-def atomic_append_jsonl(records: List[Dict], file_path: str) -> bool:
+def repair_torn_tail(file_path: str) -> int:
+    """
+    Recovery scan for a JSONL file that may end in a torn (partial) line.
+    
+    A crash during an append can leave a trailing line without its newline.
+    If that tail is still valid JSON it is completed with a newline;
+    otherwise it is truncated back to the last complete line. Only the
+    tail of the file is read, so cost does not grow with history.
+    
+    Args:
+        file_path: JSONL file to check
+        
+    Returns:
+        Number of bytes truncated (0 if the file was clean or repaired in place)
+    """
+    if not os.path.exists(file_path):
+        return 0
+    
+    with open(file_path, 'r+b') as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return 0
+        f.seek(size - 1)
+        if f.read(1) == b'\n':
+            return 0
+        
+        # Scan backwards in blocks for the last complete line
+        block = 64 * 1024
+        pos = size
+        last_newline = -1
+        while pos > 0 and last_newline < 0:
+            start = max(0, pos - block)
+            f.seek(start)
+            chunk = f.read(pos - start)
+            idx = chunk.rfind(b'\n')
+            if idx >= 0:
+                last_newline = start + idx
+            pos = start
+        
+        tail_start = last_newline + 1
+        f.seek(tail_start)
+        tail = f.read()
+        try:
+            complete = isinstance(json.loads(tail), dict)
+        except ValueError:
+            complete = False
+        
+        if complete:
+            f.seek(0, os.SEEK_END)
+            f.write(b'\n')
+            truncated = 0
+        else:
+            f.truncate(tail_start)
+            truncated = size - tail_start
+        f.flush()
+        os.fsync(f.fileno())
+        return truncated
+
+
+def tail_jsonl(file_path: str, n: int) -> List[Dict]:
+    """
+    Read the last n JSON records of a JSONL file.
+
+    The file is memory-mapped and scanned backwards from the end, so cost
+    depends on n and line length, not on how much history the file holds.
+    Blank lines, lines that are not JSON objects and a torn trailing line
+    are skipped.
+
+    Args:
+        file_path: JSONL file to read
+        n: Number of records wanted
+
+    Returns:
+        Up to n records in file order (oldest first); [] if the file is
+        missing or empty
+    """
+    if n <= 0 or not os.path.exists(file_path):
+        return []
+
+    with open(file_path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return []  # empty file cannot be mapped
+
+    records = []
+    try:
+        end = len(mm)
+        while end > 0 and len(records) < n:
+            start = mm.rfind(b'\n', 0, end - 1) + 1
+            line = mm[start:end]
+            end = start
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+    finally:
+        mm.close()
+
+    records.reverse()
+    return records
+
+
+def lock_path(file_path: str) -> str:
+    """Advisory lock file used to coordinate writers of file_path."""
+    return f"{file_path}.lock"
+
+
+@contextmanager
+def jsonl_lock(file_path: str, timeout: float = None):
+    """
+    Hold an exclusive advisory (fcntl) lock for file_path across processes.
+    
+    The lock lives on a separate <file>.lock so atomic rewrites of the data
+    file (new inode) do not invalidate it. Keep the critical section short:
+    only the check and the write that depends on it.
+    
+    Args:
+        file_path: Data file to coordinate on
+        timeout: Seconds to wait for the lock (None waits indefinitely)
+        
+    Raises:
+        TimeoutError: If the lock is not acquired within timeout
+    """
+    if fcntl is None:
+        yield
+        return
+    
+    fd = os.open(lock_path(file_path), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if timeout is None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError(f"Timed out waiting for lock on {file_path}")
+                    time.sleep(0.005)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def _fsync_dir(dir_path: str) -> None:
+    """Persist a directory entry (new file creation) where supported."""
+    try:
+        dir_fd = os.open(dir_path or '.', os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def append_jsonl_payload(payload: bytes, file_path: str, lock: bool = True) -> None:
+    """
+    Append pre-encoded JSONL bytes with O_APPEND + fsync.
+    
+    Repairs a torn tail first. The repair and the write happen under
+    jsonl_lock(file_path): without it, another appender's line that is
+    still being written would look torn and be truncated. Pass lock=False
+    only when the caller already holds that lock. Raises OSError (or
+    TimeoutError) on failure; used by durable_append_jsonl and the
+    group-commit JsonlWriter.
+    """
+    if not lock:
+        _append_payload(payload, file_path)
+        return
+    with jsonl_lock(file_path):
+        _append_payload(payload, file_path)
+
+
+def _append_payload(payload: bytes, file_path: str) -> None:
+    created = not os.path.exists(file_path)
+    if not created:
+        repair_torn_tail(file_path)
+    
+    fd = os.open(file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    
+    if created:
+        _fsync_dir(os.path.dirname(os.path.abspath(file_path)))
+    
+    # Keep sidecar indexes (if the file has them) in step with appends
+    from .jsonl_index import update_index_if_present
+    from .key_index import update_key_index_if_present
+    update_index_if_present(file_path)
+    update_key_index_if_present(file_path)
+
+
+def durable_append_jsonl(records: Iterable[Dict], file_path: str, lock: bool = True) -> bool:
+    """
+    Append JSONL records in O(new records) with crash safety.
+    
+    Repairs a torn trailing line left by a previous crash, then writes only
+    the new lines through an O_APPEND descriptor and fsyncs. Existing
+    history is never re-read or rewritten.
+    
+    Args:
+        records: Records to append
+        file_path: Target file path
+        lock: Hold jsonl_lock(file_path) for the repair and write; False if
+              the caller already holds it (flock is not re-entrant)
+        
+    Returns:
+        True if successful, False if error
+    """
+    try:
+        payload = ''.join(json.dumps(record) + '\n' for record in records).encode('utf-8')
+        append_jsonl_payload(payload, file_path, lock=lock)
+        return True
+        
+    except Exception as e:
+        print(f"❌ Durable append failed for {file_path}: {e}")
+        return False
+
+
+def atomic_append_jsonl(records: List[Dict], file_path: str, mode: str = 'rewrite') -> bool:
     """
     Atomically append JSONL records to file.
     
-    Reads existing file, appends new records, then atomically writes back.
+    Modes:
+        'rewrite': reads existing file, appends new records, then atomically
+                   writes everything back (drops malformed existing lines).
+        'append':  O(1) path via durable_append_jsonl - writes only the new
+                   lines with O_APPEND + fsync and repairs a torn tail.
     
     Args:
         records: List of records to append
         file_path: Target file path
+        mode: 'rewrite' (default) or 'append'
         
     Returns:
         True if successful, False if error
     """
+    if mode == 'append':
+        return durable_append_jsonl(records, file_path)
+    if mode != 'rewrite':
+        raise ValueError(f"Unknown append mode: {mode}")
+    
     try:
         existing_records = []
         
@@ -182,6 +439,10 @@ if __name__ == '__main__':
         success = atomic_append_jsonl(new_data, test_file)
         print(f"✅ Atomic append: {success}")
         
+        # Test O(1) append mode
+        success = atomic_append_jsonl([{'date': '2025-08-04', 'score': 80}], test_file, mode='append')
+        print(f"✅ Durable append: {success}")
+        
         # Verify final content
         with open(test_file, 'r') as f:
             lines = f.readlines()
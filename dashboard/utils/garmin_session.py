@@ -0,0 +1,235 @@
+"""
+On-disk Garmin Connect session store, so cron runs skip the full login.
+
+After a credential login the client's tokens (the dumps() string of its
+token client: garth before garminconnect 0.3, the native client after)
+are saved to private/garmin_session_<account>.json, mode 0600 in the 0700
+private/ directory security_hardening.py sets up. The next run loads them
+into the token client directly and validates them with one profile call
+(the token client refreshes an expiring access token on the way).
+Garmin.login(tokens) is deliberately not used: garminconnect 0.3 silently
+falls back to a full credential login when the tokens do not load, which
+would be reported as a resume. Rotated tokens are written back.
+
+Only when the saved session is missing, cannot be loaded, or Garmin
+rejects it (HTTP 401/403) does a full (rate-limited, possibly MFA)
+credential login happen. A resume that fails for any other reason
+(timeout, 5xx, rate limit) keeps the session file and raises, so a
+network blip never costs the saved login.
+
+Each connect() records its timings in .stats:
+    {'mode': 'resumed'|'refreshed'|'login', 'resume_s', 'login_s', 'resume_error'}
+
+Usage:
+    store = GarminSessionStore('private', email)
+    client = store.connect(email, password)
+"""
+
+import json
+import logging
+import os
+import re
+import stat
+import tempfile
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .response_cache import account_key
+
+logger = logging.getLogger(__name__)
+
+SESSION_VERSION = 1
+AUTH_STATUS_CODES = (401, 403)
+PROFILE_PATH = '/userprofile-service/socialProfile'
+# garminconnect 0.3's native client reports HTTP errors only in the message
+_API_ERROR_RE = re.compile(r'\bAPI Error ([0-9]{3})\b')
+
+
+def _token_client(client: Any) -> Any:
+    """garth client behind a Garmin instance (.garth before garminconnect 0.3, .client after)."""
+    token_client = getattr(client, 'garth', None)
+    if token_client is None or not hasattr(token_client, 'dumps'):
+        token_client = getattr(client, 'client', None)
+    return token_client
+
+
+def dump_tokens(client: Any) -> Optional[str]:
+    """Serialized OAuth tokens of a logged-in Garmin client, or None if unavailable."""
+    token_client = _token_client(client)
+    try:
+        return token_client.dumps() if token_client is not None else None
+    except Exception:
+        return None
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """
+    HTTP status behind an error: a requests HTTPError, one wrapped by garth's
+    GarthHTTPError (.error), or garminconnect 0.3's "API Error <status>".
+    """
+    for holder in (error, getattr(error, 'error', None)):
+        response = getattr(holder, 'response', None)
+        status = getattr(response, 'status_code', None)
+        if isinstance(status, int):
+            return status
+    match = _API_ERROR_RE.search(str(error))
+    return int(match.group(1)) if match else None
+
+
+def is_auth_rejection(error: BaseException) -> bool:
+    """
+    True if Garmin refused the tokens with HTTP 401/403, anywhere in the
+    cause chain. Exception classes are not trusted: garminconnect raises
+    GarminConnectAuthenticationError for timeouts during login too.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if _status_code(error) in AUTH_STATUS_CODES:
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _default_factory(email: str, password: str) -> Any:
+    from garminconnect import Garmin
+    return Garmin(email, password)
+
+
+class GarminSessionStore:
+    """Saved OAuth tokens for one Garmin account."""
+
+    def __init__(self, directory: str, login: str):
+        """
+        Args:
+            directory: Private directory (created 0700 if missing)
+            login: Garmin login; only its hash appears in the file name and contents
+        """
+        self.directory = directory
+        self.account = account_key(login)
+        self.path = os.path.join(directory, f"garmin_session_{self.account}.json")
+        self.stats: Dict[str, Any] = {}
+
+    def _ensure_directory(self) -> None:
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+
+    def load_tokens(self) -> Optional[str]:
+        """Saved tokens, or None (missing, unreadable or another account's file)."""
+        try:
+            mode = stat.S_IMODE(os.stat(self.path).st_mode)
+            if mode & 0o077:
+                logger.warning(f"Session file {self.path} had mode {oct(mode)}; restricting to 0600")
+                os.chmod(self.path, 0o600)
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != SESSION_VERSION or data.get('account') != self.account:
+            return None
+        return data.get('tokens') or None
+
+    def save_tokens(self, tokens: str) -> None:
+        """Atomically write tokens with mode 0600 (never readable by others, even briefly)."""
+        self._ensure_directory()
+        data = {'version': SESSION_VERSION, 'account': self.account, 'tokens': tokens, 'saved_at': time.time()}
+        fd, tmp = tempfile.mkstemp(prefix='garmin_session_', suffix='.tmp', dir=self.directory)
+        try:
+            os.fchmod(fd, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except Exception:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def save_client(self, client: Any) -> bool:
+        """Save a logged-in client's tokens; False if they cannot be serialized."""
+        tokens = dump_tokens(client)
+        if not tokens:
+            return False
+        self.save_tokens(tokens)
+        return True
+
+    def clear(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _discard(self, started: float, error: Exception, reason: str) -> None:
+        self.stats['resume_s'] = round(time.monotonic() - started, 3)
+        self.stats['resume_error'] = str(error)
+        logger.warning(f"{reason}, logging in again: {error}")
+        self.clear()
+
+    def resume(self, email: str, password: str,
+               factory: Optional[Callable[[str, str], Any]] = None) -> Optional[Any]:
+        """
+        Client restored from the saved session (refreshed if needed), or None.
+
+        A session that cannot be loaded or that Garmin rejects (401/403) is
+        removed and None returned. Any other failure of the profile check
+        keeps the session file and is raised. Sets stats['resume_s'] and,
+        on success, stats['mode'] ('refreshed' when the tokens rotated).
+        """
+        tokens = self.load_tokens()
+        if tokens is None:
+            return None
+        factory = factory or _default_factory
+        started = time.monotonic()
+        client = factory(email, password)
+        token_client = _token_client(client)
+        try:
+            token_client.loads(tokens)
+        except Exception as e:
+            self._discard(started, e, "Saved Garmin session could not be loaded")
+            return None
+        try:
+            profile = token_client.connectapi(PROFILE_PATH)
+        except Exception as e:
+            if is_auth_rejection(e):
+                self._discard(started, e, "Saved Garmin session rejected")
+                return None
+            self.stats['resume_s'] = round(time.monotonic() - started, 3)
+            self.stats['resume_error'] = str(e)
+            logger.warning(f"Could not resume saved Garmin session (kept for next run): {e}")
+            raise
+        self.stats['resume_s'] = round(time.monotonic() - started, 3)
+        if isinstance(profile, dict):
+            # Garmin.login() sets these from the same call; per-day endpoints need display_name
+            client.display_name = profile.get('displayName', email)
+            client.full_name = profile.get('fullName', '')
+        current = dump_tokens(client)
+        if current and current != tokens:
+            self.save_tokens(current)
+            self.stats['mode'] = 'refreshed'
+        else:
+            self.stats['mode'] = 'resumed'
+        return client
+
+    def connect(self, email: str, password: str,
+                factory: Optional[Callable[[str, str], Any]] = None) -> Any:
+        """
+        Resume the saved session, or log in with credentials and save it.
+
+        Raises whatever the credential login raises, or a resume failure
+        that is not an auth rejection.
+        """
+        self.stats = {'mode': None, 'resume_s': None, 'login_s': None, 'resume_error': None}
+        client = self.resume(email, password, factory)
+        if client is not None:
+            return client
+        factory = factory or _default_factory
+        started = time.monotonic()
+        client = factory(email, password)
+        client.login()
+        self.stats['login_s'] = round(time.monotonic() - started, 3)
+        self.stats['mode'] = 'login'
+        if not self.save_client(client):
+            logger.warning("Garmin client tokens could not be serialized; session not saved")
+        return client
@@ -0,0 +1,371 @@
+"""
+Asyncio ingestion into InfluxDB's /api/v2/write endpoint.
+
+AsyncWritePool keeps a pool of keep-alive HTTP/1.1 connections and posts
+gzip-compressed line-protocol bodies; AsyncIngestRunner reads daily-record
+files, encodes them with utils.line_protocol and keeps up to `concurrency`
+write requests in flight across all files. Only the standard library is
+used, so many files can be ingested from one process without an
+InfluxDBClient (and its blocking thread) per file.
+
+Usage:
+    pool = AsyncWritePool('http://localhost:8086', org='local', bucket='garmin', token=token)
+    runner = AsyncIngestRunner(pool, concurrency=8)
+    stats = asyncio.run(runner.run(['a.jsonl', 'b.jsonl']))
+
+Use utils.influx_standin.StandInWriteServer as the URL to measure
+throughput and tail latency offline.
+"""
+
+import asyncio
+import gzip
+import json
+import ssl
+import sys
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from .batch_pipeline import DEFAULT_MAX_ITEMS, DEFAULT_MAX_RETRIES, jittered_backoff
+from .jsonl_writer import LatencyHistogram
+from .line_protocol import DailyRecordEncoder
+
+DEFAULT_CONCURRENCY = 8
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+
+
+class WriteError(Exception):
+    """Non-2xx response (status > 0) or connection failure (status 0)."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"HTTP {status}: {message}" if status else message)
+        self.status = status
+
+    @property
+    def retryable(self) -> bool:
+        return self.status == 0 or self.status in RETRYABLE_STATUS
+
+
+class _Connection:
+    __slots__ = ('reader', 'writer', 'requests')
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.requests = 0
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+async def read_http_response(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str], bytes]:
+    """Read one HTTP/1.1 response: (status, lower-cased headers, body)."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError("connection closed by server")
+    parts = status_line.decode('latin-1').split(' ', 2)
+    status = int(parts[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            if size == 0:
+                await reader.readline()
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+        body = b''.join(chunks)
+    elif 'content-length' in headers:
+        body = await reader.readexactly(int(headers['content-length']))
+    elif status in (204, 304) or status < 200:
+        body = b''
+    else:
+        body = await reader.read()
+        headers['connection'] = 'close'
+    return status, headers, body
+
+
+class AsyncWritePool:
+    """Pooled keep-alive connections posting gzip line protocol to /api/v2/write."""
+
+    def __init__(self, url: str, org: str, bucket: str, token: str = '',
+                 precision: str = 's', pool_size: int = DEFAULT_CONCURRENCY,
+                 gzip_level: int = 6, timeout: float = 30.0):
+        """
+        Args:
+            url: InfluxDB base URL (http:// or https://)
+            org, bucket, token: Write target and API token
+            precision: Timestamp precision of the lines ('s' for daily records)
+            pool_size: Max open connections (extra writers wait for one)
+            gzip_level: Body compression level (0 sends the body uncompressed)
+            timeout: Per-request timeout in seconds
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported URL scheme: {url}")
+        self.host = parts.hostname or 'localhost'
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.ssl = ssl.create_default_context() if parts.scheme == 'https' else None
+        self.path = parts.path.rstrip('/') + '/api/v2/write?' + urlencode(
+            {'org': org, 'bucket': bucket, 'precision': precision})
+        self.token = token
+        self.gzip_level = gzip_level
+        self.timeout = timeout
+        self.pool_size = pool_size
+
+        self._idle: List[_Connection] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.connections_opened = 0
+        self.requests = 0
+        self.reused_requests = 0
+        self.bytes_sent = 0
+        self.bytes_uncompressed = 0
+
+    async def _acquire(self) -> _Connection:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool_size)
+        await self._slots.acquire()
+        if self._idle:
+            return self._idle.pop()
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port, ssl=self.ssl), self.timeout)
+        except (asyncio.TimeoutError, OSError) as e:
+            self._slots.release()
+            raise WriteError(0, f"connect to {self.host}:{self.port} failed: {e!r}") from e
+        except BaseException:
+            self._slots.release()
+            raise
+        self.connections_opened += 1
+        return _Connection(reader, writer)
+
+    def _release(self, conn: _Connection, keep: bool) -> None:
+        if keep:
+            self._idle.append(conn)
+        else:
+            conn.close()
+        self._slots.release()
+
+    def _request_bytes(self, body: bytes) -> bytes:
+        headers = [
+            f"POST {self.path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "Content-Type: text/plain; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            "Connection: keep-alive",
+            "Accept: application/json",
+        ]
+        if self.gzip_level:
+            headers.append("Content-Encoding: gzip")
+        if self.token:
+            headers.append(f"Authorization: Token {self.token}")
+        return ('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + body
+
+    async def _send(self, conn: _Connection, request: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        conn.writer.write(request)
+        await conn.writer.drain()
+        return await read_http_response(conn.reader)
+
+    async def write(self, lines: Sequence[str]) -> None:
+        """
+        POST one batch of line-protocol lines.
+
+        A request on a reused connection that the server has since closed
+        is retried once on a fresh connection.
+
+        Raises:
+            WriteError: Non-2xx response or connection failure
+        """
+        payload = '\n'.join(lines).encode('utf-8')
+        body = gzip.compress(payload, self.gzip_level) if self.gzip_level else payload
+        request = self._request_bytes(body)
+
+        for attempt in range(2):
+            conn = await self._acquire()
+            reused = conn.requests > 0
+            try:
+                status, headers, response = await asyncio.wait_for(self._send(conn, request), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                self._release(conn, keep=False)
+                if reused and attempt == 0:
+                    continue  # stale keep-alive connection
+                raise WriteError(0, f"connection failed: {e}") from e
+            except (asyncio.TimeoutError, OSError) as e:
+                self._release(conn, keep=False)
+                raise WriteError(0, f"request failed: {e!r}") from e
+            except BaseException:
+                self._release(conn, keep=False)
+                raise
+            conn.requests += 1
+            self._release(conn, keep=headers.get('connection', '').lower() != 'close')
+            break
+
+        self.requests += 1
+        self.reused_requests += int(reused)
+        self.bytes_sent += len(body)
+        self.bytes_uncompressed += len(payload)
+        if not 200 <= status < 300:
+            message = response.decode('utf-8', 'replace')
+            try:
+                message = json.loads(message).get('message', message)
+            except (ValueError, AttributeError):
+                pass
+            raise WriteError(status, message)
+
+    async def close(self) -> None:
+        while self._idle:
+            conn = self._idle.pop()
+            conn.close()
+            try:
+                await conn.writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def __aenter__(self) -> 'AsyncWritePool':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def stats(self) -> Dict:
+        return {
+            'connections_opened': self.connections_opened,
+            'requests': self.requests,
+            'reused_requests': self.reused_requests,
+            'bytes_sent': self.bytes_sent,
+            'compression_ratio': round(self.bytes_uncompressed / self.bytes_sent, 2) if self.bytes_sent else 0.0,
+        }
+
+
+class AsyncIngestRunner:
+    """Ingests daily-record files through an AsyncWritePool with bounded concurrency."""
+
+    def __init__(self, pool: AsyncWritePool, concurrency: int = DEFAULT_CONCURRENCY,
+                 batch_points: int = DEFAULT_MAX_ITEMS, max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff_base: float = 0.5, backoff_max: float = 30.0):
+        """
+        Args:
+            pool: Write pool (its pool_size should be >= concurrency)
+            concurrency: Write requests in flight across all files
+            batch_points: Points per write request
+            max_retries: Retries per batch for retryable failures (429/5xx/connection)
+            backoff_base, backoff_max: Full-jitter backoff bounds in seconds
+        """
+        if concurrency <= 0 or batch_points <= 0:
+            raise ValueError("concurrency and batch_points must be positive")
+        self.pool = pool
+        self.concurrency = concurrency
+        self.batch_points = batch_points
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.request_latency = LatencyHistogram()  # per HTTP request
+        self.batch_latency = LatencyHistogram()    # per batch, incl. retries
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.batches_written = 0
+        self.points_written = 0
+        self.retries = 0
+        self.failed_batches = 0
+        self.failed_points = 0
+        self.max_observed_in_flight = 0
+        self._in_flight = 0
+
+    async def _write_batch(self, lines: List[str], file_stats: Dict) -> None:
+        started = time.monotonic()
+        attempt = 0
+        try:
+            while True:
+                request_started = time.monotonic()
+                try:
+                    await self.pool.write(lines)
+                    self.request_latency.observe((time.monotonic() - request_started) * 1000)
+                    break
+                except WriteError as e:
+                    self.request_latency.observe((time.monotonic() - request_started) * 1000)
+                    attempt += 1
+                    file_stats['last_error'] = str(e)
+                    if not e.retryable or attempt > self.max_retries:
+                        self.failed_batches += 1
+                        self.failed_points += len(lines)
+                        file_stats['failed_batches'] += 1
+                        return
+                    self.retries += 1
+                    await asyncio.sleep(jittered_backoff(attempt, self.backoff_base, self.backoff_max))
+            self.batch_latency.observe((time.monotonic() - started) * 1000)
+            self.batches_written += 1
+            self.points_written += len(lines)
+            file_stats['points_written'] += len(lines)
+        finally:
+            self._in_flight -= 1
+            self._slots.release()
+
+    async def _submit(self, lines: List[str], file_stats: Dict, tasks: List[asyncio.Task]) -> None:
+        await self._slots.acquire()  # backpressure: stop reading while `concurrency` requests are pending
+        self._in_flight += 1
+        self.max_observed_in_flight = max(self.max_observed_in_flight, self._in_flight)
+        tasks.append(asyncio.ensure_future(self._write_batch(lines, file_stats)))
+
+    async def ingest_file(self, records_path: str) -> Dict:
+        """Encode and write one file; returns its per-file summary."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.concurrency)
+        encoder = DailyRecordEncoder()
+        file_stats = {'file': str(records_path), 'records': 0, 'skipped': 0,
+                      'points_written': 0, 'failed_batches': 0, 'last_error': None}
+        tasks: List[asyncio.Task] = []
+        batch: List[str] = []
+        with open(records_path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    batch.extend(encoder.encode(json.loads(line)))
+                except (json.JSONDecodeError, KeyError, ValueError) as e:
+                    print(f"Warning: {records_path}: skipping line {line_no}: {e}", file=sys.stderr)
+                    file_stats['skipped'] += 1
+                    continue
+                file_stats['records'] += 1
+                if len(batch) >= self.batch_points:
+                    await self._submit(batch, file_stats, tasks)
+                    batch = []
+        if batch:
+            await self._submit(batch, file_stats, tasks)
+        await asyncio.gather(*tasks)
+        return file_stats
+
+    async def run(self, paths: Sequence[str]) -> Dict:
+        """Ingest all files concurrently, close the pool and return stats()."""
+        started = time.monotonic()
+        try:
+            files = await asyncio.gather(*(self.ingest_file(path) for path in paths))
+        finally:
+            await self.pool.close()
+        stats = self.stats(time.monotonic() - started)
+        stats['files'] = list(files)
+        return stats
+
+    def stats(self, elapsed: float = 0.0) -> Dict:
+        return {
+            'batches_written': self.batches_written,
+            'points_written': self.points_written,
+            'retries': self.retries,
+            'failed_batches': self.failed_batches,
+            'failed_points': self.failed_points,
+            'elapsed_s': round(elapsed, 3),
+            'points_per_sec': round(self.points_written / elapsed, 1) if elapsed > 0 else 0.0,
+            'concurrency': self.concurrency,
+            'max_observed_in_flight': self.max_observed_in_flight,
+            'request_latency': self.request_latency.to_dict(),
+            'batch_latency': self.batch_latency.to_dict(),
+            'pool': self.pool.stats(),
+        }
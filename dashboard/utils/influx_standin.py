@@ -0,0 +1,210 @@
+"""
+Local stand-in for InfluxDB's write endpoint, for tests and benchmarks.
+
+Speaks enough HTTP/1.1 (keep-alive, gzip request bodies) to accept
+POST /api/v2/write and GET /health, records every write, and can inject
+latency and errors. It runs on its own event loop in a background thread,
+so both synchronous and asyncio callers can use it.
+
+Usage:
+    with StandInWriteServer(latency_ms=5, error_rate=0.01) as server:
+        ... write to server.url ...
+        print(server.stats())
+"""
+
+import asyncio
+import gzip
+import json
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+
+class StandInWriteServer:
+    """Records /api/v2/write payloads; optional latency and error injection."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503,
+                 fail_first: int = 0, max_requests_per_connection: int = 0,
+                 keep_payloads: bool = True,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            host, port: Listen address (port 0 picks a free port)
+            latency_ms: Delay before answering each write
+            jitter_ms: Extra uniform random delay in [0, jitter_ms]
+            error_rate: Fraction of writes answered with error_status
+            error_status: Status used for injected errors (e.g. 503, 429, 400)
+            fail_first: Always fail the first N writes (deterministic tests)
+            max_requests_per_connection: Close each connection after N
+                requests (0: keep alive until the client closes)
+            keep_payloads: Keep the decoded writes (off for long benchmarks)
+            seed: RNG seed for jitter and errors
+        """
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.fail_first = fail_first
+        self.max_requests_per_connection = max_requests_per_connection
+        self.keep_payloads = keep_payloads
+        self._rng = random.Random(seed)
+
+        self._lock = threading.Lock()
+        self.writes: List[Dict] = []
+        self.connections = 0
+        self.requests = 0
+        self.write_requests = 0
+        self.errors_injected = 0
+        self.points_received = 0
+        self.bytes_received = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> 'StandInWriteServer':
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._serve, name='influx-standin', daemon=True)
+            self._thread.start()
+            self._ready.wait(5)
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None and self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(5)
+            self._thread = None
+
+    def __enter__(self) -> 'StandInWriteServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _serve(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, self.host, self.port))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+            self._loop.run_until_complete(self._server.wait_closed())
+            for task in asyncio.all_tasks(self._loop):
+                task.cancel()
+            self._loop.run_until_complete(asyncio.sleep(0))
+            self._loop.close()
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            if self.write_requests <= self.fail_first:
+                return True
+            return self.error_rate > 0 and self._rng.random() < self.error_rate
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        with self._lock:
+            self.connections += 1
+        served = 0
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                status, response = await self._respond(method, target, headers, body)
+                served += 1
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and served != self.max_requests_per_connection)
+                writer.write(self._response_bytes(status, response, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, method: str, target: str, headers: Dict[str, str], body: bytes):
+        with self._lock:
+            self.requests += 1
+        path = urlsplit(target).path
+        if method == 'GET' and path in ('/health', '/ping'):
+            return 200, {'name': 'influxdb-standin', 'status': 'pass'}
+        if method != 'POST' or path != '/api/v2/write':
+            return 404, {'code': 'not found', 'message': f'{method} {path}'}
+
+        with self._lock:
+            self.write_requests += 1
+        delay = self.latency_ms + (self._rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        if self._should_fail():
+            with self._lock:
+                self.errors_injected += 1
+            return self.error_status, {'code': 'unavailable', 'message': 'injected error'}
+
+        raw_size = len(body)
+        try:
+            if headers.get('content-encoding', '').lower() == 'gzip':
+                body = gzip.decompress(body)
+            text = body.decode('utf-8')
+        except (OSError, UnicodeDecodeError) as e:
+            return 400, {'code': 'invalid', 'message': f'bad body: {e}'}
+        lines = [line for line in text.split('\n') if line]
+        query = {k: v[0] for k, v in parse_qs(urlsplit(target).query).items()}
+        with self._lock:
+            self.points_received += len(lines)
+            self.bytes_received += raw_size
+            if self.keep_payloads:
+                self.writes.append({'org': query.get('org'), 'bucket': query.get('bucket'),
+                                    'precision': query.get('precision'),
+                                    'encoding': headers.get('content-encoding', 'identity'),
+                                    'lines': lines, 'received_at': time.time()})
+        return 204, None
+
+    @staticmethod
+    def _response_bytes(status: int, payload: Optional[Dict], keep_alive: bool) -> bytes:
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        head = [f"HTTP/1.1 {status} {'OK' if status < 300 else 'Error'}",
+                f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if status != 204:
+            head += ["Content-Type: application/json", f"Content-Length: {len(body)}"]
+        return ('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body
+
+    def lines(self) -> List[str]:
+        """All recorded line-protocol lines, in arrival order."""
+        with self._lock:
+            return [line for write in self.writes for line in write['lines']]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'connections': self.connections,
+                'requests': self.requests,
+                'write_requests': self.write_requests,
+                'errors_injected': self.errors_injected,
+                'points_received': self.points_received,
+                'bytes_received': self.bytes_received,
+            }
@@ -0,0 +1,132 @@
+"""
+Per-file ingestion checkpoints for resumable InfluxDB ingestion.
+
+A checkpoint records how far into a JSONL file ingestion has durably got:
+
+    {"version", "file", "inode", "offset", "last_line_offset",
+     "last_line_hash", "last_date", "records", "updated_at"}
+
+offset is the byte just past the last ingested line; last_line_hash is a
+sha1 of that line (newline stripped). On the next run plan_resume()
+checks the file still matches: same inode, at least offset bytes, and the
+same last line. If so, ingestion resumes at offset. If the file was
+truncated or rewritten (e.g. by remediation), it falls back to a full
+re-ingest, or to a window of rewind_days before the checkpoint's
+last_date. Re-sending points is safe because InfluxDB overwrites points
+with the same series and timestamp.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, Optional, Tuple
+
+CHECKPOINT_VERSION = 1
+
+
+def checkpoint_path(records_path: str) -> str:
+    """Default checkpoint sidecar for a records file."""
+    return f"{records_path}.ingest-checkpoint.json"
+
+
+def line_hash(line: bytes) -> str:
+    """Content hash of one JSONL line, ignoring its line ending."""
+    return hashlib.sha1(line.rstrip(b'\r\n')).hexdigest()
+
+
+def iter_lines_from(records_path: str, start_offset: int = 0) -> Iterator[Tuple[bytes, int, int, bool]]:
+    """
+    Yield (line, line_offset, end_offset, complete) for each line from start_offset.
+
+    complete is False for a final line without a trailing newline: it may
+    still be being written, so a checkpoint should not move past it.
+    """
+    with open(records_path, 'rb') as f:
+        f.seek(start_offset)
+        offset = start_offset
+        for raw in f:
+            yield raw, offset, offset + len(raw), raw.endswith(b'\n')
+            offset += len(raw)
+
+
+def load_checkpoint(path: str) -> Optional[Dict]:
+    """Checkpoint dict, or None if missing/unreadable/other version."""
+    try:
+        with open(path, 'r') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(checkpoint, dict) or checkpoint.get('version') != CHECKPOINT_VERSION:
+        return None
+    return checkpoint
+
+
+def save_checkpoint(path: str, checkpoint: Dict) -> None:
+    """Atomically write a checkpoint (temp file + rename)."""
+    checkpoint = dict(checkpoint, version=CHECKPOINT_VERSION, updated_at=datetime.now().isoformat())
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + '_', dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(checkpoint, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _fallback(checkpoint: Dict, reason: str, rewind_days: Optional[int]) -> Dict:
+    last_date = checkpoint.get('last_date')
+    if rewind_days is not None and last_date:
+        try:
+            cutoff = datetime.strptime(last_date[:10], '%Y-%m-%d') - timedelta(days=rewind_days)
+        except ValueError:
+            cutoff = None
+        if cutoff is not None:
+            return {'mode': 'window', 'start_offset': 0, 'min_date': cutoff.strftime('%Y-%m-%d'),
+                    'reason': reason}
+    return {'mode': 'full', 'start_offset': 0, 'min_date': None, 'reason': reason}
+
+
+def plan_resume(records_path: str, checkpoint: Optional[Dict], rewind_days: Optional[int] = None) -> Dict:
+    """
+    Decide where ingestion of records_path should start.
+
+    Args:
+        records_path: JSONL file about to be ingested
+        checkpoint: Loaded checkpoint (None for first run)
+        rewind_days: On truncation/rewrite, re-ingest only records dated within
+            this many days before the checkpoint's last_date (None: full re-ingest)
+
+    Returns:
+        {'mode': 'full'|'resume'|'window'|'up_to_date', 'start_offset',
+         'min_date', 'reason'}
+    """
+    if checkpoint is None:
+        return {'mode': 'full', 'start_offset': 0, 'min_date': None, 'reason': 'no checkpoint'}
+
+    stat = os.stat(records_path)
+    offset = checkpoint.get('offset', 0)
+    if checkpoint.get('inode') != stat.st_ino:
+        return _fallback(checkpoint, 'file replaced (inode changed)', rewind_days)
+    if stat.st_size < offset:
+        return _fallback(checkpoint, f'file truncated ({stat.st_size} < {offset} bytes)', rewind_days)
+
+    last_line_offset = checkpoint.get('last_line_offset', -1)
+    if last_line_offset >= 0:
+        with open(records_path, 'rb') as f:
+            f.seek(last_line_offset)
+            line = f.readline()
+        if last_line_offset + len(line.rstrip(b'\r\n')) > offset or line_hash(line) != checkpoint.get('last_line_hash'):
+            return _fallback(checkpoint, 'file rewritten (last ingested line changed)', rewind_days)
+
+    if stat.st_size == offset:
+        return {'mode': 'up_to_date', 'start_offset': offset, 'min_date': None, 'reason': 'no new data'}
+    return {'mode': 'resume', 'start_offset': offset, 'min_date': None,
+            'reason': f'resuming at byte {offset}'}
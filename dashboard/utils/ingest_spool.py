@@ -0,0 +1,308 @@
+"""
+On-disk write-ahead spool of line-protocol batches.
+
+While InfluxDB is unreachable, encoded batches are appended to the spool
+instead of being dropped; once it recovers they are drained oldest-first
+at a capped points/sec, so an outage does not turn into a burst of
+backfill writes. The spool is a directory:
+
+    seg_00000001.lp ...   append-only segments of framed batches
+    spool.json            drain cursor, next segment number, counters
+    spool.lock            flock, so cron runs can share a spool
+
+Each frame is a 20-byte header <payload_len, crc32, points, created_at>
+followed by the newline-joined lines (UTF-8). A torn frame at the end of
+the newest segment is cut off on the next append. When the spool exceeds
+max_bytes, whole segments are evicted oldest-first and counted.
+
+Usage:
+    spool = IngestSpool('data/ingest_spool', max_bytes=256 * 1024 * 1024)
+    spool.append(lines)                                # sink down
+    spool.drain(write_batch, points_per_sec=5000)      # sink back
+    spool.stats()                                      # depth metrics
+"""
+
+import json
+import os
+import struct
+import tempfile
+import time
+import zlib
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .file_utils import jsonl_lock
+from .rate_limiter import TokenBucket
+
+FRAME_HEADER = struct.Struct('<IIId')  # payload_len, crc32, points, created_at
+SEGMENT_PREFIX = 'seg_'
+SEGMENT_SUFFIX = '.lp'
+STATE_FILE = 'spool.json'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _segment_name(seq: int) -> str:
+    return f"{SEGMENT_PREFIX}{seq:08d}{SEGMENT_SUFFIX}"
+
+
+def _read_frames(path: str, offset: int = 0, headers_only: bool = False
+                 ) -> Iterator[Tuple[int, int, int, float, Optional[bytes]]]:
+    """
+    Yield (frame_offset, frame_end, points, created_at, payload) from offset.
+
+    Stops at the first short or corrupt frame (payload is None with
+    headers_only, and the crc is then not checked).
+    """
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        f.seek(offset)
+        while offset + FRAME_HEADER.size <= size:
+            length, crc, points, created_at = FRAME_HEADER.unpack(f.read(FRAME_HEADER.size))
+            end = offset + FRAME_HEADER.size + length
+            if end > size:
+                return
+            if headers_only:
+                f.seek(length, os.SEEK_CUR)
+                payload = None
+            else:
+                payload = f.read(length)
+                if zlib.crc32(payload) != crc:
+                    return
+            yield offset, end, points, created_at, payload
+            offset = end
+
+
+class IngestSpool:
+    """Directory-backed FIFO of line-protocol batches with a size cap."""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES,
+                 segment_bytes: Optional[int] = None):
+        """
+        Args:
+            directory: Spool directory (created if missing)
+            max_bytes: Cap on undrained spool bytes; oldest segments are evicted beyond it
+            segment_bytes: Roll to a new segment past this size (default: max_bytes / 8),
+                which is also the eviction granularity
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes or max(max_bytes // 8, 1)
+        os.makedirs(directory, exist_ok=True)
+        self.state_path = os.path.join(directory, STATE_FILE)
+        self.lock_target = os.path.join(directory, 'spool')  # jsonl_lock -> spool.lock
+
+    # State ---------------------------------------------------------------
+
+    def _load_state(self) -> Dict:
+        try:
+            with open(self.state_path, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        state.setdefault('cursor', {'segment': None, 'offset': 0})
+        state.setdefault('next_seq', 1)
+        state.setdefault('active', {'segment': None, 'size': 0})
+        for counter in ('appended_batches', 'appended_points', 'drained_batches', 'drained_points',
+                        'evicted_batches', 'evicted_points'):
+            state.setdefault(counter, 0)
+        return state
+
+    def _save_state(self, state: Dict) -> None:
+        fd, tmp = tempfile.mkstemp(prefix='spool_', suffix='.tmp', dir=self.directory)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp, self.state_path)
+
+    def segments(self) -> List[str]:
+        """Segment file names, oldest first."""
+        return sorted(name for name in os.listdir(self.directory)
+                      if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX))
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _start_offset(self, state: Dict, name: str) -> int:
+        """Undrained start of a segment (the cursor only points into the oldest one)."""
+        cursor = state['cursor']
+        return cursor['offset'] if cursor['segment'] == name else 0
+
+    def _undrained(self, state: Dict) -> List[Tuple[str, int, int]]:
+        """(segment, start_offset, size) for segments with undrained data."""
+        result = []
+        for name in self.segments():
+            size = os.path.getsize(self._path(name))
+            start = self._start_offset(state, name)
+            result.append((name, start, size))
+        return result
+
+    # Append / evict ---------------------------------------------------------
+
+    def append(self, lines: Sequence[str]) -> None:
+        """Durably append one batch (fsync) and evict old segments over the cap."""
+        payload = '\n'.join(lines).encode('utf-8')
+        frame = FRAME_HEADER.pack(len(payload), zlib.crc32(payload), len(lines), time.time()) + payload
+        with jsonl_lock(self.lock_target):
+            state = self._load_state()
+            segments = self.segments()
+            name = segments[-1] if segments else None
+            if name is not None:
+                size = os.path.getsize(self._path(name))
+                active = state['active']
+                if active['segment'] != name or active['size'] != size:
+                    size = self._repair_tail(name)
+                if size + len(frame) > self.segment_bytes and size > 0:
+                    name = None
+            if name is None:
+                if segments:  # state file lost: never reuse or reorder segment numbers
+                    last_seq = int(segments[-1][len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+                    state['next_seq'] = max(state['next_seq'], last_seq + 1)
+                name = _segment_name(state['next_seq'])
+                state['next_seq'] += 1
+
+            path = self._path(name)
+            with open(path, 'ab') as f:
+                f.write(frame)
+                f.flush()
+                os.fsync(f.fileno())
+            state['active'] = {'segment': name, 'size': os.path.getsize(path)}
+            state['appended_batches'] += 1
+            state['appended_points'] += len(lines)
+            self._evict(state)
+            self._save_state(state)
+
+    def _repair_tail(self, name: str) -> int:
+        """Truncate a torn trailing frame; returns the valid segment size."""
+        path = self._path(name)
+        valid = 0
+        for _, end, _, _, _ in _read_frames(path):
+            valid = end
+        if valid != os.path.getsize(path):
+            with open(path, 'r+b') as f:
+                f.truncate(valid)
+        return valid
+
+    def _evict(self, state: Dict) -> None:
+        undrained = self._undrained(state)
+        total = sum(size - start for _, start, size in undrained)
+        # Never evict the newest segment: it holds the batch just appended
+        for name, start, size in undrained[:-1]:
+            if total <= self.max_bytes:
+                break
+            for _, _, points, _, _ in _read_frames(self._path(name), start, headers_only=True):
+                state['evicted_batches'] += 1
+                state['evicted_points'] += points
+            os.unlink(self._path(name))
+            total -= size - start
+            if state['cursor']['segment'] == name:
+                state['cursor'] = {'segment': None, 'offset': 0}
+
+    # Drain ---------------------------------------------------------------
+
+    def _next_batch(self, state: Dict) -> Optional[Tuple[str, int, int, List[str]]]:
+        for name in self.segments():
+            start = self._start_offset(state, name)
+            for _, end, points, _, payload in _read_frames(self._path(name), start):
+                return name, end, points, payload.decode('utf-8').split('\n') if payload else []
+            # Fully drained (or only a torn tail): drop unless it is still being appended to
+            if name != self.segments()[-1]:
+                os.unlink(self._path(name))
+                if state['cursor']['segment'] == name:
+                    state['cursor'] = {'segment': None, 'offset': 0}
+        return None
+
+    def _commit(self, state: Dict, name: str, end: int, points: int) -> None:
+        state['drained_batches'] += 1
+        state['drained_points'] += points
+        path = self._path(name)
+        if end >= os.path.getsize(path):
+            os.unlink(path)
+            state['cursor'] = {'segment': None, 'offset': 0}
+            if state['active']['segment'] == name:
+                state['active'] = {'segment': None, 'size': 0}
+        else:
+            state['cursor'] = {'segment': name, 'offset': end}
+
+    def drain(self, write_batch: Callable[[List[str]], None], points_per_sec: float = 0,
+              max_batches: Optional[int] = None) -> Dict:
+        """
+        Write spooled batches oldest-first until empty or the sink fails.
+
+        Args:
+            write_batch: Sink; raises on failure (the batch stays spooled)
+            points_per_sec: Drain rate cap (0: unlimited)
+            max_batches: Stop after this many batches
+
+        Returns:
+            {'batches', 'points', 'error', 'elapsed_s', 'remaining': stats()}
+        """
+        limiter = TokenBucket(points_per_sec) if points_per_sec and points_per_sec > 0 else None
+        started = time.monotonic()
+        drained_batches = drained_points = 0
+        error = None
+        while max_batches is None or drained_batches < max_batches:
+            with jsonl_lock(self.lock_target):
+                state = self._load_state()
+                batch = self._next_batch(state)
+                self._save_state(state)
+            if batch is None:
+                break
+            name, end, points, lines = batch
+            if limiter is not None:
+                limiter.acquire(points)
+            try:
+                write_batch(lines)
+            except Exception as e:
+                error = str(e)
+                break
+            with jsonl_lock(self.lock_target):
+                state = self._load_state()
+                # Skip if the segment was evicted while the batch was in flight
+                if os.path.exists(self._path(name)) and self._start_offset(state, name) < end:
+                    self._commit(state, name, end, points)
+                self._save_state(state)
+            drained_batches += 1
+            drained_points += points
+        return {
+            'batches': drained_batches,
+            'points': drained_points,
+            'error': error,
+            'elapsed_s': round(time.monotonic() - started, 3),
+            'remaining': self.stats(),
+        }
+
+    # Metrics ---------------------------------------------------------------
+
+    def stats(self) -> Dict:
+        """Spool depth (batches, points, bytes, oldest batch age) and lifetime counters."""
+        with jsonl_lock(self.lock_target):
+            state = self._load_state()
+            depth_batches = depth_points = depth_bytes = 0
+            oldest = None
+            segments = self._undrained(state)
+            for name, start, _ in segments:
+                for offset, end, points, created_at, _ in _read_frames(self._path(name), start,
+                                                                        headers_only=True):
+                    depth_batches += 1
+                    depth_points += points
+                    depth_bytes += end - offset
+                    if oldest is None:
+                        oldest = created_at
+        return {
+            'segments': len(segments),
+            'depth_batches': depth_batches,
+            'depth_points': depth_points,
+            'depth_bytes': depth_bytes,
+            'max_bytes': self.max_bytes,
+            'oldest_age_s': round(time.time() - oldest, 1) if oldest is not None else 0.0,
+            'appended_batches': state['appended_batches'],
+            'appended_points': state['appended_points'],
+            'drained_batches': state['drained_batches'],
+            'drained_points': state['drained_points'],
+            'evicted_batches': state['evicted_batches'],
+            'evicted_points': state['evicted_points'],
+        }
@@ -0,0 +1,324 @@
+"""
+Date-indexed sidecar for JSONL history files.
+
+Maps record date -> byte offset so date-window reads seek straight to the
+matching lines instead of parsing the whole file.
+
+Sidecar layout (next to the data file):
+    <file>.idx       fixed-width entries sorted by (date, offset):
+                     10-byte ASCII date (YYYY-MM-DD) + uint64 offset
+    <file>.idx.meta  JSON: inode, indexed byte size, entry count and a hash
+                     of the last indexed line (detects rewrites)
+
+The index is a rebuildable cache. Appends are indexed incrementally (only
+the new bytes are parsed); a missing, stale or rewritten index is rebuilt
+transparently on the next read. Readers never fail because the sidecar
+cannot be written (read-only or foreign-owned data directory): they fall
+back to a full scan indexed in memory (load_index).
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import re
+import struct
+import tempfile
+from typing import Dict, Iterator, List, Optional, Tuple
+
+INDEX_VERSION = 1
+ENTRY = struct.Struct('<10sQ')
+_DATE_RE = re.compile(r'^[0-9]{4}-[0-9]{2}-[0-9]{2}')
+
+
+def index_paths(file_path: str) -> Tuple[str, str]:
+    """Return (entries_path, meta_path) for a data file."""
+    return f"{file_path}.idx", f"{file_path}.idx.meta"
+
+
+def _index_key(record: Dict, date_field: str) -> Optional[bytes]:
+    value = record.get(date_field) if isinstance(record, dict) else None
+    if not isinstance(value, str) or not _DATE_RE.match(value):
+        return None
+    return value[:10].encode('ascii')
+
+
+def _scan_lines(file_path: str, start: int, date_field: str) -> Tuple[List[Tuple[bytes, int]], int, int, str]:
+    """
+    Parse complete lines from byte offset start.
+
+    Returns:
+        (entries, end_offset, last_line_offset, last_line_hash); a trailing
+        line without newline is left for a later scan
+    """
+    entries = []
+    end = start
+    last_offset, last_hash = -1, ''
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        offset = start
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            if line.strip():
+                try:
+                    key = _index_key(json.loads(line), date_field)
+                except ValueError:
+                    key = None
+                if key is not None:
+                    entries.append((key, offset))
+                last_offset, last_hash = offset, hashlib.sha1(line).hexdigest()
+            offset += len(line)
+            end = offset
+    return entries, end, last_offset, last_hash
+
+
+def _write_meta(meta_path: str, meta: Dict) -> None:
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(meta_path) + '_', dir=os.path.dirname(meta_path) or '.')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp, meta_path)
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _load_meta(meta_path: str) -> Optional[Dict]:
+    try:
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        return meta if meta.get('version') == INDEX_VERSION else None
+    except (OSError, ValueError):
+        return None
+
+
+def _meta_is_consistent(file_path: str, meta: Dict, date_field: str) -> bool:
+    """True if the indexed prefix of the data file is unchanged."""
+    try:
+        stat = os.stat(file_path)
+        entries_size = os.path.getsize(index_paths(file_path)[0])
+    except OSError:
+        return False
+    if meta.get('date_field') != date_field or meta.get('inode') != stat.st_ino:
+        return False
+    if meta['size'] > stat.st_size or entries_size < meta['count'] * ENTRY.size:
+        return False
+    if meta['tail_offset'] < 0:
+        return True
+    with open(file_path, 'rb') as f:
+        f.seek(meta['tail_offset'])
+        return hashlib.sha1(f.readline()).hexdigest() == meta['tail_hash']
+
+
+def build_index(file_path: str, date_field: str = 'date') -> 'DateIndex':
+    """Fully (re)build the sidecar index for file_path."""
+    entries_path, meta_path = index_paths(file_path)
+    entries, end, tail_offset, tail_hash = _scan_lines(file_path, 0, date_field)
+    entries.sort()
+
+    # Invalidate the old meta first: if writing the new one then fails, the
+    # rewritten entries are never read against a stale count
+    if os.path.exists(meta_path):
+        os.unlink(meta_path)
+    with open(entries_path, 'wb') as f:
+        f.write(b''.join(ENTRY.pack(key, offset) for key, offset in entries))
+
+    meta = {
+        'version': INDEX_VERSION,
+        'date_field': date_field,
+        'inode': os.stat(file_path).st_ino,
+        'size': end,
+        'count': len(entries),
+        'tail_offset': tail_offset,
+        'tail_hash': tail_hash,
+    }
+    _write_meta(meta_path, meta)
+    return DateIndex(file_path, meta)
+
+
+def update_index(file_path: str, date_field: str = 'date') -> 'DateIndex':
+    """
+    Bring the sidecar up to date with file_path.
+
+    Appended bytes are indexed incrementally; a missing, stale or
+    rewritten index (inode change, truncation, edited tail) is rebuilt.
+    """
+    entries_path, meta_path = index_paths(file_path)
+    meta = _load_meta(meta_path)
+    if meta is None or not _meta_is_consistent(file_path, meta, date_field):
+        return build_index(file_path, date_field)
+
+    if os.path.getsize(file_path) == meta['size']:
+        return DateIndex(file_path, meta)
+
+    new_entries, end, tail_offset, tail_hash = _scan_lines(file_path, meta['size'], date_field)
+    if end == meta['size']:
+        return DateIndex(file_path, meta)  # only a partial trailing line so far
+    new_entries.sort()
+
+    with open(entries_path, 'r+b') as f:
+        f.truncate(meta['count'] * ENTRY.size)  # drop entries beyond a crashed update
+        if meta['count']:
+            f.seek((meta['count'] - 1) * ENTRY.size)
+            last_key = ENTRY.unpack(f.read(ENTRY.size))[0]
+        else:
+            last_key = b''
+        if not new_entries or new_entries[0][0] >= last_key:
+            # Common case: dates keep increasing, append in place
+            f.seek(0, os.SEEK_END)
+            f.write(b''.join(ENTRY.pack(key, offset) for key, offset in new_entries))
+        else:
+            f.seek(0)
+            existing = [ENTRY.unpack_from(buf) for buf in iter(lambda: f.read(ENTRY.size), b'')]
+            merged = sorted(existing + new_entries)
+            f.seek(0)
+            f.truncate()
+            f.write(b''.join(ENTRY.pack(key, offset) for key, offset in merged))
+
+    meta.update({
+        'size': end,
+        'count': meta['count'] + len(new_entries),
+        'tail_offset': tail_offset,
+        'tail_hash': tail_hash,
+    })
+    _write_meta(meta_path, meta)
+    return DateIndex(file_path, meta)
+
+
+def memory_index(file_path: str, date_field: str = 'date') -> 'DateIndex':
+    """Index file_path with a full scan, in memory only (no sidecar is read or written)."""
+    entries, end, tail_offset, tail_hash = _scan_lines(file_path, 0, date_field)
+    entries.sort()
+    meta = {
+        'version': INDEX_VERSION,
+        'date_field': date_field,
+        'inode': os.stat(file_path).st_ino,
+        'size': end,
+        'count': len(entries),
+        'tail_offset': tail_offset,
+        'tail_hash': tail_hash,
+    }
+    return DateIndex(file_path, meta, b''.join(ENTRY.pack(key, offset) for key, offset in entries))
+
+
+def load_index(file_path: str, date_field: str = 'date') -> 'DateIndex':
+    """update_index(), or memory_index() if the sidecar cannot be written."""
+    try:
+        return update_index(file_path, date_field)
+    except OSError:
+        return memory_index(file_path, date_field)
+
+
+def update_index_if_present(file_path: str) -> None:
+    """Incrementally update an existing sidecar (no-op when unindexed)."""
+    meta = _load_meta(index_paths(file_path)[1])
+    if meta is not None:
+        update_index(file_path, meta.get('date_field', 'date'))
+
+
+class DateIndex:
+    """Read view over a sidecar index (entries sorted by date, offset)."""
+
+    def __init__(self, file_path: str, meta: Dict, entries: Optional[bytes] = None):
+        self.file_path = file_path
+        self.meta = meta
+        if entries is None:
+            with open(index_paths(file_path)[0], 'rb') as f:
+                entries = f.read(meta['count'] * ENTRY.size)
+        self._entries = entries
+
+    def __len__(self) -> int:
+        return self.meta['count']
+
+    def _key(self, i: int) -> bytes:
+        return self._entries[i * ENTRY.size:i * ENTRY.size + 10]
+
+    def _offset(self, i: int) -> int:
+        return ENTRY.unpack_from(self._entries, i * ENTRY.size)[1]
+
+    def _bisect(self, date: str, right: bool) -> int:
+        keys = _KeyView(self)
+        key = date.encode('ascii')
+        return bisect.bisect_right(keys, key) if right else bisect.bisect_left(keys, key)
+
+    def offsets(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[int]:
+        """Byte offsets of records with start_date <= date <= end_date, in file order."""
+        lo = self._bisect(start_date[:10], right=False) if start_date else 0
+        hi = self._bisect(end_date[:10], right=True) if end_date else len(self)
+        return sorted(self._offset(i) for i in range(lo, hi))
+
+    def bounds(self) -> Tuple[Optional[str], Optional[str]]:
+        """(oldest_date, newest_date) of indexed records."""
+        if not len(self):
+            return None, None
+        return self._key(0).decode('ascii'), self._key(len(self) - 1).decode('ascii')
+
+    def dates(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[str]:
+        """Distinct dates with start_date <= date <= end_date, ascending (no record parsing)."""
+        lo = self._bisect(start_date[:10], right=False) if start_date else 0
+        hi = self._bisect(end_date[:10], right=True) if end_date else len(self)
+        dates = []
+        for i in range(lo, hi):
+            key = self._key(i).decode('ascii')
+            if not dates or dates[-1] != key:
+                dates.append(key)
+        return dates
+
+
+class _KeyView:
+    """Sequence adapter so bisect can search the packed entry keys."""
+
+    def __init__(self, index: DateIndex):
+        self._index = index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getitem__(self, i: int) -> bytes:
+        return self._index._key(i)
+
+
+def iter_range(file_path: str, start_date: Optional[str] = None, end_date: Optional[str] = None,
+               date_field: str = 'date') -> Iterator[Dict]:
+    """
+    Yield records whose date falls in [start_date, end_date] (inclusive,
+    YYYY-MM-DD; None leaves that side open), in file order.
+    """
+    if not os.path.exists(file_path):
+        return
+    index = load_index(file_path, date_field)
+    offsets = index.offsets(start_date, end_date)
+    if not offsets:
+        return
+    with open(file_path, 'rb') as f:
+        for offset in offsets:
+            f.seek(offset)
+            try:
+                yield json.loads(f.readline())
+            except ValueError:
+                continue
+
+
+def read_range(file_path: str, start_date: Optional[str] = None, end_date: Optional[str] = None,
+               date_field: str = 'date') -> List[Dict]:
+    """List form of iter_range."""
+    return list(iter_range(file_path, start_date, end_date, date_field))
+
+
+def indexed_dates(file_path: str, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                  date_field: str = 'date') -> List[str]:
+    """Distinct dates present in file_path within [start_date, end_date], via the index."""
+    if not os.path.exists(file_path):
+        return []
+    return load_index(file_path, date_field).dates(start_date, end_date)
+
+
+def date_bounds(file_path: str, date_field: str = 'date') -> Tuple[Optional[str], Optional[str]]:
+    """(oldest_date, newest_date) in file_path via the index."""
+    if not os.path.exists(file_path):
+        return None, None
+    return load_index(file_path, date_field).bounds()
@@ -0,0 +1,267 @@
+"""
+Group-commit JSONL writer.
+
+A long-lived background writer that queues records from many producers,
+coalesces them per target file and commits each file with a single
+append + fsync per batch window. Trades a bounded delay (max_delay_ms)
+for far fewer fsyncs than one durable write per call.
+
+Usage:
+    with JsonlWriter(max_batch_records=500, max_delay_ms=20) as writer:
+        writer.write('data/telemetry_20250801.jsonl', records)   # blocks until durable
+        future = writer.submit('data/alert_history.jsonl', [alert])  # async
+    print(writer.stats())
+"""
+
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+from .file_utils import append_jsonl_payload
+
+
+def _writer_defaults():
+    try:
+        from config import Config
+    except ImportError:
+        from dashboard.config import Config
+    return Config.JSONL_WRITER_MAX_BATCH, Config.JSONL_WRITER_MAX_DELAY_MS
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds), thread-safe."""
+
+    BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)  # last bucket: > 5000ms
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, latency_ms: float) -> None:
+        index = len(self.BUCKETS_MS)
+        for i, bound in enumerate(self.BUCKETS_MS):
+            if latency_ms <= bound:
+                index = i
+                break
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum_ms += latency_ms
+            self.max_ms = max(self.max_ms, latency_ms)
+
+    def percentile(self, pct: float) -> float:
+        """Upper bucket bound containing the given percentile (0 if empty)."""
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            rank = pct / 100.0 * self.count
+            seen = 0
+            for i, bucket_count in enumerate(self.counts):
+                seen += bucket_count
+                if seen >= rank and bucket_count:
+                    return float(self.BUCKETS_MS[i]) if i < len(self.BUCKETS_MS) else self.max_ms
+            return self.max_ms
+
+    def to_dict(self) -> Dict:
+        buckets = {f"le_{bound}ms": count for bound, count in zip(self.BUCKETS_MS, self.counts)}
+        buckets['gt_5000ms'] = self.counts[-1]
+        return {
+            'count': self.count,
+            'avg_ms': round(self.sum_ms / self.count, 3) if self.count else 0.0,
+            'max_ms': round(self.max_ms, 3),
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'buckets': buckets,
+        }
+
+
+class _WriteRequest:
+    __slots__ = ('file_path', 'payload', 'records', 'future', 'enqueued_at')
+
+    def __init__(self, file_path: Optional[str], payload: bytes, records: int):
+        self.file_path = file_path  # None marks a flush barrier
+        self.payload = payload
+        self.records = records
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+_STOP = object()
+
+
+class JsonlWriter:
+    """Background group-commit writer for JSONL appends."""
+
+    def __init__(self, max_batch_records: int = None, max_delay_ms: float = None):
+        """
+        Initialize writer (call start() or use as a context manager).
+
+        Args:
+            max_batch_records: Commit once this many records are pending
+                (default Config.JSONL_WRITER_MAX_BATCH)
+            max_delay_ms: Longest a record waits for batch-mates before commit
+                (default Config.JSONL_WRITER_MAX_DELAY_MS); 0 commits whatever
+                is already queued immediately
+        """
+        default_batch, default_delay_ms = _writer_defaults()
+        self.max_batch_records = max_batch_records or default_batch
+        self.max_delay_ms = default_delay_ms if max_delay_ms is None else max_delay_ms
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        self.commit_latency = LatencyHistogram()  # enqueue -> durable, per write call
+        self.fsync_latency = LatencyHistogram()   # append + fsync, per file per batch
+        self.batches = 0
+        self.file_commits = 0
+        self.records_committed = 0
+        self.errors = 0
+
+    def start(self) -> 'JsonlWriter':
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='jsonl-writer', daemon=True)
+            self._thread.start()
+        return self
+
+    def __enter__(self) -> 'JsonlWriter':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def submit(self, file_path: str, records: List[Dict]) -> Future:
+        """
+        Queue records for append to file_path.
+
+        Returns:
+            Future resolving to the record count once fsynced (or raising)
+        """
+        if self._closed:
+            raise RuntimeError("JsonlWriter is closed")
+        self.start()
+        payload = ''.join(json.dumps(record) + '\n' for record in records).encode('utf-8')
+        request = _WriteRequest(str(file_path), payload, len(records))
+        self._queue.put(request)
+        return request.future
+
+    def write(self, file_path: str, records: List[Dict], timeout: float = None) -> bool:
+        """Queue records and block until they are durable. Returns False on error."""
+        try:
+            self.submit(file_path, records).result(timeout=timeout)
+            return True
+        except Exception as e:
+            print(f"❌ Group-commit write failed for {file_path}: {e}")
+            return False
+
+    def flush(self, timeout: float = None) -> None:
+        """Block until everything queued before this call is committed."""
+        barrier = _WriteRequest(None, b'', 0)
+        self.start()
+        self._queue.put(barrier)
+        barrier.future.result(timeout=timeout)
+
+    def close(self) -> None:
+        """Commit remaining records and stop the background thread."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            pending = item.records
+            if item.file_path is None:
+                self._commit(batch)
+                continue
+            deadline = item.enqueued_at + self.max_delay_ms / 1000.0
+
+            # Batch window: gather more requests until full or the oldest waited long enough
+            while pending < self.max_batch_records:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        item = self._queue.get(timeout=remaining)
+                    else:
+                        item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                pending += item.records
+                if item.file_path is None:
+                    break  # flush barrier closes the window early
+
+            self._commit(batch)
+
+        # Drain anything queued after the stop marker
+        leftover = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                leftover.append(item)
+        if leftover:
+            self._commit(leftover)
+
+    def _commit(self, batch: List[_WriteRequest]) -> None:
+        by_file: Dict[str, List[_WriteRequest]] = {}
+        barriers = []
+        for request in batch:
+            if request.file_path is None:
+                barriers.append(request)
+            else:
+                by_file.setdefault(request.file_path, []).append(request)
+
+        for file_path, requests in by_file.items():
+            started = time.monotonic()
+            try:
+                append_jsonl_payload(b''.join(r.payload for r in requests), file_path)
+            except Exception as e:
+                self.errors += 1
+                for request in requests:
+                    request.future.set_exception(e)
+                continue
+            done = time.monotonic()
+            self.fsync_latency.observe((done - started) * 1000)
+            self.file_commits += 1
+            for request in requests:
+                self.records_committed += request.records
+                self.commit_latency.observe((done - request.enqueued_at) * 1000)
+                request.future.set_result(request.records)
+
+        self.batches += 1
+        for barrier in barriers:
+            barrier.future.set_result(0)
+
+    def stats(self) -> Dict:
+        """Throughput counters and commit/fsync latency histograms."""
+        return {
+            'batches': self.batches,
+            'file_commits': self.file_commits,
+            'records_committed': self.records_committed,
+            'errors': self.errors,
+            'queue_depth': self._queue.qsize(),
+            'max_batch_records': self.max_batch_records,
+            'max_delay_ms': self.max_delay_ms,
+            'commit_latency': self.commit_latency.to_dict(),
+            'fsync_latency': self.fsync_latency.to_dict(),
+        }
@@ -0,0 +1,282 @@
+"""
+Persistent (date, schema_version) key index for duplicate detection.
+
+Keeps the normalized keys of a JSONL file in a SQLite sidecar
+(<file>.keys.db) so duplicate checks are indexed lookups instead of a full
+re-read and re-normalization of the file on every run.
+
+The sidecar records how far into the data file it has indexed (inode,
+byte size, hash of the last indexed line). sync() indexes only bytes
+appended since; a rewritten, truncated or replaced file is re-indexed from
+scratch. Like the date index, it is a rebuildable cache
+(duplicate_guard.py rebuild-index <file>).
+
+A Bloom filter (<file>.keys.bloom) sits in front of the SQLite lookup:
+keys it reports as "definitely new" (the common case for backfills) never
+touch the database. The filter is tagged with the index state it reflects
+and is rebuilt from the key table (not the data file) when stale or
+saturated.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Dict, Iterable, Optional, Tuple
+
+from .bloom_filter import BloomFilter
+from .schema_utils import normalize_schema_version
+
+INDEX_VERSION = 1
+
+
+def key_index_path(file_path: str) -> str:
+    """Sidecar path for a data file."""
+    return f"{file_path}.keys.db"
+
+
+def bloom_path(file_path: str) -> str:
+    """Bloom filter sidecar path for a data file."""
+    return f"{file_path}.keys.bloom"
+
+
+def _bloom_settings() -> Tuple[int, float]:
+    try:
+        from config import Config
+    except ImportError:
+        from dashboard.config import Config
+    return Config.DUPLICATE_BLOOM_CAPACITY, Config.DUPLICATE_BLOOM_ERROR_RATE
+
+
+def _bloom_key(key: Tuple[str, str]) -> str:
+    return f"{key[0]}|{key[1]}"
+
+
+def record_key(record: Dict) -> Optional[Tuple[str, str]]:
+    """Normalized (date, schema_version) key, or None for undated records."""
+    if not isinstance(record, dict):
+        return None
+    date = record.get('date', '')
+    if not date:
+        return None
+    return date, normalize_schema_version(record.get('schema_version', 'v1.0.0'))
+
+
+class KeyIndex:
+    """SQLite-backed key set for one JSONL file."""
+
+    def __init__(self, file_path: str):
+        self.file_path = str(file_path)
+        self.db_path = key_index_path(self.file_path)
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS keys (
+                date TEXT NOT NULL,
+                schema_version TEXT NOT NULL,
+                PRIMARY KEY (date, schema_version)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS meta (
+                name TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        self._bloom: Optional[BloomFilter] = None
+        self._bloom_dirty = False
+        self.lookups = 0
+        self.bloom_negatives = 0   # answered by the filter alone
+        self.exact_lookups = 0     # "maybe seen" -> SQLite
+        self.false_positives = 0   # filter said maybe, SQLite said no
+
+    def __enter__(self) -> 'KeyIndex':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self) -> None:
+        if self._bloom is not None and self._bloom_dirty:
+            self._bloom.save(bloom_path(self.file_path))
+            self._bloom_dirty = False
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM keys").fetchone()[0]
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        self.lookups += 1
+        if _bloom_key(key) not in self._get_bloom():
+            self.bloom_negatives += 1
+            return False
+        self.exact_lookups += 1
+        row = self._conn.execute(
+            "SELECT 1 FROM keys WHERE date = ? AND schema_version = ?", key
+        ).fetchone()
+        if row is None:
+            self.false_positives += 1
+        return row is not None
+
+    # -- bloom filter -----------------------------------------------------
+
+    def _bloom_tag(self, state: Dict) -> Dict:
+        return {'inode': state.get('inode'), 'size': state.get('size')}
+
+    def _get_bloom(self) -> BloomFilter:
+        """Filter matching the key table: loaded if current, else rebuilt."""
+        if self._bloom is None:
+            tag = self._bloom_tag(self._meta())
+            bloom = BloomFilter.load(bloom_path(self.file_path))
+            if bloom is None or bloom.tag != tag or bloom.saturated:
+                bloom = self._build_bloom(tag)
+            self._bloom = bloom
+        return self._bloom
+
+    def _build_bloom(self, tag: Dict) -> BloomFilter:
+        capacity, error_rate = _bloom_settings()
+        bloom = BloomFilter(max(capacity, 2 * len(self)), error_rate)
+        for key in self._conn.execute("SELECT date, schema_version FROM keys"):
+            bloom.add(_bloom_key(key))
+        bloom.tag = tag
+        self._bloom_dirty = True
+        return bloom
+
+    def stats(self) -> Dict:
+        """Key count, filter sizing/FP estimate and lookup counters."""
+        negatives = self.bloom_negatives + self.false_positives
+        return {
+            'keys': len(self),
+            'bloom': self._get_bloom().stats(),
+            'lookups': self.lookups,
+            'bloom_negatives': self.bloom_negatives,
+            'exact_lookups': self.exact_lookups,
+            'false_positives': self.false_positives,
+            'observed_fp_rate': round(self.false_positives / negatives, 6) if negatives else 0.0,
+        }
+
+    def contains_record(self, record: Dict) -> bool:
+        """True if the record's normalized key is already indexed."""
+        key = record_key(record)
+        return key is not None and key in self
+
+    # -- sync -------------------------------------------------------------
+
+    def _meta(self) -> Dict:
+        meta = dict(self._conn.execute("SELECT name, value FROM meta"))
+        return json.loads(meta['state']) if 'state' in meta else {}
+
+    def _is_consistent(self, state: Dict) -> bool:
+        if state.get('version') != INDEX_VERSION:
+            return False
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return False
+        if state['inode'] != stat.st_ino or state['size'] > stat.st_size:
+            return False
+        if state['size'] == stat.st_size and state.get('mtime_ns') != stat.st_mtime_ns:
+            return False  # rewritten in place to the same length
+        if state['tail_offset'] < 0:
+            return True
+        with open(self.file_path, 'rb') as f:
+            f.seek(state['tail_offset'])
+            return hashlib.sha1(f.readline()).hexdigest() == state['tail_hash']
+
+    def sync(self) -> int:
+        """
+        Bring the index up to date with the data file.
+
+        Returns:
+            Number of lines scanned (0 when already current)
+        """
+        if not os.path.exists(self.file_path):
+            with self._conn:
+                self._conn.execute("DELETE FROM keys")
+                self._conn.execute("DELETE FROM meta")
+            self._bloom = None
+            return 0
+
+        state = self._meta()
+        if not self._is_consistent(state):
+            state = {'version': INDEX_VERSION, 'size': 0, 'tail_offset': -1, 'tail_hash': ''}
+            with self._conn:
+                self._conn.execute("DELETE FROM keys")
+                self._conn.execute("DELETE FROM meta")
+            self._bloom = None
+        if os.path.getsize(self.file_path) == state['size'] and 'inode' in state:
+            return 0
+        # Load the filter while the stored state still matches its tag
+        bloom = self._get_bloom()
+
+        keys = []
+        scanned = 0
+        offset = state['size']
+        with open(self.file_path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # partial trailing line: index once completed
+                if line.strip():
+                    try:
+                        key = record_key(json.loads(line))
+                    except ValueError:
+                        key = None
+                    if key is not None:
+                        keys.append(key)
+                    state['tail_offset'], state['tail_hash'] = offset, hashlib.sha1(line).hexdigest()
+                    scanned += 1
+                offset += len(line)
+
+        stat = os.stat(self.file_path)
+        state['size'] = offset
+        state['inode'] = stat.st_ino
+        state['mtime_ns'] = stat.st_mtime_ns
+        with self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO keys VALUES (?, ?)", keys)
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('state', ?)", (json.dumps(state),))
+
+        # Keep the filter in step with the new keys
+        for key in keys:
+            bloom.add(_bloom_key(key))
+        if bloom.saturated:
+            bloom = self._build_bloom(bloom.tag)
+        bloom.tag = self._bloom_tag(state)
+        self._bloom = bloom
+        self._bloom_dirty = True
+        return scanned
+
+    def rebuild(self) -> int:
+        """Drop and re-index the whole data file. Returns keys indexed."""
+        with self._conn:
+            self._conn.execute("DELETE FROM keys")
+            self._conn.execute("DELETE FROM meta")
+        self._bloom = None
+        self.sync()
+        return len(self)
+
+
+def open_key_index(file_path: str) -> KeyIndex:
+    """Open the key index for file_path, synced with the file."""
+    index = KeyIndex(file_path)
+    index.sync()
+    return index
+
+
+def update_key_index_if_present(file_path: str) -> None:
+    """Incrementally sync an existing key index (no-op when unindexed)."""
+    if os.path.exists(key_index_path(file_path)):
+        with KeyIndex(file_path) as index:
+            index.sync()
+
+
+def filter_new_keys(records: Iterable[Dict], index: KeyIndex):
+    """Split records into (unique, duplicates) against index and each other."""
+    seen = set()
+    unique, duplicates = [], []
+    for record in records:
+        key = record_key(record)
+        if key is not None and (key in seen or key in index):
+            duplicates.append(record)
+            continue
+        if key is not None:
+            seen.add(key)
+        unique.append(record)
+    return unique, duplicates
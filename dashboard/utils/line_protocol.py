@@ -0,0 +1,159 @@
+"""
+Direct InfluxDB line-protocol encoder for daily records.
+
+Produces the same bytes as building influxdb_client Point objects for the
+wb_score / wb_contrib / wb_quality measurements (see ingest_influxdb) and
+calling to_line_protocol(), without allocating Points or tag/field dicts.
+Measurement+tag prefixes and timestamps are cached, since they repeat
+across records (same band/formula_version, one timestamp per date).
+
+Escaping and field formatting follow influxdb_client's Point:
+    measurement  , space \\n \\t \\r
+    tag/field key and tag value  , = space \\n \\t \\r
+                 (a tag value ending in a backslash gets a trailing space)
+    string field " and \\
+    int field    <n>i     float field str(x) with a trailing ".0" trimmed
+    tags/fields are sorted by key; None or non-finite values are dropped
+"""
+
+import math
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+_ESCAPE_MEASUREMENT = str.maketrans({',': r'\,', ' ': r'\ ', '\n': r'\n', '\t': r'\t', '\r': r'\r'})
+_ESCAPE_KEY = str.maketrans({',': r'\,', '=': r'\=', ' ': r'\ ', '\n': r'\n', '\t': r'\t', '\r': r'\r'})
+_ESCAPE_STRING = str.maketrans({'"': r'\"', '\\': r'\\'})
+
+_EPOCH = datetime.fromtimestamp(0, tz=timezone.utc)
+
+
+def escape_measurement(name: str) -> str:
+    return str(name).translate(_ESCAPE_MEASUREMENT)
+
+
+def escape_key(key: str) -> str:
+    return str(key).translate(_ESCAPE_KEY)
+
+
+def escape_tag_value(value: Any) -> str:
+    escaped = str(value).translate(_ESCAPE_KEY)
+    if escaped.endswith('\\'):
+        escaped += ' '
+    return escaped
+
+
+def format_field_value(value: Any) -> Optional[str]:
+    """Line-protocol field value, or None if the field is dropped."""
+    if value is None:
+        return None
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return None
+        text = str(value)
+        return text[:-2] if text.endswith('.0') else text
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, int):
+        return f'{value}i'
+    if isinstance(value, str):
+        return '"' + value.translate(_ESCAPE_STRING) + '"'
+    raise ValueError(f'Type: "{type(value)}" of field value is not supported.')
+
+
+def series_prefix(measurement: str, tags: Dict[str, Any]) -> str:
+    """'<measurement>[,k=v...] ' with tags sorted and empty tags dropped."""
+    parts = []
+    for key, value in sorted(tags.items()):
+        if value is None:
+            continue
+        key_text, value_text = escape_key(key), escape_tag_value(value)
+        if key_text and value_text:
+            parts.append(f'{key_text}={value_text}')
+    return escape_measurement(measurement) + (',' + ','.join(parts) if parts else '') + ' '
+
+
+def encode_fields(fields: List[Tuple[str, Any]]) -> str:
+    """Fields given as (escaped_key, value) pairs already in key order."""
+    encoded = []
+    for key, value in fields:
+        text = format_field_value(value)
+        if text is not None:
+            encoded.append(f'{key}={text}')
+    return ','.join(encoded)
+
+
+class DailyRecordEncoder:
+    """Encodes daily records (build_daily_record format) to line protocol."""
+
+    def __init__(self):
+        self._prefixes: Dict[Tuple, str] = {}
+        self._timestamps: Dict[str, str] = {}
+
+    def _prefix(self, measurement: str, tags: Tuple[Tuple[str, Any], ...]) -> str:
+        cache_key = (measurement, tags)
+        prefix = self._prefixes.get(cache_key)
+        if prefix is None:
+            prefix = series_prefix(measurement, dict(tags))
+            self._prefixes[cache_key] = prefix
+        return prefix
+
+    def _timestamp(self, date_str: str) -> str:
+        """' <epoch seconds>' for a date, matching Point with WritePrecision.S."""
+        cached = self._timestamps.get(date_str)
+        if cached is None:
+            delta = datetime.fromisoformat(date_str).replace(tzinfo=timezone.utc) - _EPOCH
+            ns = delta.days * 86400 * 10 ** 9 + delta.seconds * 10 ** 9 + delta.microseconds * 10 ** 3
+            cached = f' {int(ns / 1e9)}'
+            self._timestamps[date_str] = cached
+        return cached
+
+    def _line(self, prefix: str, fields: str, timestamp: str) -> str:
+        return f'{prefix}{fields}{timestamp}' if fields else ''
+
+    def encode(self, record: Dict[str, Any]) -> List[str]:
+        """
+        Line-protocol lines for one record, in the same order as the Point path
+        (wb_score, wb_contrib per metric, wb_quality).
+
+        Raises:
+            KeyError/ValueError: For records missing required fields, like the Point path
+        """
+        formula_version = record["formula_version"]
+        timestamp = self._timestamp(record["date"])
+
+        lines = [self._line(
+            self._prefix('wb_score', (('band', record["band"]), ('formula_version', formula_version),
+                                      ('run_mode', record.get("run_mode", "unknown")))),
+            encode_fields([('score', record["score"])]),
+            timestamp,
+        )]
+
+        weights = record["weights_active"]
+        for metric, contrib_value in record["contrib"].items():
+            lines.append(self._line(
+                self._prefix('wb_contrib', (('formula_version', formula_version), ('metric', metric))),
+                encode_fields([('contribution', float(contrib_value)),
+                               ('weight', float(weights.get(metric, 0.0)))]),
+                timestamp,
+            ))
+
+        total_possible = len(record["metrics_raw"])
+        missing_count = len(record.get("missing", []))
+        present_count = total_possible - missing_count
+        completeness_pct = (present_count / total_possible * 100) if total_possible > 0 else 100.0
+        lines.append(self._line(
+            self._prefix('wb_quality', (('formula_version', formula_version),)),
+            encode_fields([
+                ('completeness_pct', completeness_pct),
+                ('error_count', len(record.get("error_codes", []))),
+                ('metrics_expected', total_possible),
+                ('metrics_present', present_count),
+                ('missing_count', missing_count),
+            ]),
+            timestamp,
+        ))
+        return lines
+
+    def encode_bytes(self, record: Dict[str, Any]) -> bytes:
+        """Newline-joined UTF-8 payload for one record."""
+        return '\n'.join(self.encode(record)).encode('utf-8')
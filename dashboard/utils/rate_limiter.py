@@ -0,0 +1,81 @@
+"""
+Thread-safe token bucket rate limiter.
+
+Tokens refill continuously at `rate` per second up to `burst`. acquire(n)
+blocks until n tokens are available; a request larger than the bucket is
+let through once the bucket is full and leaves it in debt, so the long-run
+rate still holds for large batches.
+
+Usage:
+    limiter = TokenBucket(rate=10000)      # e.g. points per second
+    limiter.acquire(len(batch))
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class TokenBucket:
+    """Token bucket; rate tokens/second, capacity burst (default: one second's worth)."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = float(burst) if burst is not None else max(self.rate, 1.0)
+        if self.burst <= 0:
+            raise ValueError("burst must be positive")
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = clock()
+        self.acquired = 0.0
+        self.waits = 0
+        self.wait_s = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if available now; never blocks."""
+        with self._lock:
+            self._refill(self._clock())
+            if self._tokens >= min(tokens, self.burst):
+                self._tokens -= tokens
+                self.acquired += tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until tokens are granted; returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                needed = min(tokens, self.burst)
+                if self._tokens >= needed:
+                    self._tokens -= tokens
+                    self.acquired += tokens
+                    if waited:
+                        self.waits += 1
+                        self.wait_s += waited
+                    return waited
+                delay = (needed - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'rate': self.rate,
+                'burst': self.burst,
+                'acquired': self.acquired,
+                'waits': self.waits,
+                'wait_s': round(self.wait_s, 3),
+            }
@@ -0,0 +1,202 @@
+"""
+On-disk cache of Garmin Connect API responses.
+
+Entries are keyed by a SHA-256 of (endpoint, date, account) and hold the
+JSON response body. The account is itself a hash of the login, so the
+cache never stores an email address. Bodies are kept in a SQLite database
+(<directory>/responses.db), and the directory is created 0700 because
+responses are raw health data.
+
+Freshness depends on whether a day was settled when it was fetched:
+
+    recent   date >= fetch day - recent_days (today, yesterday):
+             still changing as the watch syncs, expires after recent_ttl
+    settled  older days: effectively immutable, kept for settled_ttl
+             (None: until evicted)
+
+TTLs are per endpoint (ttls={'sleep': (3600, None), ...}). The TTL is fixed
+at fetch time: yesterday's partial data fetched last night does not become
+"settled" just because the calendar moved on. Empty bodies (None, [], {})
+always get the recent TTL: a watch that syncs days late must still be able
+to fill in a day Garmin had no data for yet.
+
+The cache is bounded by max_bytes of response bodies; beyond it the least
+recently used entries are evicted. hits/misses/expired/stores/evictions
+are counted per instance (stats()). A single connection guarded by a lock
+is shared, so the fetcher's worker threads can use one cache.
+
+Usage:
+    cache = ResponseCache('private/garmin_cache', max_bytes=64 * 1024 * 1024)
+    hit, body = cache.get('steps', '2025-08-01', account_key(email))
+    if not hit:
+        body = client.get_steps_data('2025-08-01')
+        cache.put('steps', '2025-08-01', account_key(email), body)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+CACHE_DB = 'responses.db'
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_RECENT_TTL_S = 15 * 60
+DEFAULT_SETTLED_TTL_S = None
+
+
+def account_key(login: str) -> str:
+    """Stable, non-reversible account id for a Garmin login."""
+    return hashlib.sha256(login.strip().lower().encode('utf-8')).hexdigest()[:16]
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or (isinstance(value, (list, dict, str)) and not value)
+
+
+def cache_key(endpoint: str, date_str: str, account: str) -> str:
+    return hashlib.sha256(f"{endpoint}|{date_str}|{account}".encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of JSON responses with per-endpoint TTLs."""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttls: Optional[Dict[str, Tuple[float, Optional[float]]]] = None,
+                 recent_days: int = 1,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            directory: Cache directory (created 0700 if missing)
+            max_bytes: Cap on cached body bytes; least recently used entries are evicted beyond it
+            ttls: {endpoint: (recent_ttl_s, settled_ttl_s)}; settled_ttl_s None never expires.
+                Endpoints not listed use DEFAULT_RECENT_TTL_S / DEFAULT_SETTLED_TTL_S
+            recent_days: Days before the fetch day that still count as recent (1: yesterday)
+            clock: Wall clock (seconds since epoch), injectable for tests
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttls = dict(ttls or {})
+        self.recent_days = recent_days
+        self._clock = clock
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        self.db_path = os.path.join(directory, CACHE_DB)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                date TEXT NOT NULL,
+                account TEXT NOT NULL,
+                body TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                settled INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at);
+        """)
+        os.chmod(self.db_path, 0o600)
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def __enter__(self) -> 'ResponseCache':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _is_settled(self, date_str: str, fetched_at: float) -> bool:
+        fetch_day = datetime.fromtimestamp(fetched_at).date()
+        return date.fromisoformat(date_str) < fetch_day - timedelta(days=self.recent_days)
+
+    def ttl_for(self, endpoint: str, settled: bool) -> Optional[float]:
+        """TTL in seconds for an endpoint's recent or settled responses (None: no expiry)."""
+        recent_ttl, settled_ttl = self.ttls.get(endpoint, (DEFAULT_RECENT_TTL_S, DEFAULT_SETTLED_TTL_S))
+        return settled_ttl if settled else recent_ttl
+
+    def get(self, endpoint: str, date_str: str, account: str) -> Tuple[bool, Any]:
+        """(True, body) for a fresh entry, else (False, None); an empty body is a valid hit."""
+        key = cache_key(endpoint, date_str, account)
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, settled, fetched_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return False, None
+            body, settled, fetched_at = row
+            ttl = self.ttl_for(endpoint, bool(settled))
+            if ttl is not None and now - fetched_at > ttl:
+                self.expired += 1
+                self.misses += 1
+                return False, None
+            with self._conn:
+                self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return True, json.loads(body)
+
+    def put(self, endpoint: str, date_str: str, account: str, value: Any) -> None:
+        """Store a response (replacing any previous one) and evict beyond max_bytes."""
+        body = json.dumps(value, separators=(',', ':'))
+        size = len(body.encode('utf-8'))
+        now = self._clock()
+        settled = not _is_empty(value) and self._is_settled(date_str, now)
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (cache_key(endpoint, date_str, account), endpoint, date_str, account,
+                     body, size, int(settled), now, now)
+                )
+                self.stores += 1
+                self._evict()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict:
+        """Counters for this instance plus current entry count and size."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'expired': self.expired,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'entries': entries,
+            'bytes': size,
+            'max_bytes': self.max_bytes,
+        }
@@ -0,0 +1,236 @@
+"""
+Weekly and monthly rollups of daily records, written at ingest time.
+
+Long-window Grafana panels query these instead of aggregating raw daily
+points on every refresh:
+
+    wb_score_rollup,period=week|month   score_mean/min/max, days,
+                                        band_<band>_days (e.g. band_go_for_it_days, 0 if none)
+    wb_contrib_rollup,metric=..,period=..  contribution_mean/min/max, days
+
+One point per period, timestamped at the period start (ISO week starting
+Monday, or the 1st of the month, UTC midnight).
+
+RollupState keeps the per-day values of each period in a JSON sidecar
+(<records>.rollups.json), so rollups are updated incrementally from only
+the records being ingested and merged with what earlier runs saw. A date
+that is ingested again replaces its previous values rather than being
+counted twice, matching InfluxDB's overwrite of same-timestamp points.
+Periods touched since their rollup was last written stay 'pending'
+until mark_written().
+
+The rollup series carry no per-file tag, so every file feeding them must
+share one RollupState (add() is thread-safe; ingest_influxdb folds a whole
+directory run into one state and writes the rollups once). prune() drops
+written periods that ended more than retain_days before the newest day, so
+the sidecar does not grow forever; records that later arrive for a pruned
+period leave its (already complete) rollup as written.
+"""
+
+import calendar
+import json
+import os
+import re
+import tempfile
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from .line_protocol import encode_fields, escape_key, series_prefix
+
+try:
+    from score.engine import BAND_MAP
+except ImportError:
+    from dashboard.score.engine import BAND_MAP
+
+PERIODS = ('week', 'month')
+ROLLUP_STATE_VERSION = 1
+RETAIN_CLOSED_DAYS = 62  # written periods are kept this long after they end (re-ingest window)
+
+
+def rollup_state_path(records_path: str) -> str:
+    """Default rollup state sidecar for a records file."""
+    return f"{records_path}.rollups.json"
+
+
+def period_start(day: date, period: str) -> date:
+    """First day of the ISO week (Monday) or month containing day."""
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    if period == 'month':
+        return day.replace(day=1)
+    raise ValueError(f"Unknown period: {period}")
+
+
+def period_end(start: date, period: str) -> date:
+    """Last day of the week or month starting at start."""
+    if period == 'week':
+        return start + timedelta(days=6)
+    if period == 'month':
+        return start.replace(day=calendar.monthrange(start.year, start.month)[1])
+    raise ValueError(f"Unknown period: {period}")
+
+
+def band_field(band: str) -> str:
+    """Field name for a band's day count: 'Go for it' -> band_go_for_it_days."""
+    slug = re.sub(r'[^a-z0-9]+', '_', str(band).lower()).strip('_') or 'unknown'
+    return f"band_{slug}_days"
+
+
+def _stats(values: List[float]) -> Dict[str, float]:
+    return {'mean': sum(values) / len(values), 'min': min(values), 'max': max(values), 'days': len(values)}
+
+
+class RollupState:
+    """Per-period daily values behind the rollups, persisted as JSON."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.periods: Dict[str, Dict[str, Dict[str, Dict]]] = {p: {} for p in PERIODS}
+        self.pending = set()
+        self.pruned_through: Dict[str, str] = {}  # period -> newest pruned period start
+        self._lock = threading.RLock()
+        if path and os.path.exists(path):
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return  # unreadable state: rebuilt from the records ingested next
+        if data.get('version') != ROLLUP_STATE_VERSION:
+            return
+        for period in PERIODS:
+            self.periods[period] = data.get('periods', {}).get(period, {})
+        self.pending = {tuple(item) for item in data.get('pending', [])}
+        self.pruned_through = dict(data.get('pruned_through', {}))
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Atomically write the state (temp file + rename)."""
+        path = path or self.path
+        with self._lock:
+            data = {'version': ROLLUP_STATE_VERSION, 'periods': self.periods,
+                    'pending': sorted(list(item) for item in self.pending),
+                    'pruned_through': self.pruned_through}
+            fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + '_',
+                                       dir=os.path.dirname(os.path.abspath(path)))
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(data, f, separators=(',', ':'))
+                os.replace(tmp, path)
+            except Exception:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """Fold one daily record into its week and month (replacing that date if seen)."""
+        day = datetime.fromisoformat(str(record['date'])).date()
+        values = {
+            'score': record.get('score'),
+            'band': record.get('band'),
+            'contrib': {metric: float(value) for metric, value in (record.get('contrib') or {}).items()
+                        if value is not None},
+        }
+        with self._lock:
+            for period in PERIODS:
+                key = period_start(day, period).isoformat()
+                if key <= self.pruned_through.get(period, ''):
+                    continue  # pruned: rewriting it from this day alone would be partial
+                self.periods[period].setdefault(key, {})[day.isoformat()] = values
+                self.pending.add((period, key))
+
+    def add_all(self, records: Iterable[Dict[str, Any]]) -> None:
+        for record in records:
+            self.add(record)
+
+    def rollup(self, period: str, key: str) -> Dict[str, Any]:
+        """Aggregates for one period: score stats, band counts, per-metric contribution stats."""
+        days = self.periods[period].get(key, {})
+        scores = [v['score'] for v in days.values() if isinstance(v.get('score'), (int, float))
+                  and not isinstance(v.get('score'), bool)]
+        bands: Dict[str, int] = {}
+        contrib: Dict[str, List[float]] = {}
+        for values in days.values():
+            if values.get('band') is not None:
+                bands[values['band']] = bands.get(values['band'], 0) + 1
+            for metric, value in values.get('contrib', {}).items():
+                contrib.setdefault(metric, []).append(value)
+        return {
+            'period': period,
+            'start': key,
+            'days': len(days),
+            'score': _stats(scores) if scores else None,
+            'bands': bands,
+            'contrib': {metric: _stats(values) for metric, values in contrib.items()},
+        }
+
+    def pending_rollups(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [self.rollup(period, key) for period, key in sorted(self.pending)]
+
+    def lines(self) -> List[str]:
+        """Line protocol for every pending period."""
+        lines = []
+        for rollup in self.pending_rollups():
+            lines.extend(encode_rollup(rollup))
+        return lines
+
+    def mark_written(self) -> None:
+        with self._lock:
+            self.pending.clear()
+
+    def prune(self, retain_days: int = RETAIN_CLOSED_DAYS) -> int:
+        """
+        Drop written periods that ended more than retain_days before the
+        newest day held. Pending periods are never dropped.
+
+        Returns:
+            Number of per-day entries removed
+        """
+        with self._lock:
+            newest = max((day for keys in self.periods.values() for days in keys.values() for day in days),
+                         default=None)
+            if newest is None:
+                return 0
+            horizon = date.fromisoformat(newest) - timedelta(days=retain_days)
+            removed = 0
+            for period in PERIODS:
+                for key in sorted(self.periods[period]):
+                    if (period, key) in self.pending or period_end(date.fromisoformat(key), period) >= horizon:
+                        continue
+                    removed += len(self.periods[period].pop(key))
+                    self.pruned_through[period] = max(key, self.pruned_through.get(period, ''))
+            return removed
+
+
+def encode_rollup(rollup: Dict[str, Any]) -> List[str]:
+    """Line-protocol points for one rollup (see module docstring)."""
+    start = datetime.fromisoformat(rollup['start']).replace(tzinfo=timezone.utc)
+    timestamp = f" {int(start.timestamp())}"
+    lines = []
+
+    fields = []
+    if rollup['score'] is not None:
+        fields += [('score_max', float(rollup['score']['max'])),
+                   ('score_mean', float(rollup['score']['mean'])),
+                   ('score_min', float(rollup['score']['min']))]
+    fields.append(('days', rollup['days']))
+    # Standard bands are always written (0 if absent) so a re-ingested day
+    # that changed band does not leave a stale count behind
+    bands = dict.fromkeys((band for _, _, band in BAND_MAP), 0)
+    bands.update(rollup['bands'])
+    fields += [(escape_key(band_field(band)), count) for band, count in bands.items()]
+    fields.sort(key=lambda item: item[0])
+    lines.append(series_prefix('wb_score_rollup', {'period': rollup['period']})
+                 + encode_fields(fields) + timestamp)
+
+    for metric, stats in sorted(rollup['contrib'].items()):
+        fields = [('contribution_max', stats['max']), ('contribution_mean', stats['mean']),
+                  ('contribution_min', stats['min']), ('days', stats['days'])]
+        lines.append(series_prefix('wb_contrib_rollup', {'metric': metric, 'period': rollup['period']})
+                     + encode_fields(fields) + timestamp)
+    return lines
@@ -0,0 +1,314 @@
+"""
+Segmented, rolling JSONL storage.
+
+Instead of one ever-growing file, records live in per-month segment files
+inside a store directory, described by a manifest:
+
+    <store>/
+        manifest.json        {"version", "segments": [{"name", "month",
+                              "min_date", "max_date", "records", "bytes"}]}
+        seg_202501.jsonl
+        seg_202502.jsonl
+
+Records are routed to the segment for the month of their 'date' field and
+appended durably (append_jsonl_payload). Retention drops whole segments
+whose newest record is older than the cutoff, which is manifest work plus
+one unlink per segment; a segment holding no dated records ages out by
+the last day of its month. Daily telemetry_YYYYMMDD.jsonl shards can be
+compacted into the store (compact_shards), off the fetch hot path.
+
+The manifest is a cache of segment statistics: on load, segments whose
+size no longer matches (crash between append and manifest update) are
+rescanned, and unlisted segment files are picked up.
+"""
+
+import calendar
+import json
+import os
+import re
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .file_utils import append_jsonl_payload, lock_path
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+STORE_SUFFIX = '.segments'
+
+_SEGMENT_RE = re.compile(r'^seg_([0-9]{6})\.jsonl$')
+_DATE_RE = re.compile(r'^[0-9]{4}-[0-9]{2}-[0-9]{2}')
+_SHARD_RE = re.compile(r'([0-9]{4})([0-9]{2})([0-9]{2})')
+
+
+def _record_date(record: Dict) -> Optional[str]:
+    value = record.get('date') if isinstance(record, dict) else None
+    if isinstance(value, str) and _DATE_RE.match(value):
+        return value[:10]
+    return None
+
+
+def is_segment_store(path: str) -> bool:
+    """True if path is a segment store directory."""
+    return os.path.isfile(os.path.join(str(path), MANIFEST_NAME))
+
+
+class SegmentStore:
+    """Per-month segmented JSONL store with a manifest."""
+
+    def __init__(self, directory: str):
+        """
+        Open (or create) a store.
+
+        Args:
+            directory: Store directory, conventionally <name>.segments
+        """
+        self.directory = str(directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self.manifest_path = os.path.join(self.directory, MANIFEST_NAME)
+        self.segments: Dict[str, Dict] = {}
+        self._load_manifest()
+
+    # -- manifest ---------------------------------------------------------
+
+    def _segment_path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _scan_segment(self, name: str) -> Dict:
+        """Recompute a segment's statistics from its file."""
+        path = self._segment_path(name)
+        entry = {
+            'name': name,
+            'month': _SEGMENT_RE.match(name).group(1),
+            'min_date': None,
+            'max_date': None,
+            'records': 0,
+            'bytes': os.path.getsize(path),
+        }
+        with open(path, 'r') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                entry['records'] += 1
+                self._widen(entry, _record_date(record))
+        return entry
+
+    @staticmethod
+    def _widen(entry: Dict, date_str: Optional[str]) -> None:
+        if date_str is None:
+            return
+        if entry['min_date'] is None or date_str < entry['min_date']:
+            entry['min_date'] = date_str
+        if entry['max_date'] is None or date_str > entry['max_date']:
+            entry['max_date'] = date_str
+
+    def _load_manifest(self) -> None:
+        listed = {}
+        try:
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == MANIFEST_VERSION:
+                listed = {s['name']: s for s in manifest.get('segments', [])}
+        except (OSError, ValueError):
+            pass
+
+        changed = not os.path.exists(self.manifest_path)
+        for name in sorted(os.listdir(self.directory)):
+            if not _SEGMENT_RE.match(name):
+                continue
+            entry = listed.pop(name, None)
+            if entry is None or entry.get('bytes') != os.path.getsize(self._segment_path(name)):
+                entry = self._scan_segment(name)
+                changed = True
+            self.segments[name] = entry
+        if listed:
+            changed = True  # listed segments whose files are gone
+
+        if changed:
+            self._save_manifest()
+
+    def _save_manifest(self) -> None:
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'updated_at': datetime.now().isoformat(),
+            'segments': [self.segments[name] for name in sorted(self.segments)],
+        }
+        fd, tmp = tempfile.mkstemp(prefix=MANIFEST_NAME + '_', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(manifest, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.manifest_path)
+        except Exception:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    # -- writes -----------------------------------------------------------
+
+    def append(self, records: Iterable[Dict], default_date: str = None) -> int:
+        """
+        Append records, each to the segment for its month.
+
+        Args:
+            records: Records with a YYYY-MM-DD 'date' field
+            default_date: Date used to place records without one
+                (default: today)
+
+        Returns:
+            Number of records appended
+        """
+        fallback = default_date or datetime.now().strftime('%Y-%m-%d')
+        by_month: Dict[str, List[Dict]] = {}
+        for record in records:
+            date_str = _record_date(record) or fallback
+            by_month.setdefault(date_str[:4] + date_str[5:7], []).append(record)
+
+        appended = 0
+        for month in sorted(by_month):
+            batch = by_month[month]
+            name = f"seg_{month}.jsonl"
+            payload = ''.join(json.dumps(record) + '\n' for record in batch).encode('utf-8')
+            append_jsonl_payload(payload, self._segment_path(name))
+
+            entry = self.segments.get(name) or {
+                'name': name, 'month': month, 'min_date': None,
+                'max_date': None, 'records': 0, 'bytes': 0,
+            }
+            for record in batch:
+                self._widen(entry, _record_date(record))
+            entry['records'] += len(batch)
+            entry['bytes'] = os.path.getsize(self._segment_path(name))
+            self.segments[name] = entry
+            appended += len(batch)
+
+        if appended:
+            self._save_manifest()
+        return appended
+
+    # -- reads ------------------------------------------------------------
+
+    def segment_list(self) -> List[Dict]:
+        """Manifest entries in month order."""
+        return [self.segments[name] for name in sorted(self.segments)]
+
+    def iter_records(self, start_date: str = None, end_date: str = None) -> Iterator[Dict]:
+        """
+        Yield records with start_date <= date <= end_date (inclusive; None
+        leaves that side open), segment by segment. Segments outside the
+        range are skipped using the manifest alone.
+        """
+        for entry in self.segment_list():
+            if start_date and entry['max_date'] and entry['max_date'] < start_date:
+                continue
+            if end_date and entry['min_date'] and entry['min_date'] > end_date[:10]:
+                continue
+            with open(self._segment_path(entry['name']), 'r') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    date_str = _record_date(record)
+                    if start_date and date_str and date_str < start_date:
+                        continue
+                    if end_date and date_str and date_str > end_date[:10]:
+                        continue
+                    yield record
+
+    # -- retention --------------------------------------------------------
+
+    @staticmethod
+    def _newest_date(entry: Dict) -> str:
+        """max_date, or the last day of the segment's month if it has no dated records."""
+        if entry['max_date'] is not None:
+            return entry['max_date']
+        year, month = int(entry['month'][:4]), int(entry['month'][4:])
+        return f"{year:04d}-{month:02d}-{calendar.monthrange(year, month)[1]:02d}"
+
+    def drop_before(self, cutoff_date: str, dry_run: bool = False) -> List[Dict]:
+        """
+        Drop whole segments whose newest record is older than cutoff_date.
+
+        A segment straddling the cutoff is kept until all of its records
+        have expired, so up to one extra month may be retained. Segments
+        without any dated record expire once their whole month is older
+        than cutoff_date.
+
+        Returns:
+            Manifest entries of the dropped (or droppable, if dry_run) segments
+        """
+        expired = [
+            entry for entry in self.segment_list()
+            if self._newest_date(entry) < cutoff_date
+        ]
+        if dry_run or not expired:
+            return expired
+
+        for entry in expired:
+            del self.segments[entry['name']]
+        # Manifest first: a crash after this leaves orphan files that the
+        # next load simply re-adds, never a manifest pointing at nothing
+        self._save_manifest()
+        for entry in expired:
+            for path in (self._segment_path(entry['name']), lock_path(self._segment_path(entry['name']))):
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+        return expired
+
+
+def compact_shards(shard_paths: Iterable[str], store: SegmentStore,
+                   remove: bool = True) -> Dict:
+    """
+    Merge daily JSONL shards (e.g. telemetry_YYYYMMDD.jsonl) into a store.
+
+    Each shard is appended to the store's segments and then deleted, so a
+    crash between the two re-appends at most one shard.
+
+    Args:
+        shard_paths: Shard files to merge, oldest first
+        store: Target segment store
+        remove: Delete each shard once merged
+
+    Returns:
+        Summary with shards and records merged
+    """
+    summary = {'shards_merged': 0, 'records_merged': 0, 'shards': []}
+    for shard_path in shard_paths:
+        shard_path = str(shard_path)
+        match = _SHARD_RE.search(os.path.basename(shard_path))
+        default_date = f"{match.group(1)}-{match.group(2)}-{match.group(3)}" if match else None
+
+        records = []
+        with open(shard_path, 'r') as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+
+        merged = store.append(records, default_date=default_date)
+        if remove:
+            os.unlink(shard_path)
+            from .jsonl_index import index_paths
+            for sidecar in index_paths(shard_path):
+                if os.path.exists(sidecar):
+                    os.unlink(sidecar)
+
+        summary['shards_merged'] += 1
+        summary['records_merged'] += merged
+        summary['shards'].append(Path(shard_path).name)
+    return summary